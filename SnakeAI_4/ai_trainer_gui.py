@@ -1,11 +1,17 @@
 import pygame
 import sys
-import threading
+import os
 import time
 from typing import List, Tuple
 from src.game_logic import SnakeGame, Direction
-from src.ai.genetic_algorithm import GeneticAlgorithm
 from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import ACTIVATIONS, NeuralNetwork
+from src.ai.trainer_process import TOP_SLOTS, TrainerProcess, resolve_architecture
+from src.episode import EpisodeReplay
+
+
+ARCHITECTURE_PRESETS = [[16, 12], [64, 32], [256, 128], [512, 256, 128], AIPlayer.DEFAULT_HIDDEN_LAYERS]
+ALGORITHMS = {'ga': 'GA', 'es': 'ES'}
 
 
 class Button:
@@ -17,6 +23,8 @@ class Button:
         self.hover_color = tuple(min(c + 30, 255) for c in color)
         self.is_hovered = False
         self.enabled = True
+        self.text_surface = None
+        self.rendered_text = None
     
     def draw(self, screen, font):
         color = self.hover_color if self.is_hovered and self.enabled else self.color
@@ -26,9 +34,10 @@ class Button:
         pygame.draw.rect(screen, color, self.rect, border_radius=5)
         pygame.draw.rect(screen, (255, 255, 255), self.rect, 2, border_radius=5)
         
-        text_surface = font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        if self.rendered_text != (self.text, self.text_color):
+            self.text_surface = font.render(self.text, True, self.text_color)
+            self.rendered_text = (self.text, self.text_color)
+        screen.blit(self.text_surface, self.text_surface.get_rect(center=self.rect.center))
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -39,6 +48,55 @@ class Button:
         return False
 
 
+class HistoryGraph:
+    def __init__(self, width: int):
+        self.width = max(2, width)
+        self.bucket_size = 1
+        self.count = 0
+        self.max_score = 1
+        self.buckets = []
+        self.version = 0
+    
+    def append(self, best_score: float, avg_score: float):
+        if self.count % self.bucket_size:
+            bucket = self.buckets[-1]
+            bucket[0] = min(bucket[0], best_score)
+            bucket[1] = max(bucket[1], best_score)
+            bucket[2] = min(bucket[2], avg_score)
+            bucket[3] = max(bucket[3], avg_score)
+        else:
+            self.buckets.append([best_score, best_score, avg_score, avg_score])
+        
+        self.count += 1
+        self.max_score = max(self.max_score, best_score)
+        self.version += 1
+        
+        if len(self.buckets) > self.width:
+            merged = []
+            for i in range(0, len(self.buckets), 2):
+                pair = self.buckets[i:i + 2]
+                merged.append([
+                    min(b[0] for b in pair), max(b[1] for b in pair),
+                    min(b[2] for b in pair), max(b[3] for b in pair)
+                ])
+            self.buckets = merged
+            self.bucket_size *= 2
+    
+    def points(self, x: int, y: int, width: int, height: int) -> Tuple[List[tuple], List[tuple]]:
+        points_best = []
+        points_avg = []
+        last = max(1, len(self.buckets) - 1)
+        
+        for i, (best_min, best_max, avg_min, avg_max) in enumerate(self.buckets):
+            px = x + i / last * width
+            for points, low, high in ((points_best, best_min, best_max), (points_avg, avg_min, avg_max)):
+                points.append((px, y + height - low / self.max_score * height))
+                if high != low:
+                    points.append((px, y + height - high / self.max_score * height))
+        
+        return points_best, points_avg
+
+
 class AITrainerGUI:
     def __init__(self):
         pygame.init()
@@ -81,15 +139,13 @@ class AITrainerGUI:
         self.field_height = 30
         self.cell_size = 10
         
-        self.ga = None
+        self.trainer = None
         self.training_active = False
         self.training_paused = False
-        self.training_thread = None
-        
-        self.data_lock = threading.Lock()
         
         self.current_cycle = 0
         self.population_data = []
+        self.cycle_stats = {}
         self.history = {
             'cycle': [],
             'best_score': [],
@@ -100,21 +156,25 @@ class AITrainerGUI:
         self.session_folder = None
         self.session_start_time = None
         self.best_model_path = None
+        self.timing_stats = {}
         
         self.demo_game = None
         self.demo_ai = None
+        self.demo_replay = None
         self.demo_speed = 15
         
         self.scroll_offset = 0
         self.max_scroll = 0
         
+        self.text_cache = {}
         self.setup_buttons()
+        self.build_static_layers()
         
         self.selected_individual = None
         self.visualizing = False
         
         self.auto_save_interval = 10
-        
+    
     def scale(self, value, dimension='width'):
         if dimension == 'width':
             return int(value * self.screen_width / 1200)
@@ -150,9 +210,38 @@ class AITrainerGUI:
         self.buttons['pop_plus'] = Button(self.scale(1045), settings_y, small_btn_width, small_btn_height, '+', self.colors['panel_light'])
         self.buttons['speed_minus'] = Button(self.scale(900), settings_y + small_btn_height + self.scale(10, 'height'), small_btn_width, small_btn_height, '-', self.colors['panel_light'])
         self.buttons['speed_plus'] = Button(self.scale(1045), settings_y + small_btn_height + self.scale(10, 'height'), small_btn_width, small_btn_height, '+', self.colors['panel_light'])
+        self.buttons['workers_minus'] = Button(self.scale(900), settings_y + (small_btn_height + self.scale(10, 'height')) * 2, small_btn_width, small_btn_height, '-', self.colors['panel_light'])
+        self.buttons['workers_plus'] = Button(self.scale(1045), settings_y + (small_btn_height + self.scale(10, 'height')) * 2, small_btn_width, small_btn_height, '+', self.colors['panel_light'])
+        self.buttons['arch_minus'] = Button(self.scale(900), settings_y + (small_btn_height + self.scale(10, 'height')) * 3, small_btn_width, small_btn_height, '-', self.colors['panel_light'])
+        self.buttons['arch_plus'] = Button(self.scale(1045), settings_y + (small_btn_height + self.scale(10, 'height')) * 3, small_btn_width, small_btn_height, '+', self.colors['panel_light'])
+        self.buttons['activation_minus'] = Button(self.scale(900), settings_y + (small_btn_height + self.scale(10, 'height')) * 4, small_btn_width, small_btn_height, '-', self.colors['panel_light'])
+        self.buttons['activation_plus'] = Button(self.scale(1045), settings_y + (small_btn_height + self.scale(10, 'height')) * 4, small_btn_width, small_btn_height, '+', self.colors['panel_light'])
+        self.buttons['algorithm_minus'] = Button(self.scale(900), settings_y + (small_btn_height + self.scale(10, 'height')) * 5, small_btn_width, small_btn_height, '-', self.colors['panel_light'])
+        self.buttons['algorithm_plus'] = Button(self.scale(1045), settings_y + (small_btn_height + self.scale(10, 'height')) * 5, small_btn_width, small_btn_height, '+', self.colors['panel_light'])
+        self.buttons['islands_minus'] = Button(self.scale(900), settings_y + (small_btn_height + self.scale(10, 'height')) * 6, small_btn_width, small_btn_height, '-', self.colors['panel_light'])
+        self.buttons['islands_plus'] = Button(self.scale(1045), settings_y + (small_btn_height + self.scale(10, 'height')) * 6, small_btn_width, small_btn_height, '+', self.colors['panel_light'])
         
         self.population_size = 200
         self.models_per_cycle = 200
+        self.workers = 1
+        self.algorithm = 'ga'
+        self.islands = 1
+        
+        self.hidden_layers, self.activation = resolve_architecture()
+        self.architectures = list(ARCHITECTURE_PRESETS)
+        if self.hidden_layers not in self.architectures:
+            self.architectures.append(self.hidden_layers)
+        self.architectures.sort(key=lambda hidden: NeuralNetwork.count_parameters(
+            [AIPlayer.INPUT_SIZE] + hidden + [AIPlayer.OUTPUT_SIZE]
+        ))
+    
+    @staticmethod
+    def population_step(value: int) -> int:
+        if value < 200:
+            return 10
+        if value < 1000:
+            return 100
+        return 500
     
     def start_training(self):
         if self.training_active:
@@ -176,59 +265,50 @@ class AITrainerGUI:
         self.buttons['stop'].enabled = True
         self.buttons['save'].enabled = True
         
-        self.ga = GeneticAlgorithm(
-            population_size=self.models_per_cycle,
-            mutation_rate=0.1,
-            mutation_strength=0.25,
-            elite_count=max(20, self.models_per_cycle // 10),
-            field_width=self.field_width,
-            field_height=self.field_height
-        )
-        
         self.current_cycle = 0
+        self.population_data = []
         self.history = {
             'cycle': [],
             'best_score': [],
             'avg_score': [],
             'best_fitness': []
         }
+        self.graph = HistoryGraph(self.graph_rect.width)
         self.best_model_path = None
-        
-        self.training_thread = threading.Thread(target=self.training_loop, daemon=True)
-        self.training_thread.start()
+        self.timing_stats = {}
+        
+        self.trainer = TrainerProcess({
+            'models_per_cycle': self.models_per_cycle,
+            'field_width': self.field_width,
+            'field_height': self.field_height,
+            'workers': self.workers,
+            'hidden_layers': self.hidden_layers,
+            'activation': self.activation,
+            'algorithm': self.algorithm,
+            'islands': self.islands,
+            'session_folder': self.session_folder,
+            'session_start': session_name
+        })
     
     def pause_training(self):
         self.training_paused = not self.training_paused
         if self.training_paused:
+            self.trainer.send('pause')
             self.buttons['pause'].text = 'ПРОДОЛЖИТЬ'
             self.buttons['pause'].color = self.colors['green']
         else:
+            self.trainer.send('resume')
             self.buttons['pause'].text = 'ПАУЗА'
             self.buttons['pause'].color = self.colors['yellow']
     
     def stop_training(self):
-        import os
-        from datetime import datetime
-        
         self.training_active = False
         self.training_paused = False
         
-        if self.best_model_path and os.path.exists(self.best_model_path):
-            session_end_time = datetime.now()
-            start_str = self.session_start_time.strftime("%Y%m%d_%H%M%S")
-            end_str = session_end_time.strftime("%Y%m%d_%H%M%S")
-            final_name = f"{self.session_folder}/{start_str}_{end_str}_final.npy"
-            
-            try:
-                import shutil
-                shutil.copy(self.best_model_path, final_name)
-                print(f"✓ Финальная модель сохранена: {final_name}")
-            except Exception as e:
-                print(f"✗ Ошибка сохранения финальной модели: {e}")
-        
-        if self.training_thread and self.training_thread.is_alive():
-            if threading.current_thread() != self.training_thread:
-                self.training_thread.join(timeout=2.0)
+        if self.trainer:
+            print("→ Останавливаем процесс обучения...")
+            self.handle_telemetry(self.trainer.stop())
+            self.trainer = None
         
         self.buttons['start'].enabled = True
         self.buttons['pause'].enabled = False
@@ -239,131 +319,61 @@ class AITrainerGUI:
         print("→ Сессия обучения завершена")
     
     def save_model(self):
-        if self.ga:
-            try:
-                self.ga.save_best('best_ai.npy', auto_save_history=True)
-                print("✓ Модель сохранена в best_ai.npy")
-            except Exception as e:
-                print(f"✗ Ошибка при сохранении модели: {e}")
+        if self.trainer:
+            self.trainer.send('save')
     
-    def training_loop(self):
-        import numpy as np
-        import os
+    def poll_trainer(self):
+        if not self.trainer:
+            return
+        
+        self.handle_telemetry(self.trainer.poll())
         
-        try:
-            current_best_ai = None
+        if self.training_active and not self.trainer.is_alive():
+            print("✗ Процесс обучения завершился")
+            self.stop_training()
+    
+    def handle_telemetry(self, messages: List[dict]):
+        for message in messages:
+            if message['type'] != 'cycle':
+                continue
             
-            print(f"→ Бесконечный цикл обучения начат (N={self.models_per_cycle} моделей за цикл)")
+            self.current_cycle = message['cycle']
+            self.population_data = [
+                {'index': i, 'fitness': fitness, 'score': score}
+                for i, (fitness, score) in enumerate(message['population'])
+            ]
+            self.cycle_stats = {
+                key: message[key] for key in ('best_score', 'best_fitness', 'avg_score', 'avg_fitness', 'population_size')
+            }
+            self.history['cycle'].append(message['cycle'])
+            self.history['best_score'].append(message['best_score'])
+            self.history['avg_score'].append(message['avg_score'])
+            self.history['best_fitness'].append(message['best_fitness'])
+            self.graph.append(message['best_score'], message['avg_score'])
+            self.timing_stats = message['timing']
+            self.best_model_path = message['best_model_path']
             
-            while self.training_active:
-                while self.training_paused:
-                    time.sleep(0.1)
-                
-                if not self.training_active:
-                    break
-                
-                self.current_cycle += 1
-                print(f"\n=== Цикл {self.current_cycle} ===")
-                
-                if current_best_ai is None:
-                    if os.path.exists('best_ai.npy'):
-                        print("→ Загружаем существующую модель...")
-                        current_best_ai = self.ga.load_best('best_ai.npy')
-                    else:
-                        print("→ Начинаем с нулевой модели")
-                        current_best_ai = AIPlayer()
-                
-                print(f"→ Обучаем {self.models_per_cycle} моделей от текущей лучшей...")
-                
-                new_population = []
-                from src.ai.neural_network import NeuralNetwork
-                
-                for i in range(self.models_per_cycle):
-                    if not self.training_active:
-                        break
-                    
-                    child = AIPlayer()
-                    child.neural_network = NeuralNetwork.crossover(
-                        current_best_ai.neural_network, 
-                        current_best_ai.neural_network
-                    )
-                    child.neural_network.mutate(self.ga.mutation_rate, self.ga.mutation_strength)
-                    new_population.append(child)
-                
-                if not self.training_active:
-                    break
-                
-                print(f"→ Оцениваем {len(new_population)} моделей...")
-                fitness_scores = []
-                
-                for i, ai_player in enumerate(new_population):
-                    if not self.training_active:
-                        break
-                    
-                    try:
-                        fitness, score = self.ga.evaluate_fitness(ai_player)
-                        fitness_scores.append({
-                            'index': i,
-                            'fitness': fitness,
-                            'score': score,
-                            'ai_player': ai_player
-                        })
-                    except Exception as e:
-                        print(f"Ошибка при оценке модели {i}: {e}")
-                        continue
-                
-                if not self.training_active or len(fitness_scores) == 0:
-                    break
-                
-                fitness_scores.sort(key=lambda x: x['fitness'], reverse=True)
-                
-                with self.data_lock:
-                    self.population_data = fitness_scores
-                
-                best_fitness = fitness_scores[0]['fitness']
-                best_score = fitness_scores[0]['score']
-                avg_fitness = sum(f['fitness'] for f in fitness_scores) / len(fitness_scores)
-                avg_score = sum(f['score'] for f in fitness_scores) / len(fitness_scores)
-                
-                with self.data_lock:
-                    self.history['cycle'].append(self.current_cycle)
-                    self.history['best_score'].append(best_score)
-                    self.history['avg_score'].append(avg_score)
-                    self.history['best_fitness'].append(best_fitness)
-                    
-                    self.demo_ai = fitness_scores[0]['ai_player']
-                    self.demo_game = SnakeGame(self.field_width, self.field_height)
-                
-                print(f"Цикл {self.current_cycle}: Лучший={best_score}, Средний={avg_score:.1f}, Best fitness={best_fitness:.1f}")
-                
-                cycle_model_path = f"{self.session_folder}/cycle_{self.current_cycle:04d}_score_{best_score}.npy"
-                try:
-                    best_weights = fitness_scores[0]['ai_player'].neural_network.get_weights_flat()
-                    np.save(cycle_model_path, best_weights)
-                    self.best_model_path = cycle_model_path
-                    print(f"✓ Сохранена лучшая модель цикла: {cycle_model_path}")
-                except Exception as e:
-                    print(f"✗ Ошибка сохранения: {e}")
-                
-                current_best_ai = fitness_scores[0]['ai_player']
-                print(f"→ Загружена лучшая модель для следующего цикла")
-        
-        except Exception as e:
-            print(f"✗ Критическая ошибка в training_loop: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            if self.training_active:
-                self.stop_training()
+            self.demo_replay = EpisodeReplay(message['episode'])
+            self.demo_game = self.demo_replay.game
+            self.demo_ai = None
     
-    def visualize_individual(self, ai_player: AIPlayer):
+    def visualize_individual(self, slot: int):
+        ai_player = self.trainer.read_player(slot) if self.trainer else None
+        if ai_player is None:
+            return
+        
         self.selected_individual = ai_player
         self.visualizing = True
         self.demo_game = SnakeGame(self.field_width, self.field_height)
         self.demo_ai = ai_player
+        self.demo_replay = None
     
     def update_demo_game(self):
-        if self.demo_game and self.demo_ai and not self.demo_game.game_over:
+        if self.demo_replay:
+            if not self.demo_replay.step() and self.training_active:
+                self.demo_replay.restart()
+                self.demo_game = self.demo_replay.game
+        elif self.demo_game and self.demo_ai and not self.demo_game.game_over:
             state = self.demo_game.get_state_for_ai()
             direction = self.demo_ai.decide_direction(state)
             self.demo_game.set_direction(direction)
@@ -371,31 +381,87 @@ class AITrainerGUI:
         elif self.demo_game and self.demo_game.game_over and self.training_active:
             self.demo_game.reset()
     
-    def draw_game_field(self):
-        panel_x = self.scale(20)
-        panel_y = self.scale(20, 'height')
-        panel_width = self.scale(340)
-        panel_height = self.scale(400, 'height')
+    def render_text(self, font, text: str, color: tuple):
+        key = (id(font), text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            if len(self.text_cache) > 1000:
+                self.text_cache.clear()
+            surface = font.render(text, True, color)
+            self.text_cache[key] = surface
+        return surface
+    
+    def build_static_layers(self):
+        self.panels = {
+            'field': pygame.Rect(self.scale(20), self.scale(20, 'height'), self.scale(340), self.scale(400, 'height')),
+            'stats': pygame.Rect(self.scale(380), self.scale(20, 'height'), self.scale(500), self.scale(400, 'height')),
+            'graph': pygame.Rect(self.scale(20), self.scale(440, 'height'), self.scale(860), self.scale(250, 'height')),
+            'control': pygame.Rect(self.scale(900), self.scale(20, 'height'), self.scale(280), int(self.screen_height * 0.95))
+        }
+        titles = {
+            'field': ('Лучшая особь', self.font_medium, 10),
+            'stats': ('Статистика цикла', self.font_medium, 10),
+            'graph': ('Прогресс обучения', self.font_medium, 10),
+            'control': ('Управление', self.font_large, 20)
+        }
+        
+        self.background = pygame.Surface((self.screen_width, self.screen_height))
+        self.background.fill(self.colors['background'])
         
-        pygame.draw.rect(self.screen, self.colors['panel'], 
-                        (panel_x, panel_y, panel_width, panel_height), border_radius=10)
+        for name, panel in self.panels.items():
+            pygame.draw.rect(self.background, self.colors['panel'], panel, border_radius=10)
+            text, font, margin = titles[name]
+            self.background.blit(font.render(text, True, self.colors['text']),
+                                 (panel.x + self.scale(margin), panel.y + self.scale(margin, 'height')))
         
-        title = self.font_medium.render('Лучшая особь', True, self.colors['text'])
-        self.screen.blit(title, (panel_x + self.scale(10), panel_y + self.scale(10, 'height')))
+        self.grid_surface = pygame.Surface((self.field_width * self.cell_size + 1, self.field_height * self.cell_size + 1))
+        self.grid_surface.fill(self.colors['panel'])
+        
+        for x in range(self.field_width + 1):
+            pygame.draw.line(self.grid_surface, self.colors['grid'],
+                           (x * self.cell_size, 0), (x * self.cell_size, self.field_height * self.cell_size))
+        
+        for y in range(self.field_height + 1):
+            pygame.draw.line(self.grid_surface, self.colors['grid'],
+                           (0, y * self.cell_size), (self.field_width * self.cell_size, y * self.cell_size))
+        
+        panel = self.panels['graph']
+        self.graph_rect = pygame.Rect(panel.x + 50, panel.y + 50, panel.width - 80, panel.height - 70)
+        self.graph = HistoryGraph(self.graph_rect.width)
+        self.graph_surface = None
+        self.graph_version = -1
+    
+    def render_graph(self):
+        self.graph_surface = pygame.Surface(self.graph_rect.size)
+        self.graph_surface.fill(self.colors['panel_light'])
+        self.graph_version = self.graph.version
+        
+        points_best, points_avg = self.graph.points(0, 0, self.graph_rect.width, self.graph_rect.height)
+        
+        if len(points_avg) > 1:
+            pygame.draw.lines(self.graph_surface, self.colors['text_dim'], False, points_avg, 2)
+        if len(points_best) > 1:
+            pygame.draw.lines(self.graph_surface, self.colors['graph_line'], False, points_best, 3)
+        
+        legend_x = self.graph_rect.width - 150
+        legend_y = 10
+        
+        pygame.draw.line(self.graph_surface, self.colors['graph_line'],
+                       (legend_x, legend_y + 5), (legend_x + 30, legend_y + 5), 3)
+        self.graph_surface.blit(self.render_text(self.font_small, 'Лучший', self.colors['text']), (legend_x + 40, legend_y))
+        
+        pygame.draw.line(self.graph_surface, self.colors['text_dim'],
+                       (legend_x, legend_y + 25), (legend_x + 30, legend_y + 25), 2)
+        self.graph_surface.blit(self.render_text(self.font_small, 'Средний', self.colors['text']), (legend_x + 40, legend_y + 20))
+    
+    def draw_game_field(self):
+        panel = self.panels['field']
         
         if self.demo_game:
-            field_x = panel_x + 10
-            field_y = panel_y + 50
-            
-            for x in range(self.field_width + 1):
-                pygame.draw.line(self.screen, self.colors['grid'],
-                               (field_x + x * self.cell_size, field_y),
-                               (field_x + x * self.cell_size, field_y + self.field_height * self.cell_size))
+            field_x = panel.x + 10
+            field_y = panel.y + 50
             
-            for y in range(self.field_height + 1):
-                pygame.draw.line(self.screen, self.colors['grid'],
-                               (field_x, field_y + y * self.cell_size),
-                               (field_x + self.field_width * self.cell_size, field_y + y * self.cell_size))
+            self.screen.blit(self.grid_surface, (field_x, field_y))
             
             for i, (x, y) in enumerate(self.demo_game.get_snake_body()):
                 color = self.colors['snake_head'] if i == 0 else self.colors['snake']
@@ -409,33 +475,20 @@ class AITrainerGUI:
                               field_y + apple_y * self.cell_size + self.cell_size // 2),
                              self.cell_size // 2 - 1)
             
-            score_text = self.font_small.render(f'Счёт: {self.demo_game.score}', True, self.colors['text'])
-            length_text = self.font_small.render(f'Длина: {len(self.demo_game.snake)}', True, self.colors['text'])
+            score_text = self.render_text(self.font_small, f'Счёт: {self.demo_game.score}', self.colors['text'])
+            length_text = self.render_text(self.font_small, f'Длина: {len(self.demo_game.snake)}', self.colors['text'])
             
             self.screen.blit(score_text, (field_x, field_y + self.field_height * self.cell_size + 10))
             self.screen.blit(length_text, (field_x, field_y + self.field_height * self.cell_size + 35))
     
     def draw_statistics_panel(self):
-        panel_x = self.scale(380)
-        panel_y = self.scale(20, 'height')
-        panel_width = self.scale(500)
-        panel_height = self.scale(400, 'height')
+        panel_x, panel_y, panel_width, panel_height = self.panels['stats']
         
-        pygame.draw.rect(self.screen, self.colors['panel'],
-                        (panel_x, panel_y, panel_width, panel_height), border_radius=10)
-        
-        title = self.font_medium.render('Статистика цикла', True, self.colors['text'])
-        self.screen.blit(title, (panel_x + self.scale(10), panel_y + self.scale(10, 'height')))
-        
-        with self.data_lock:
-            population_data_copy = self.population_data.copy() if self.population_data else []
+        population_data_copy = self.population_data
         
         if population_data_copy:
             y_offset = panel_y + 50
-            header = self.font_small.render(
-                f'№   | Fitness  | Счёт | Действие',
-                True, self.colors['text_dim']
-            )
+            header = self.render_text(self.font_small, f'№   | Fitness  | Счёт | Действие', self.colors['text_dim'])
             self.screen.blit(header, (panel_x + 10, y_offset))
             
             y_offset += 30
@@ -453,12 +506,15 @@ class AITrainerGUI:
                 color = self.colors['green'] if i < 5 else self.colors['text']
                 
                 text = f'{i+1:3d} | {data["fitness"]:8.1f} | {data["score"]:4d} | '
-                text_surface = self.font_small.render(text, True, color)
+                text_surface = self.render_text(self.font_small, text, color)
                 self.screen.blit(text_surface, (panel_x + 10, y_pos))
                 
+                if i >= TOP_SLOTS:
+                    continue
+                
                 view_button = pygame.Rect(panel_x + 320, y_pos, 80, 20)
                 pygame.draw.rect(self.screen, self.colors['blue'], view_button, border_radius=3)
-                view_text = self.font_small.render('Просмотр', True, self.colors['text'])
+                view_text = self.render_text(self.font_small, 'Просмотр', self.colors['text'])
                 view_text_rect = view_text.get_rect(center=view_button.center)
                 self.screen.blit(view_text, view_text_rect)
                 
@@ -474,131 +530,112 @@ class AITrainerGUI:
                                (panel_x + panel_width - 15, scrollbar_y, 10, scrollbar_height))
     
     def draw_graph(self):
-        panel_x = self.scale(20)
-        panel_y = self.scale(440, 'height')
-        panel_width = self.scale(860)
-        panel_height = self.scale(250, 'height')
-        
-        pygame.draw.rect(self.screen, self.colors['panel'],
-                        (panel_x, panel_y, panel_width, panel_height), border_radius=10)
-        
-        title = self.font_medium.render('Прогресс обучения', True, self.colors['text'])
-        self.screen.blit(title, (panel_x + self.scale(10), panel_y + self.scale(10, 'height')))
-        
-        with self.data_lock:
-            history_copy = {
-                'cycle': self.history['cycle'].copy() if 'cycle' in self.history else [],
-                'best_score': self.history['best_score'].copy(),
-                'avg_score': self.history['avg_score'].copy()
-            }
-        
-        if len(history_copy['cycle']) > 1:
-            graph_x = panel_x + 50
-            graph_y = panel_y + 50
-            graph_width = panel_width - 80
-            graph_height = panel_height - 70
-            
-            pygame.draw.rect(self.screen, self.colors['panel_light'],
-                           (graph_x, graph_y, graph_width, graph_height))
-            
-            max_score = max(history_copy['best_score']) if history_copy['best_score'] else 1
-            max_gen = len(history_copy['cycle'])
-            
-            points_best = []
-            points_avg = []
-            
-            for i, gen in enumerate(history_copy['cycle']):
-                x = graph_x + (i / max(1, max_gen - 1)) * graph_width
-                y_best = graph_y + graph_height - (history_copy['best_score'][i] / max(1, max_score)) * graph_height
-                y_avg = graph_y + graph_height - (history_copy['avg_score'][i] / max(1, max_score)) * graph_height
-                
-                points_best.append((x, y_best))
-                points_avg.append((x, y_avg))
-            
-            if len(points_avg) > 1:
-                pygame.draw.lines(self.screen, self.colors['text_dim'], False, points_avg, 2)
-            if len(points_best) > 1:
-                pygame.draw.lines(self.screen, self.colors['graph_line'], False, points_best, 3)
-            
-            legend_x = graph_x + graph_width - 150
-            legend_y = graph_y + 10
-            
-            pygame.draw.line(self.screen, self.colors['graph_line'], 
-                           (legend_x, legend_y + 5), (legend_x + 30, legend_y + 5), 3)
-            legend_text = self.font_small.render('Лучший', True, self.colors['text'])
-            self.screen.blit(legend_text, (legend_x + 40, legend_y))
-            
-            pygame.draw.line(self.screen, self.colors['text_dim'],
-                           (legend_x, legend_y + 25), (legend_x + 30, legend_y + 25), 2)
-            legend_text = self.font_small.render('Средний', True, self.colors['text'])
-            self.screen.blit(legend_text, (legend_x + 40, legend_y + 20))
+        if self.graph.count > 1:
+            if self.graph_version != self.graph.version:
+                self.render_graph()
+            self.screen.blit(self.graph_surface, self.graph_rect)
     
     def draw_control_panel(self):
-        panel_x = self.scale(900)
-        panel_y = self.scale(20, 'height')
-        panel_width = self.scale(280)
-        panel_height = int(self.screen_height * 0.95)
-        
-        pygame.draw.rect(self.screen, self.colors['panel'],
-                        (panel_x, panel_y, panel_width, panel_height), border_radius=10)
-        
-        title = self.font_large.render('Управление', True, self.colors['text'])
-        self.screen.blit(title, (panel_x + self.scale(20), panel_y + self.scale(20, 'height')))
+        panel_x, panel_y, panel_width, panel_height = self.panels['control']
         
         y = panel_y + 80
         
-        cycle_text = self.font_medium.render(f'Цикл обучения: {self.current_cycle}', 
-                                          True, self.colors['text'])
+        cycle_text = self.render_text(self.font_medium, f'Цикл обучения: {self.current_cycle}', self.colors['text'])
         self.screen.blit(cycle_text, (panel_x + 20, y))
         
         if self.session_folder:
-            session_text = self.font_small.render(f'Сессия: {self.session_folder.split("/")[-1]}', 
-                                                  True, self.colors['text_dim'])
+            session_text = self.render_text(self.font_small, f'Сессия: {self.session_folder.split("/")[-1]}',
+                                            self.colors['text_dim'])
             self.screen.blit(session_text, (panel_x + 20, y + 30))
         
         y += 80
         
-        with self.data_lock:
-            population_data_copy = self.population_data.copy() if self.population_data else []
+        population_data_copy = self.population_data
         
         if population_data_copy:
-            stats_title = self.font_medium.render('Текущая статистика:', True, self.colors['text'])
+            stats_title = self.render_text(self.font_medium, 'Текущая статистика:', self.colors['text'])
             self.screen.blit(stats_title, (panel_x + 20, y))
             y += 35
             
-            best = population_data_copy[0]
-            avg_fitness = sum(d['fitness'] for d in population_data_copy) / len(population_data_copy)
-            avg_score = sum(d['score'] for d in population_data_copy) / len(population_data_copy)
-            
+            cycle_stats = self.cycle_stats
             stats = [
-                f'Лучший счёт: {best["score"]}',
-                f'Лучший fitness: {best["fitness"]:.1f}',
-                f'Средний счёт: {avg_score:.1f}',
-                f'Средний fitness: {avg_fitness:.1f}',
-                f'Популяция: {len(population_data_copy)}'
+                f'Лучший счёт: {cycle_stats["best_score"]}',
+                f'Лучший fitness: {cycle_stats["best_fitness"]:.1f}',
+                f'Средний счёт: {cycle_stats["avg_score"]:.1f}',
+                f'Средний fitness: {cycle_stats["avg_fitness"]:.1f}',
+                f'Популяция: {cycle_stats["population_size"]}'
             ]
             
             for stat in stats:
-                stat_text = self.font_small.render(stat, True, self.colors['text'])
+                stat_text = self.render_text(self.font_small, stat, self.colors['text'])
                 self.screen.blit(stat_text, (panel_x + 30, y))
                 y += 25
         
+        timing_stats = self.timing_stats
+        
+        if timing_stats:
+            variation = 'обновление' if 'time_update' in timing_stats else 'мутация'
+            variation_time = timing_stats.get('time_update', timing_stats.get('time_mutation', 0))
+            timings = [
+                f'Шагов/с: {timing_stats["env_steps_per_second"]:.0f}, циклов/ч: {timing_stats["generations_per_hour"]:.1f}',
+                f'Оценка {timing_stats.get("time_evaluation", 0) * 1000:.0f} мс, '
+                f'{variation} {variation_time * 1000:.0f} мс, '
+                f'сохр. {timing_stats.get("time_saving", 0) * 1000:.0f} мс',
+                f'Очередь записи: {timing_stats["writer_backlog"]}, задержка {timing_stats["writer_latency"] * 1000:.0f} мс'
+            ]
+            
+            for timing in timings:
+                timing_text = self.render_text(self.font_small, timing, self.colors['text_dim'])
+                self.screen.blit(timing_text, (panel_x + 30, y))
+                y += 25
+        
         y += 20
         
-        settings_title = self.font_medium.render('Настройки:', True, self.colors['text'])
+        settings_title = self.render_text(self.font_medium, 'Настройки:', self.colors['text'])
         self.screen.blit(settings_title, (panel_x + 20, y))
         y += 35
         
-        models_text = self.font_small.render(f'Моделей за цикл: {self.models_per_cycle}', True, self.colors['text'])
+        models_text = self.render_text(self.font_small, f'Моделей за цикл: {self.models_per_cycle}', self.colors['text'])
         self.screen.blit(models_text, (panel_x + 30, y + 5))
         self.buttons['pop_minus'].rect.y = y
         self.buttons['pop_plus'].rect.y = y
         y += 40
         
-        speed_text = self.font_small.render(f'Скорость визуализации: {self.demo_speed} FPS', True, self.colors['text'])
+        speed_text = self.render_text(self.font_small, f'Скорость визуализации: {self.demo_speed} FPS', self.colors['text'])
         self.screen.blit(speed_text, (panel_x + 30, y + 5))
         self.buttons['speed_minus'].rect.y = y
         self.buttons['speed_plus'].rect.y = y
+        y += 40
+        
+        workers_text = self.render_text(self.font_small, f'Процессов оценки: {self.workers}', self.colors['text'])
+        self.screen.blit(workers_text, (panel_x + 30, y + 5))
+        self.buttons['workers_minus'].rect.y = y
+        self.buttons['workers_plus'].rect.y = y
+        y += 40
+        
+        architecture = '-'.join(map(str, self.hidden_layers))
+        architecture_text = self.render_text(self.font_small, f'Скрытые слои: {architecture}', self.colors['text'])
+        self.screen.blit(architecture_text, (panel_x + 30, y + 5))
+        self.buttons['arch_minus'].rect.y = y
+        self.buttons['arch_plus'].rect.y = y
+        y += 40
+        
+        activation_text = self.render_text(self.font_small, f'Активация: {self.activation}', self.colors['text'])
+        self.screen.blit(activation_text, (panel_x + 30, y + 5))
+        self.buttons['activation_minus'].rect.y = y
+        self.buttons['activation_plus'].rect.y = y
+        y += 40
+        
+        algorithm_text = self.render_text(self.font_small, f'Алгоритм: {ALGORITHMS[self.algorithm]}', self.colors['text'])
+        self.screen.blit(algorithm_text, (panel_x + 30, y + 5))
+        self.buttons['algorithm_minus'].rect.y = y
+        self.buttons['algorithm_plus'].rect.y = y
+        y += 40
+        
+        islands_text = self.render_text(self.font_small, f'Острова: {self.islands}', self.colors['text'])
+        self.screen.blit(islands_text, (panel_x + 30, y + 5))
+        self.buttons['islands_minus'].rect.y = y
+        self.buttons['islands_plus'].rect.y = y
         y += 50
         
         for button in self.buttons.values():
@@ -611,13 +648,13 @@ class AITrainerGUI:
             status_text = 'ГОТОВ К ЗАПУСКУ'
             status_color = self.colors['text_dim']
         
-        status = self.font_medium.render(status_text, True, status_color)
+        status = self.render_text(self.font_medium, status_text, status_color)
         self.screen.blit(status, (panel_x + 20, panel_y + panel_height - 50))
     
     def handle_scroll(self, event):
         if event.type == pygame.MOUSEWHEEL:
             mouse_x, mouse_y = pygame.mouse.get_pos()
-            stats_panel = pygame.Rect(380, 20, 500, 400)
+            stats_panel = self.panels['stats']
             
             if stats_panel.collidepoint(mouse_x, mouse_y):
                 self.scroll_offset -= event.y * 3
@@ -653,9 +690,38 @@ class AITrainerGUI:
                     self.save_model()
                 
                 if self.buttons['pop_minus'].handle_event(event) and not self.training_active:
-                    self.models_per_cycle = max(10, self.models_per_cycle - 10)
+                    self.models_per_cycle = max(10, self.models_per_cycle - self.population_step(self.models_per_cycle - 1))
                 if self.buttons['pop_plus'].handle_event(event) and not self.training_active:
-                    self.models_per_cycle = self.models_per_cycle + 10
+                    self.models_per_cycle = self.models_per_cycle + self.population_step(self.models_per_cycle)
+                
+                if self.buttons['workers_minus'].handle_event(event) and not self.training_active:
+                    self.workers = max(1, self.workers - 1)
+                if self.buttons['workers_plus'].handle_event(event) and not self.training_active:
+                    self.workers = min(os.cpu_count() or 1, self.workers + 1)
+                
+                if self.buttons['arch_minus'].handle_event(event) and not self.training_active:
+                    self.hidden_layers = self.architectures[max(0, self.architectures.index(self.hidden_layers) - 1)]
+                if self.buttons['arch_plus'].handle_event(event) and not self.training_active:
+                    self.hidden_layers = self.architectures[min(len(self.architectures) - 1, self.architectures.index(self.hidden_layers) + 1)]
+                
+                activations = list(ACTIVATIONS)
+                if self.buttons['activation_minus'].handle_event(event) and not self.training_active:
+                    self.activation = activations[(activations.index(self.activation) - 1) % len(activations)]
+                if self.buttons['activation_plus'].handle_event(event) and not self.training_active:
+                    self.activation = activations[(activations.index(self.activation) + 1) % len(activations)]
+                
+                algorithms = list(ALGORITHMS)
+                if self.buttons['algorithm_minus'].handle_event(event) and not self.training_active:
+                    self.algorithm = algorithms[(algorithms.index(self.algorithm) - 1) % len(algorithms)]
+                if self.buttons['algorithm_plus'].handle_event(event) and not self.training_active:
+                    self.algorithm = algorithms[(algorithms.index(self.algorithm) + 1) % len(algorithms)]
+                if self.algorithm != 'ga':
+                    self.islands = 1
+                
+                if self.buttons['islands_minus'].handle_event(event) and not self.training_active:
+                    self.islands = max(1, self.islands - 1)
+                if self.buttons['islands_plus'].handle_event(event) and not self.training_active and self.algorithm == 'ga':
+                    self.islands = min(os.cpu_count() or 1, self.islands + 1)
                 
                 if self.buttons['speed_minus'].handle_event(event):
                     self.demo_speed = max(5, self.demo_speed - 5)
@@ -666,11 +732,12 @@ class AITrainerGUI:
                     mouse_pos = event.pos
                     for data in self.population_data:
                         if 'view_button' in data and data['view_button'].collidepoint(mouse_pos):
-                            self.visualize_individual(data['ai_player'])
+                            self.visualize_individual(data['index'])
             
+            self.poll_trainer()
             self.update_demo_game()
             
-            self.screen.fill(self.colors['background'])
+            self.screen.blit(self.background, (0, 0))
             
             self.draw_game_field()
             self.draw_statistics_panel()
@@ -0,0 +1,153 @@
+import time
+import numpy as np
+from typing import Callable, List
+from src.game_logic import Direction, SnakeGame
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import NeuralNetwork
+from src.ai.genetic_algorithm import GeneticAlgorithm
+
+
+def measure(run: Callable[[], int], repeats: int, setup: Callable[[], None] | None = None) -> dict:
+    setup = setup or (lambda: None)
+    setup()
+    run()
+    
+    timings = []
+    for _ in range(repeats):
+        setup()
+        start = time.perf_counter()
+        operations = run()
+        timings.append((time.perf_counter() - start) / operations)
+    
+    timings = np.array(timings)
+    return {
+        'seconds_per_op': float(np.median(timings)),
+        'best_seconds_per_op': float(timings.min()),
+        'repeats': repeats
+    }
+
+
+def hamiltonian_directions(width: int, height: int) -> List[Direction]:
+    directions = []
+    
+    for cell in range(width * height):
+        x, y = cell % width, cell // width
+        if x == 0:
+            directions.append(Direction.RIGHT if y == 0 else Direction.UP)
+        elif y % 2 == 0:
+            directions.append(Direction.DOWN if x == width - 1 else Direction.RIGHT)
+        elif x == 1 and y < height - 1:
+            directions.append(Direction.DOWN)
+        else:
+            directions.append(Direction.LEFT)
+    
+    return directions
+
+
+def bench_game_step(width: int, height: int, snake_length: int, seed: int, steps: int = 20000):
+    directions = hamiltonian_directions(width, height)
+    
+    def run():
+        game = SnakeGame(width, height, snake_length, seed=seed)
+        for _ in range(steps):
+            head_x, head_y = game.snake[0]
+            game.set_direction(directions[head_y * width + head_x])
+            if not game.step():
+                game.reset()
+        return steps
+    
+    return run
+
+
+def bench_forward(seed: int, calls: int = 200):
+    np.random.seed(seed)
+    ai_player = AIPlayer()
+    inputs = np.random.rand(calls, AIPlayer.INPUT_SIZE).astype(np.float32)
+    
+    def run():
+        for row in inputs:
+            ai_player.neural_network.forward(row)
+        return calls
+    
+    return run
+
+
+def bench_mutate(seed: int, children: int = 20):
+    np.random.seed(seed)
+    network = AIPlayer().neural_network
+    
+    def run():
+        rng = np.random.default_rng(seed)
+        for _ in range(children):
+            network.mutate(0.1, 0.25, rng=rng)
+        return children
+    
+    return run
+
+
+def bench_crossover(seed: int, children: int = 20):
+    np.random.seed(seed)
+    parent1 = AIPlayer().neural_network
+    parent2 = AIPlayer().neural_network
+    
+    def run():
+        rng = np.random.default_rng(seed)
+        for _ in range(children):
+            NeuralNetwork.crossover(parent1, parent2, rng=rng)
+        return children
+    
+    return run
+
+
+def bench_evaluate_fitness(seed: int, episodes: int = 10, field_size: int = 15):
+    ga = GeneticAlgorithm(population_size=1, field_width=field_size, field_height=field_size, seed=seed)
+    np.random.seed(seed)
+    players = [AIPlayer() for _ in range(episodes)]
+    
+    def run():
+        for i, ai_player in enumerate(players):
+            ga.evaluate_fitness(ai_player, seed=seed + i)
+        return episodes
+    
+    return run
+
+
+def bench_evolve_generation(seed: int, population_size: int = 20, field_size: int = 15):
+    state = {}
+    
+    def setup():
+        if 'ga' in state:
+            state['ga'].close()
+        state['ga'] = GeneticAlgorithm(
+            population_size=population_size,
+            elite_count=max(1, population_size // 10),
+            field_width=field_size,
+            field_height=field_size,
+            seed=seed
+        )
+    
+    def run():
+        state['ga'].evolve_generation(verbose=False)
+        return 1
+    
+    return run, setup
+
+
+def build_cases(seed: int, quick: bool = False) -> dict:
+    cases = {}
+    
+    for size in (12, 20, 40):
+        for snake_length in (3, size // 2 - 1):
+            steps = 5000 if quick else 20000
+            cases[f'game_step_{size}x{size}_len{snake_length}'] = (
+                bench_game_step(size, size, snake_length, seed, steps), 'steps', None
+            )
+    
+    cases['nn_forward'] = (bench_forward(seed, 50 if quick else 200), 'calls', None)
+    cases['nn_mutate'] = (bench_mutate(seed, 5 if quick else 20), 'children', None)
+    cases['nn_crossover'] = (bench_crossover(seed, 5 if quick else 20), 'children', None)
+    cases['evaluate_fitness'] = (bench_evaluate_fitness(seed, 3 if quick else 10), 'episodes', None)
+    run, setup = bench_evolve_generation(seed, 10 if quick else 20)
+    cases['evolve_generation'] = (run, 'generations', setup)
+    
+    return cases
@@ -0,0 +1,119 @@
+import sys
+import os
+import json
+import platform
+import argparse
+from typing import List
+from datetime import datetime
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.cases import build_cases, measure
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def run_benchmarks(seed: int = 0, repeats: int = 5, quick: bool = False, only: str | None = None) -> dict:
+    results = {}
+    
+    for name, (run, unit, setup) in build_cases(seed, quick).items():
+        if only and only not in name:
+            continue
+        
+        result = measure(run, repeats, setup)
+        result['unit'] = unit
+        result['ops_per_second'] = 1.0 / result['seconds_per_op']
+        results[name] = result
+        print(f"  {name:<32} {result['ops_per_second']:>12.1f} {unit}/с  ({result['seconds_per_op'] * 1000:.3f} мс)")
+    
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'seed': seed,
+            'repeats': repeats,
+            'quick': quick
+        },
+        'results': results
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    regressions = []
+    
+    print(f"\nСравнение с базой от {baseline['meta']['timestamp']} (допуск {tolerance:.0%}):")
+    if baseline['meta'].get('quick') != report['meta']['quick']:
+        print("  ⚠ База снята в другом режиме (--quick), цифры сопоставимы лишь приблизительно")
+    for name, result in report['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"  {name:<32} нет в базе")
+            continue
+        
+        ratio = base['seconds_per_op'] / result['seconds_per_op']
+        status = 'OK'
+        if ratio < 1 - tolerance:
+            status = 'РЕГРЕССИЯ'
+            regressions.append(name)
+        elif ratio > 1 + tolerance:
+            status = 'быстрее'
+        print(f"  {name:<32} x{ratio:.2f}  {status}")
+    
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарки движка, нейросети и генетического алгоритма')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed для воспроизводимых прогонов (по умолчанию: 0)')
+    parser.add_argument('--repeats', type=int, default=5,
+                       help='Количество замеров каждого бенчмарка (по умолчанию: 5)')
+    parser.add_argument('--quick', action='store_true',
+                       help='Короткие прогоны для быстрой проверки')
+    parser.add_argument('--only', type=str, default=None,
+                       help='Запускать только бенчмарки, содержащие эту подстроку')
+    parser.add_argument('--output', type=str, default='benchmark_results.json',
+                       help='Файл для результатов в JSON (по умолчанию: benchmark_results.json)')
+    parser.add_argument('--baseline', type=str, default=BASELINE_PATH,
+                       help='Файл базовых результатов для сравнения')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Сохранить результаты как новую базу')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                       help='Допустимое замедление относительно базы (по умолчанию: 0.15)')
+    
+    args = parser.parse_args()
+    
+    print("Запуск бенчмарков...\n")
+    report = run_benchmarks(args.seed, args.repeats, args.quick, args.only)
+    
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nРезультаты сохранены в {args.output}")
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"База обновлена: {args.baseline}")
+        return
+    
+    if not os.path.exists(args.baseline):
+        print(f"База {args.baseline} не найдена, сравнение пропущено (создайте её через --save-baseline)")
+        return
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    
+    regressions = compare(report, baseline, args.tolerance)
+    if regressions:
+        print(f"\nОбнаружены регрессии: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nРегрессий не обнаружено")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,13 +11,15 @@ class SnakeGameGUI:
         width: int = 20,
         height: int = 20,
         cell_size: int = 20,
-        ai_player: AIPlayer | None = None
+        ai_player: AIPlayer | None = None,
+        policy=None
     ):
         pygame.init()
         
         self.game = SnakeGame(width, height)
         self.cell_size = cell_size
         self.ai_player = ai_player
+        self.policy = policy
         
         self.screen_width = width * cell_size
         self.screen_height = height * cell_size + 50
@@ -61,6 +63,9 @@ class SnakeGameGUI:
                     elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
                         self.game.set_direction(Direction.RIGHT)
                 
+                if event.key == pygame.K_t and self.ai_player and self.policy:
+                    self.ai_player.policy = None if self.ai_player.policy else self.policy
+                
                 if event.key == pygame.K_SPACE and self.game.game_over:
                     self.game.reset()
                 elif event.key == pygame.K_ESCAPE:
@@ -106,6 +111,10 @@ class SnakeGameGUI:
         )
         self.screen.blit(info_text, (self.screen_width - 350, self.screen_height - 40))
         
+        if self.ai_player and self.ai_player.policy:
+            policy_text = self.small_font.render('Таблица решений (приближение), T - сеть', True, self.colors['ai_mode'])
+            self.screen.blit(policy_text, (10, 10))
+        
         if self.game.game_over:
             game_over_text = self.font.render('ИГРА ОКОНЧЕНА! Нажмите ПРОБЕЛ',
                                              True, self.colors['text'])
@@ -225,26 +234,43 @@ if __name__ == '__main__':
     
     elif choice == 1:
         import os
-        import numpy as np
+        from src.ai.model_io import find_model, load_model
+        from src.ai.policy_table import PolicyTable, policy_path, weights_checksum
         
         print('Режим просмотра ИИ')
         
-        ai_player = AIPlayer()
+        ai_player = None
+        policy = None
         
-        ai_file = 'best_ai.npy'
-        if os.path.exists(ai_file):
+        ai_file = find_model('best_ai')
+        if ai_file:
             print(f'Загружаем обученного ИИ из {ai_file}...')
             try:
-                weights = np.load(ai_file)
-                ai_player.neural_network.set_weights_flat(weights)
+                ai_player, header = load_model(ai_file)
                 print('✓ Обученный ИИ загружен успешно!')
+                print(f'  Архитектура: {header["layer_sizes"]}, {header.get("activation", "relu")}, {header["dtype"]}')
+                if 'generation' in header:
+                    print(f'  Поколение: {header["generation"]}, счёт: {header["score"]}')
+                
+                policy_file = policy_path(ai_file)
+                if os.path.exists(policy_file):
+                    table = PolicyTable.load(policy_file)
+                    if table.checksum == weights_checksum(ai_player.neural_network):
+                        policy = table
+                        print(f'✓ Найдена таблица решений {policy_file}: T - включить/выключить')
+                        print('  Таблица приближённая (длины змейки сгруппированы в корзины) и может играть иначе, чем сеть')
+                    else:
+                        print(f'⚠ Таблица {policy_file} собрана для других весов, используем нейросеть')
             except Exception as e:
                 print(f'⚠ Ошибка загрузки: {e}')
                 print('Используем случайного ИИ')
         else:
-            print(f'Файл {ai_file} не найден')
+            print('Файл best_ai.snk (или best_ai.npy) не найден')
             print('Используем случайного ИИ (обучите сначала через тренер ИИ)')
         
+        if ai_player is None:
+            ai_player = AIPlayer()
+        
         print(f'Запуск игры с ИИ на поле {field_width}x{field_height}')
         print('ПРОБЕЛ - перезапуск игры')
         print('ESC - выход')
@@ -253,7 +279,8 @@ if __name__ == '__main__':
             width=field_width,
             height=field_height,
             cell_size=15,
-            ai_player=ai_player
+            ai_player=ai_player,
+            policy=policy
         )
         gui.run()
     
@@ -4,17 +4,39 @@ from src.game_logic import Direction
 
 
 class AIPlayer:
-    def __init__(self, hidden_layers: list | None = None):
+    INPUT_SIZE = 8
+    OUTPUT_SIZE = 4
+    DEFAULT_HIDDEN_LAYERS = [1024, 1536, 1024, 512]
+    
+    def __init__(
+        self,
+        hidden_layers: list | None = None,
+        dtype: np.dtype | str = np.float32,
+        initialize: bool = True,
+        activation: str = 'relu',
+        rng: np.random.Generator | None = None
+    ):
         if hidden_layers is None:
-            hidden_layers = [1024, 1536, 1024, 512]
-        
-        input_size = 8
-        output_size = 4
+            hidden_layers = self.DEFAULT_HIDDEN_LAYERS
         
-        layer_sizes = [input_size] + hidden_layers + [output_size]
-        self.neural_network = NeuralNetwork(layer_sizes)
+        layer_sizes = [self.INPUT_SIZE] + hidden_layers + [self.OUTPUT_SIZE]
+        self.neural_network = NeuralNetwork(layer_sizes, dtype, initialize, activation, rng)
+        self.policy = None
+    
+    @classmethod
+    def from_network(cls, neural_network: NeuralNetwork) -> 'AIPlayer':
+        ai_player = cls.__new__(cls)
+        ai_player.neural_network = neural_network
+        ai_player.policy = None
+        return ai_player
+    
+    def clone(self) -> 'AIPlayer':
+        return AIPlayer.from_network(self.neural_network.clone())
     
     def decide_direction(self, game_state: dict) -> Direction:
+        if self.policy is not None and self.policy.field_size == tuple(game_state['field_size']):
+            return self.policy.decide_direction(game_state)
+        
         inputs = self.state_to_input(game_state)
         outputs = self.neural_network.forward(inputs)
         
@@ -53,3 +75,30 @@ class AIPlayer:
         ])
         
         return inputs
+    
+    @staticmethod
+    def states_to_inputs(
+        head_x: np.ndarray,
+        head_y: np.ndarray,
+        apple_x: np.ndarray,
+        apple_y: np.ndarray,
+        current_length: np.ndarray,
+        field_size: tuple
+    ) -> np.ndarray:
+        field_width, field_height = field_size
+        
+        dx = (apple_x - head_x) / field_width
+        dy = (apple_y - head_y) / field_height
+        
+        inputs = np.stack([
+            head_x / field_width,
+            head_y / field_height,
+            apple_x / field_width,
+            apple_y / field_height,
+            dx,
+            dy,
+            np.sqrt(dx**2 + dy**2),
+            current_length / (field_width * field_height)
+        ], axis=1)
+        
+        return inputs
@@ -0,0 +1,157 @@
+import os
+import re
+import json
+import zlib
+import numpy as np
+from collections import deque
+from typing import List, Tuple
+from src.ai.neural_network import NeuralNetwork
+from src.ai.model_io import save_model
+
+
+CHECKPOINT_PATTERN = re.compile(r'ckpt_(\d{6})\.npz$')
+
+
+class SnapshotHistory:
+    def __init__(self, keyframe_interval: int = 10, keep: int = 5, companions: Tuple[str, ...] = ()):
+        self.keyframe_interval = keyframe_interval
+        self.keep = keep
+        self.companions = companions
+        self.chains = deque()
+        self.base = None
+        self.base_weights = None
+    
+    def save(self, filename: str, layer_sizes: List[int], weights: np.ndarray, **metadata):
+        delta = (
+            self.base is not None
+            and len(self.chains[-1]) < self.keyframe_interval
+            and self.base_weights.shape == weights.shape
+            and self.base_weights.dtype == weights.dtype
+            and np.count_nonzero(weights != self.base_weights) * 2 < weights.size
+        )
+        
+        if delta:
+            save_model(filename, layer_sizes, weights, base=self.base, base_weights=self.base_weights, **metadata)
+            self.chains[-1].append(filename)
+        else:
+            save_model(filename, layer_sizes, weights, **metadata)
+            self.chains.append([filename])
+        
+        self.base = filename
+        self.base_weights = weights.copy()
+        
+        while len(self.chains) > self.keep:
+            for old_filename in self.chains.popleft():
+                stem = os.path.splitext(old_filename)[0]
+                for path in [old_filename] + [stem + extension for extension in self.companions]:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+
+class CheckpointStore:
+    def __init__(self, directory: str = 'checkpoints', keyframe_interval: int = 10, keep: int = 2):
+        self.directory = directory
+        self.keyframe_interval = keyframe_interval
+        self.keep = keep
+        self.chain_length = 0
+        self.previous = {}
+        
+        os.makedirs(directory, exist_ok=True)
+        indices = self._indices()
+        self.index = indices[-1] if indices else -1
+        self.keyframes = [index for index in indices if self._read_state(index)['keyframe']]
+    
+    def _path(self, index: int) -> str:
+        return os.path.join(self.directory, f'ckpt_{index:06d}.npz')
+    
+    def _indices(self) -> List[int]:
+        return sorted(
+            int(match.group(1))
+            for match in map(CHECKPOINT_PATTERN.match, os.listdir(self.directory))
+            if match
+        )
+    
+    def _read_state(self, index: int) -> dict:
+        with np.load(self._path(index)) as data:
+            return json.loads(data['state'].tobytes())
+    
+    def save(self, state: dict, networks: List[NeuralNetwork]) -> str:
+        keyframe = self.chain_length >= self.keyframe_interval or not self.previous
+        arrays = {}
+        
+        for i, network in enumerate(networks):
+            if not keyframe and network.genome_id in self.previous:
+                arrays[f'lineage_{i}'] = np.array([[self.previous[network.genome_id], 0, network.params.size]])
+            elif not keyframe and network.lineage and all(parent in self.previous for parent, _, _ in network.lineage):
+                arrays[f'lineage_{i}'] = np.array([
+                    [self.previous[parent], start, stop] for parent, start, stop in network.lineage
+                ])
+                mutated = network.mutated if network.mutated is not None else np.empty(0, dtype=np.int64)
+                gaps = np.diff(mutated, prepend=0).astype('<u4')
+                arrays[f'mutated_{i}'] = np.frombuffer(zlib.compress(gaps.tobytes(), 1), dtype=np.uint8)
+                arrays[f'values_{i}'] = network.params[mutated]
+            else:
+                arrays[f'full_{i}'] = network.params
+        
+        state = dict(state, keyframe=keyframe, population_size=len(networks))
+        arrays['state'] = np.frombuffer(json.dumps(state).encode('utf-8'), dtype=np.uint8)
+        
+        self.index += 1
+        path = self._path(self.index)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, path)
+        if keyframe:
+            self.keyframes.append(self.index)
+        
+        self.chain_length = 1 if keyframe else self.chain_length + 1
+        self.previous = {network.genome_id: i for i, network in enumerate(networks)}
+        self._apply_retention()
+        return path
+    
+    def _apply_retention(self):
+        if len(self.keyframes) > self.keep:
+            cutoff = self.keyframes[-self.keep]
+            for index in self._indices():
+                if index < cutoff:
+                    os.remove(self._path(index))
+            self.keyframes = self.keyframes[-self.keep:]
+    
+    def load_latest(self, dtype: np.dtype) -> Tuple[dict, List[NeuralNetwork]] | None:
+        indices = self._indices()
+        if not indices:
+            return None
+        
+        start = self.keyframes[-1] if self.keyframes else indices[0]
+        chain = [index for index in reversed(indices) if index >= start]
+        
+        genomes = []
+        state = None
+        for index in reversed(chain):
+            with np.load(self._path(index)) as data:
+                state = json.loads(data['state'].tobytes())
+                genomes = [self._decode(data, i, genomes) for i in range(state['population_size'])]
+        
+        activation = state.get('activation', 'relu')
+        networks = [NeuralNetwork.from_weights(state['layer_sizes'], genome, dtype, activation) for genome in genomes]
+        
+        self.index = indices[-1]
+        self.chain_length = len(chain)
+        self.previous = {network.genome_id: i for i, network in enumerate(networks)}
+        return state, networks
+    
+    @staticmethod
+    def _decode(data, i: int, previous: List[np.ndarray]) -> np.ndarray:
+        if f'full_{i}' in data:
+            return data[f'full_{i}']
+        
+        lineage = data[f'lineage_{i}']
+        genome = np.empty_like(previous[lineage[0][0]])
+        for parent, start, stop in lineage:
+            genome[start:stop] = previous[parent][start:stop]
+        
+        if f'mutated_{i}' in data:
+            gaps = np.frombuffer(zlib.decompress(data[f'mutated_{i}'].tobytes()), dtype='<u4')
+            genome[np.cumsum(gaps, dtype=np.int64)] = data[f'values_{i}']
+        return genome
@@ -0,0 +1,235 @@
+import os
+import multiprocessing as mp
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from typing import List, Tuple
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import NeuralNetwork
+from src.ai.population_network import PopulationNetwork
+from src.ai.remote import RemoteEvaluator
+from src.vector_game import VectorSnakeGame
+
+
+def rollout_population(
+    population: PopulationNetwork,
+    field_width: int,
+    field_height: int,
+    seeds: np.ndarray,
+    max_steps: int = 5000,
+    actions: list | None = None
+) -> Tuple[List[Tuple[float, int]], int, int]:
+    size = population.size
+    game = VectorSnakeGame(size, field_width, field_height, seeds=seeds)
+    field_size = (field_width, field_height)
+    
+    steps = np.zeros(size, dtype=np.int64)
+    steps_without_food = np.zeros(size, dtype=np.int64)
+    max_steps_without_food = field_width * field_height * 3
+    
+    loop_detection_window = 8
+    position_history = np.zeros((size, loop_detection_window), dtype=np.int64)
+    history_length = np.zeros(size, dtype=np.int64)
+    
+    if actions is not None:
+        moves = np.zeros(size, dtype=np.int64)
+        codes = np.zeros((size, max_steps), dtype=np.uint8)
+    
+    active = np.ones(size, dtype=bool)
+    env_steps = 0
+    forward_calls = 0
+    
+    while active.any():
+        idx = np.flatnonzero(active)
+        env_steps += len(idx)
+        forward_calls += 1
+        inputs = AIPlayer.states_to_inputs(
+            game.head_x[idx], game.head_y[idx],
+            game.apple_x[idx], game.apple_y[idx],
+            game.length[idx], field_size
+        )
+        directions = population.decide(inputs, idx)
+        if actions is not None:
+            codes[idx, moves[idx]] = directions
+            moves[idx] += 1
+        
+        old_score = game.score[idx].copy()
+        game.step(directions, idx)
+        
+        ate = game.score[idx] > old_score
+        steps_without_food[idx] = np.where(ate, 0, steps_without_food[idx] + 1)
+        history_length[idx[ate]] = 0
+        
+        starving = steps_without_food[idx] > max_steps_without_food
+        idx = idx[~starving]
+        
+        heads = game.head_cells(idx)
+        filling = history_length[idx] < loop_detection_window
+        fill_idx = idx[filling]
+        position_history[fill_idx, history_length[fill_idx]] = heads[filling]
+        history_length[fill_idx] += 1
+        
+        full_idx = idx[~filling]
+        position_history[full_idx, :-1] = position_history[full_idx, 1:]
+        position_history[full_idx, -1] = heads[~filling]
+        window = np.sort(position_history[full_idx], axis=1)
+        distinct = 1 + np.count_nonzero(np.diff(window, axis=1), axis=1)
+        looping = np.zeros(len(idx), dtype=bool)
+        looping[~filling] = distinct < loop_detection_window // 2
+        
+        steps[idx[~looping]] += 1
+        
+        active[:] = False
+        running = idx[~looping]
+        active[running] = ~game.game_over[running] & (steps[running] < max_steps)
+    
+    fitness = game.score * 1000 + game.length * 10 + steps * 0.1
+    if actions is not None:
+        actions.extend(codes[i, :moves[i]].copy() for i in range(size))
+    
+    return list(zip(fitness.tolist(), game.score.tolist())), env_steps, forward_calls
+
+
+class SerialEvaluator:
+    def __init__(self, field_width: int = 30, field_height: int = 30):
+        self.field_width = field_width
+        self.field_height = field_height
+        self.env_steps = 0
+        self.forward_calls = 0
+    
+    def evaluate(
+        self,
+        players: List[AIPlayer],
+        seeds: np.ndarray,
+        max_steps: int = 5000,
+        actions: list | None = None
+    ) -> List[Tuple[float, int]]:
+        population = PopulationNetwork.from_players(players)
+        results, env_steps, forward_calls = rollout_population(
+            population, self.field_width, self.field_height, seeds, max_steps, actions
+        )
+        self.env_steps += env_steps
+        self.forward_calls += forward_calls
+        return results
+    
+    def stats(self) -> dict:
+        return {}
+    
+    def close(self):
+        pass
+
+
+_worker_segments = {}
+
+
+def _evaluate_chunk(
+    segment_name: str,
+    layer_sizes: List[int],
+    size: int,
+    start: int,
+    stop: int,
+    seeds: np.ndarray,
+    field_width: int,
+    field_height: int,
+    max_steps: int,
+    dtype: str,
+    activation: str,
+    record: bool
+) -> Tuple[List[Tuple[float, int]], int, int, list | None]:
+    segment = _worker_segments.get(segment_name)
+    if segment is None:
+        for old in _worker_segments.values():
+            old.close()
+        _worker_segments.clear()
+        segment = shared_memory.SharedMemory(name=segment_name)
+        _worker_segments[segment_name] = segment
+    
+    parameter_count = NeuralNetwork.count_parameters(layer_sizes)
+    genomes = np.ndarray((size, parameter_count), dtype=dtype, buffer=segment.buf)
+    population = PopulationNetwork(layer_sizes, stop - start, genomes[start:stop], activation=activation)
+    actions = [] if record else None
+    results, env_steps, forward_calls = rollout_population(population, field_width, field_height, seeds, max_steps, actions)
+    
+    del population, genomes
+    return results, env_steps, forward_calls, actions
+
+
+class ProcessPoolEvaluator:
+    def __init__(self, field_width: int = 30, field_height: int = 30, workers: int | None = None):
+        self.field_width = field_width
+        self.field_height = field_height
+        self.workers = workers or os.cpu_count() or 1
+        
+        if 'fork' in mp.get_all_start_methods():
+            context = mp.get_context('fork')
+        else:
+            context = mp.get_context('spawn')
+        
+        resource_tracker.ensure_running()
+        self.pool = context.Pool(self.workers)
+        self.segment = None
+        self.env_steps = 0
+        self.forward_calls = 0
+    
+    def _genome_buffer(self, size: int, parameter_count: int, dtype: np.dtype) -> np.ndarray:
+        nbytes = size * parameter_count * dtype.itemsize
+        if self.segment is None or self.segment.size < nbytes:
+            self._release_segment()
+            self.segment = shared_memory.SharedMemory(create=True, size=nbytes)
+        return np.ndarray((size, parameter_count), dtype=dtype, buffer=self.segment.buf)
+    
+    def _release_segment(self):
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
+    
+    def evaluate(
+        self,
+        players: List[AIPlayer],
+        seeds: np.ndarray,
+        max_steps: int = 5000,
+        actions: list | None = None
+    ) -> List[Tuple[float, int]]:
+        layer_sizes = players[0].neural_network.layer_sizes
+        dtype = players[0].neural_network.dtype
+        activation = players[0].neural_network.activation
+        parameter_count = NeuralNetwork.count_parameters(layer_sizes)
+        
+        genomes = self._genome_buffer(len(players), parameter_count, dtype)
+        for i, ai_player in enumerate(players):
+            genomes[i] = ai_player.neural_network.get_weights_flat()
+        del genomes
+        
+        bounds = np.linspace(0, len(players), min(self.workers, len(players)) + 1).astype(int)
+        tasks = [
+            (self.segment.name, layer_sizes, len(players), start, stop, seeds[start:stop],
+             self.field_width, self.field_height, max_steps, dtype.str, activation, actions is not None)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        
+        results = []
+        for chunk, env_steps, forward_calls, chunk_actions in self.pool.starmap(_evaluate_chunk, tasks):
+            results.extend(chunk)
+            if actions is not None:
+                actions.extend(chunk_actions)
+            self.env_steps += env_steps
+            self.forward_calls += forward_calls
+        return results
+    
+    def stats(self) -> dict:
+        return {}
+    
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        self._release_segment()
+
+
+def create_evaluator(field_width: int = 30, field_height: int = 30, workers: int = 1, coordinator: str | None = None):
+    if coordinator:
+        return RemoteEvaluator(field_width, field_height, coordinator, min_workers=max(1, workers))
+    if workers == 1:
+        return SerialEvaluator(field_width, field_height)
+    return ProcessPoolEvaluator(field_width, field_height, workers or None)
@@ -0,0 +1,172 @@
+import numpy as np
+from typing import List, Tuple
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import NeuralNetwork
+from src.ai.genetic_algorithm import GeneticAlgorithm
+from src.ai.profiler import PhaseTimer
+
+
+class EvolutionStrategies(GeneticAlgorithm):
+    ALGORITHM = 'es'
+    
+    def __init__(
+        self,
+        population_size: int = 200,
+        noise_std: float = 0.02,
+        learning_rate: float = 0.01,
+        weight_decay: float = 0.005,
+        update_block: int = 16,
+        **kwargs
+    ):
+        if kwargs.get('compact_genomes'):
+            raise ValueError("Компактные геномы не поддерживаются в режиме ES")
+        
+        self.noise_std = noise_std
+        self.learning_rate = learning_rate
+        self.weight_decay = weight_decay
+        self.update_block = update_block
+        self.ranking: List[Tuple[float, int, AIPlayer]] = []
+        super().__init__(population_size=max(2, population_size // 2 * 2), **kwargs)
+    
+    def initialize_population(self):
+        self.set_center(AIPlayer(self.hidden_layers, self.dtype, activation=self.activation, rng=self.evolution_rng))
+        self.adam_m = np.zeros_like(self.center.neural_network.params)
+        self.adam_v = np.zeros_like(self.center.neural_network.params)
+        self.adam_step = 0
+    
+    def set_center(self, ai_player: AIPlayer):
+        network = ai_player.neural_network
+        self.center = AIPlayer.from_network(
+            NeuralNetwork.from_weights(self.layer_sizes, np.array(network.get_weights_flat()), self.dtype, self.activation)
+        )
+        self.population = [self.center]
+    
+    def perturbation(self, seed: int) -> np.ndarray:
+        return np.random.default_rng(seed).standard_normal(self.center.neural_network.params.size, dtype=self.dtype)
+    
+    def sample_candidates(self) -> Tuple[np.ndarray, List[AIPlayer]]:
+        seeds = self.evolution_rng.integers(0, 2**63 - 1, size=self.population_size // 2)
+        theta = self.center.neural_network.params
+        players = []
+        
+        for seed in seeds:
+            noise = self.perturbation(seed)
+            noise *= self.noise_std
+            for weights in (theta + noise, theta - noise):
+                network = NeuralNetwork.from_weights(self.layer_sizes, weights, self.dtype, self.activation)
+                players.append(AIPlayer.from_network(network))
+        
+        return seeds, players
+    
+    @staticmethod
+    def centered_ranks(values: np.ndarray) -> np.ndarray:
+        _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+        ranks = (np.cumsum(counts) - counts + (counts - 1) / 2)[inverse]
+        return ranks / max(1, len(values) - 1) - 0.5
+    
+    def estimate_gradient(self, seeds: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        gradient = np.zeros_like(self.center.neural_network.params)
+        
+        for start in range(0, len(seeds), self.update_block):
+            block = np.stack([self.perturbation(seed) for seed in seeds[start:start + self.update_block]])
+            gradient += weights[start:start + self.update_block].astype(self.dtype) @ block
+        
+        gradient /= len(seeds) * 2 * self.noise_std
+        return gradient
+    
+    def apply_update(self, gradient: np.ndarray, beta1: float = 0.9, beta2: float = 0.999, epsilon: float = 1e-8):
+        theta = self.center.neural_network.params
+        gradient = gradient - self.weight_decay * theta
+        
+        self.adam_step += 1
+        self.adam_m = beta1 * self.adam_m + (1 - beta1) * gradient
+        self.adam_v = beta2 * self.adam_v + (1 - beta2) * gradient * gradient
+        step_size = self.learning_rate * np.sqrt(1 - beta2 ** self.adam_step) / (1 - beta1 ** self.adam_step)
+        
+        new_theta = theta + (step_size * self.adam_m / (np.sqrt(self.adam_v) + epsilon)).astype(self.dtype)
+        self.set_center(AIPlayer.from_network(NeuralNetwork.from_weights(self.layer_sizes, new_theta, self.dtype)))
+    
+    def evolve_generation(self, verbose: bool = True) -> dict:
+        cache_hits = self.fitness_cache.hits
+        
+        with self.profiler.span('perturbation'):
+            seeds, players = self.sample_candidates()
+        
+        results = self.rank_population(players)
+        fitness = np.array([result[0] for result in results])
+        shaped = self.centered_ranks(fitness).reshape(-1, 2)
+        
+        with self.profiler.span('update'):
+            gradient = self.estimate_gradient(seeds, shaped[:, 0] - shaped[:, 1])
+            self.apply_update(gradient)
+        
+        self.ranking = sorted(
+            ((fitness, score, ai_player) for (fitness, score), ai_player in zip(results, players)),
+            key=lambda x: x[0],
+            reverse=True
+        )
+        self.fitness_records = [(fitness, score) for fitness, score, _ in self.ranking]
+        del players
+        
+        best_fitness, best_score, _ = self.ranking[0]
+        avg_fitness = sum(f[0] for f in self.ranking) / len(self.ranking)
+        avg_score = sum(f[1] for f in self.ranking) / len(self.ranking)
+        center_fitness, center_score = self.evaluate_population([self.center])[0]
+        self.keep_episodes([self.center, self.ranking[0][2]])
+        
+        if best_fitness > self.best_fitness:
+            self.best_fitness = best_fitness
+            self.best_score = best_score
+        
+        self.generation += 1
+        if self.reseed_interval and self.generation % self.reseed_interval == 0:
+            self.reseed()
+        
+        stats = {
+            'generation': self.generation,
+            'best_fitness': best_fitness,
+            'best_score': best_score,
+            'avg_fitness': avg_fitness,
+            'avg_score': avg_score,
+            'center_fitness': center_fitness,
+            'center_score': center_score,
+            'gradient_norm': float(np.linalg.norm(gradient)),
+            'best_overall_fitness': self.best_fitness,
+            'best_overall_score': self.best_score,
+            'cached_evaluations': self.fitness_cache.hits - cache_hits
+        }
+        
+        if self.evaluation_mode == 'racing':
+            stats.update(self.racing_stats)
+        
+        stats.update(self.profiler.collect())
+        stats.update(self.writer.stats())
+        stats.update(self.evaluator.stats())
+        
+        if verbose:
+            print(f"Поколение {self.generation}: "
+                  f"Лучший счёт={best_score:.0f}, "
+                  f"Средний счёт={avg_score:.1f}, "
+                  f"Лучший fitness={best_fitness:.1f}, "
+                  f"Центр: счёт={center_score:.0f}, fitness={center_fitness:.1f}")
+            print(f"  Время: {PhaseTimer.format(stats)}")
+        
+        return stats
+    
+    def checkpoint_state(self) -> dict:
+        return dict(super().checkpoint_state(), adam_step=self.adam_step,
+                    noise_std=self.noise_std, learning_rate=self.learning_rate)
+    
+    def checkpoint_networks(self) -> List[NeuralNetwork]:
+        return [
+            self.center.neural_network,
+            NeuralNetwork.from_weights(self.layer_sizes, self.adam_m, self.dtype),
+            NeuralNetwork.from_weights(self.layer_sizes, self.adam_v, self.dtype)
+        ]
+    
+    def restore_population(self, state: dict, networks: List[NeuralNetwork]):
+        center, adam_m, adam_v = networks
+        self.set_center(AIPlayer.from_network(center))
+        self.adam_m = np.array(adam_m.params)
+        self.adam_v = np.array(adam_v.params)
+        self.adam_step = state['adam_step']
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+from src.episode import Episode
+
+
+class FitnessCache:
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self.entries: OrderedDict[Hashable, Tuple[float, int]] = OrderedDict()
+        self.episodes: Dict[Hashable, Episode] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Tuple[float, int] | None:
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result
+    
+    def episode(self, key: Hashable) -> Episode | None:
+        return self.episodes.get(key)
+    
+    def put(self, key: Hashable, result: Tuple[float, int], episode: Episode | None = None):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if episode is not None:
+            self.episodes[key] = episode
+        
+        while len(self.entries) > self.max_size:
+            old_key, _ = self.entries.popitem(last=False)
+            self.episodes.pop(old_key, None)
+    
+    def clear(self):
+        self.entries.clear()
+        self.episodes.clear()
+    
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -2,13 +2,23 @@ import random
 import os
 import numpy as np
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from src.ai.neural_network import NeuralNetwork
 from src.ai.ai_player import AIPlayer
+from src.ai.evaluator import create_evaluator
+from src.ai.fitness_cache import FitnessCache
+from src.ai.model_io import load_model, save_model
+from src.ai.checkpoint import CheckpointStore, SnapshotHistory
+from src.ai.profiler import PhaseTimer
+from src.ai.model_writer import ModelWriter
+from src.ai.genome import CompactPlayer, Genome, GenomeDecoder, decode_genomes, encode_genomes
 from src.game_logic import SnakeGame
+from src.episode import Episode, pack_actions
 
 
 class GeneticAlgorithm:
+    ALGORITHM = 'ga'
+    
     def __init__(
         self,
         population_size: int = 200,
@@ -16,7 +26,24 @@ class GeneticAlgorithm:
         mutation_strength: float = 0.25,
         elite_count: int = 20,
         field_width: int = 30,
-        field_height: int = 30
+        field_height: int = 30,
+        workers: int = 1,
+        evaluator=None,
+        seed: int | None = None,
+        cache_size: int | None = None,
+        reseed_interval: int = 1,
+        evaluation_mode: str = 'single',
+        racing_rounds: int = 3,
+        racing_keep: float = 1 / 3,
+        racing_episodes: int = 2,
+        dtype: str = 'float32',
+        storage_dtype: str | None = None,
+        hidden_layers: List[int] | None = None,
+        activation: str = 'relu',
+        compact_genomes: bool = False,
+        genome_cache_size: int | None = None,
+        coordinator: str | None = None,
+        record_episodes: bool = False
     ):
         self.population_size = population_size
         self.mutation_rate = mutation_rate
@@ -24,6 +51,42 @@ class GeneticAlgorithm:
         self.elite_count = elite_count
         self.field_width = field_width
         self.field_height = field_height
+        self.dtype = np.dtype(dtype)
+        self.storage_dtype = np.dtype(storage_dtype) if storage_dtype else self.dtype
+        self.hidden_layers = list(hidden_layers or AIPlayer.DEFAULT_HIDDEN_LAYERS)
+        self.activation = activation
+        self.layer_sizes = [AIPlayer.INPUT_SIZE] + self.hidden_layers + [AIPlayer.OUTPUT_SIZE]
+        
+        evaluation_seed, evolution_seed = np.random.SeedSequence(seed).spawn(2)
+        self.rng = np.random.default_rng(evaluation_seed)
+        self.evolution_rng = np.random.default_rng(evolution_seed)
+        self.evaluator = evaluator or create_evaluator(field_width, field_height, workers, coordinator)
+        self.fitness_cache = FitnessCache(cache_size or max(1000, population_size * 4))
+        self.reseed_interval = reseed_interval
+        self.evaluation_seed = int(self.rng.integers(0, 2**63 - 1))
+        
+        self.evaluation_mode = evaluation_mode
+        self.racing_rounds = racing_rounds
+        self.racing_keep = racing_keep
+        self.racing_episodes = racing_episodes
+        self.racing_stats = {}
+        self.fitness_records: List[Tuple[float, int]] = []
+        self.record_episodes = record_episodes
+        self.episodes: Dict[int, Episode] = {}
+        self.profiler = PhaseTimer()
+        self.snapshots = SnapshotHistory()
+        self.writer = ModelWriter()
+        self.decoder = None
+        self.genome_checkpoints = 0
+        if compact_genomes:
+            self.decoder = GenomeDecoder(
+                self.layer_sizes,
+                self.dtype,
+                activation,
+                mutation_rate,
+                mutation_strength,
+                genome_cache_size or population_size * 2
+            )
         
         self.population: List[AIPlayer] = []
         self.generation = 0
@@ -37,11 +100,27 @@ class GeneticAlgorithm:
     def initialize_population(self):
         self.population = []
         for _ in range(self.population_size):
-            ai_player = AIPlayer()
+            if self.decoder is not None:
+                ai_player = CompactPlayer(self.decoder, Genome(self.genome_seed()))
+            else:
+                ai_player = AIPlayer(self.hidden_layers, self.dtype, activation=self.activation, rng=self.evolution_rng)
             self.population.append(ai_player)
     
-    def evaluate_fitness(self, ai_player: AIPlayer, max_steps: int = 5000) -> Tuple[float, int]:
-        game = SnakeGame(self.field_width, self.field_height)
+    def genome_seed(self) -> int:
+        return int(self.evolution_rng.integers(0, 2**63 - 1))
+    
+    def evaluate_fitness(
+        self,
+        ai_player: AIPlayer,
+        max_steps: int = 5000,
+        seed: int | None = None,
+        record: bool = False
+    ) -> Tuple[float, int] | Tuple[float, int, Episode]:
+        if record and seed is None:
+            seed = int(np.random.default_rng().integers(0, 2**63 - 1))
+        
+        game = SnakeGame(self.field_width, self.field_height, seed=seed)
+        directions = []
         steps = 0
         steps_without_food = 0
         max_steps_without_food = self.field_width * self.field_height * 3
@@ -53,6 +132,9 @@ class GeneticAlgorithm:
             state = game.get_state_for_ai()
             direction = ai_player.decide_direction(state)
             
+            if record:
+                directions.append(direction)
+            
             old_score = game.score
             game.set_direction(direction)
             game.step()
@@ -79,16 +161,153 @@ class GeneticAlgorithm:
         
         fitness = score * 1000 + length * 10 + steps * 0.1
         
+        if record:
+            episode = Episode.from_directions(
+                seed,
+                (self.field_width, self.field_height),
+                directions,
+                initial_length=game.initial_length,
+                score=score,
+                fitness=fitness
+            )
+            return fitness, score, episode
+        
         return fitness, score
     
-    def evolve_generation(self, verbose: bool = True) -> dict:
-        fitness_scores = []
+    def record_episode(self, ai_player: AIPlayer, max_steps: int = 5000, seed: int | None = None) -> Episode:
+        episode = self.episodes.get(ai_player.neural_network.genome_id)
+        if episode is not None:
+            return episode
         
-        for ai_player in self.population:
-            fitness, score = self.evaluate_fitness(ai_player)
-            fitness_scores.append((fitness, score, ai_player))
+        seed = self.evaluation_seed if seed is None else seed
+        actions = []
+        with self.profiler.span('recording'):
+            (fitness, score), = self.evaluator.evaluate([ai_player], np.array([seed], dtype=np.int64), max_steps, actions=actions)
+        return self.build_episode(seed, actions[0], fitness, score)
+    
+    def build_episode(self, seed: int, codes: np.ndarray, fitness: float, score: int) -> Episode:
+        return Episode(
+            int(seed),
+            (self.field_width, self.field_height),
+            pack_actions(codes),
+            len(codes),
+            score=int(score),
+            fitness=fitness
+        )
+    
+    def evaluate_population(
+        self,
+        players: List[AIPlayer],
+        max_steps: int = 5000,
+        seeds: np.ndarray | None = None
+    ) -> List[Tuple[float, int]]:
+        if seeds is None:
+            seeds = np.full(len(players), self.evaluation_seed, dtype=np.int64)
+        
+        keys = [
+            (ai_player.neural_network.genome_id, int(seed), max_steps)
+            for ai_player, seed in zip(players, seeds)
+        ]
+        results = [self.fitness_cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        actions = [] if self.record_episodes else None
+        
+        if missing:
+            env_steps = self.evaluator.env_steps
+            forward_calls = self.evaluator.forward_calls
+            
+            with self.profiler.span('evaluation'):
+                evaluated = self.evaluator.evaluate(
+                    [players[i] for i in missing],
+                    np.asarray(seeds)[missing],
+                    max_steps,
+                    actions=actions
+                )
+            
+            self.profiler.count('evaluations', len(missing))
+            self.profiler.count('env_steps', self.evaluator.env_steps - env_steps)
+            self.profiler.count('forward_calls', self.evaluator.forward_calls - forward_calls)
+            for row, (i, result) in enumerate(zip(missing, evaluated)):
+                results[i] = result
+                episode = None
+                if actions is not None:
+                    episode = self.build_episode(seeds[i], actions[row], *result)
+                self.fitness_cache.put(keys[i], result, episode)
+        
+        if self.record_episodes:
+            for key in keys:
+                episode = self.fitness_cache.episode(key)
+                if episode is not None:
+                    self.episodes[key[0]] = episode
+        
+        return results
+    
+    def keep_episodes(self, players: List[AIPlayer]):
+        genome_ids = {ai_player.neural_network.genome_id for ai_player in players}
+        self.episodes = {genome_id: episode for genome_id, episode in self.episodes.items() if genome_id in genome_ids}
+    
+    def episode_seeds(self, count: int) -> np.ndarray:
+        seeds = np.random.default_rng(self.evaluation_seed).integers(0, 2**63 - 1, size=count)
+        seeds[0] = self.evaluation_seed
+        return seeds
+    
+    def race_population(self, players: List[AIPlayer], max_steps: int = 5000) -> List[Tuple[float, float]]:
+        results = [None] * len(players)
+        candidates = list(range(len(players)))
+        env_steps = self.evaluator.env_steps
+        racing_budget = 0
+        
+        for round_idx in range(self.racing_rounds):
+            step_limit = max(1, int(max_steps * self.racing_keep ** (self.racing_rounds - 1 - round_idx)))
+            episodes = self.racing_episodes * 2 ** round_idx
+            seeds = np.repeat(self.episode_seeds(episodes), len(candidates))
+            
+            episode_results = self.evaluate_population(
+                [players[i] for i in candidates] * episodes,
+                step_limit,
+                seeds
+            )
+            totals = np.array(episode_results).reshape(episodes, len(candidates), 2).mean(axis=0)
+            
+            for i, (fitness, score) in zip(candidates, totals.tolist()):
+                results[i] = (fitness, score)
+            racing_budget += len(candidates) * episodes * step_limit
+            
+            if round_idx < self.racing_rounds - 1:
+                keep = max(1, int(np.ceil(len(candidates) * self.racing_keep)))
+                candidates = sorted(candidates, key=lambda i: results[i][0], reverse=True)[:keep]
+        
+        exhaustive_budget = len(players) * self.racing_episodes * 2 ** (self.racing_rounds - 1) * max_steps
+        self.racing_stats = {
+            'racing_env_steps': self.evaluator.env_steps - env_steps,
+            'racing_step_budget': racing_budget,
+            'exhaustive_step_budget': exhaustive_budget,
+            'unspent_step_budget': exhaustive_budget - racing_budget
+        }
+        
+        return results
+    
+    def rank_population(self, players: List[AIPlayer]) -> List[Tuple[float, float]]:
+        if self.evaluation_mode == 'racing':
+            return self.race_population(players)
+        return self.evaluate_population(players)
+    
+    def reseed(self):
+        self.evaluation_seed = int(self.rng.integers(0, 2**63 - 1))
+    
+    def close(self):
+        self.writer.close()
+        self.evaluator.close()
+    
+    def evolve_generation(self, verbose: bool = True) -> dict:
+        cache_hits = self.fitness_cache.hits
+        fitness_scores = [
+            (fitness, score, ai_player)
+            for (fitness, score), ai_player in zip(self.rank_population(self.population), self.population)
+        ]
         
         fitness_scores.sort(key=lambda x: x[0], reverse=True)
+        self.fitness_records = [(fitness, score) for fitness, score, _ in fitness_scores]
         
         best_fitness = fitness_scores[0][0]
         best_score = fitness_scores[0][1]
@@ -100,23 +319,39 @@ class GeneticAlgorithm:
             self.best_score = best_score
         
         elites = [f[2] for f in fitness_scores[:self.elite_count]]
+        for elite in elites:
+            if self.decoder is None:
+                elite.neural_network.detach()
+            else:
+                elite.release()
         
+        self.keep_episodes(elites)
         new_population = [elite for elite in elites]
         
         while len(new_population) < self.population_size:
-            parent1 = self.tournament_selection(fitness_scores)
-            parent2 = self.tournament_selection(fitness_scores)
+            with self.profiler.span('selection'):
+                parent1 = self.tournament_selection(fitness_scores)
+                parent2 = self.tournament_selection(fitness_scores)
+            
+            if self.decoder is not None:
+                genome = Genome(self.genome_seed(), (parent1.genome, parent2.genome))
+                new_population.append(CompactPlayer(self.decoder, genome))
+                continue
             
-            child_nn = NeuralNetwork.crossover(parent1.neural_network, parent2.neural_network)
-            child_nn.mutate(self.mutation_rate, self.mutation_strength)
+            with self.profiler.span('crossover'):
+                child_nn = NeuralNetwork.crossover(parent1.neural_network, parent2.neural_network, rng=self.evolution_rng)
             
-            child = AIPlayer()
-            child.neural_network = child_nn
-            new_population.append(child)
+            with self.profiler.span('mutation'):
+                child_nn.mutate(self.mutation_rate, self.mutation_strength, rng=self.evolution_rng)
+            
+            new_population.append(AIPlayer.from_network(child_nn))
         
         self.population = new_population
         self.generation += 1
         
+        if self.reseed_interval and self.generation % self.reseed_interval == 0:
+            self.reseed()
+        
         stats = {
             'generation': self.generation,
             'best_fitness': best_fitness,
@@ -124,19 +359,45 @@ class GeneticAlgorithm:
             'avg_fitness': avg_fitness,
             'avg_score': avg_score,
             'best_overall_fitness': self.best_fitness,
-            'best_overall_score': self.best_score
+            'best_overall_score': self.best_score,
+            'cached_evaluations': self.fitness_cache.hits - cache_hits
         }
         
+        if self.evaluation_mode == 'racing':
+            stats.update(self.racing_stats)
+        
+        stats.update(self.profiler.collect())
+        stats.update(self.writer.stats())
+        stats.update(self.evaluator.stats())
+        if self.decoder is not None:
+            stats.update(self.decoder.stats())
+        
         if verbose:
             print(f"Поколение {self.generation}: "
                   f"Лучший счёт={best_score:.0f}, "
                   f"Средний счёт={avg_score:.1f}, "
                   f"Лучший fitness={best_fitness:.1f}")
+            if self.evaluation_mode == 'racing':
+                print(f"  Гонка: шагов среды={self.racing_stats['racing_env_steps']}, "
+                      f"не выделено шагов бюджета={self.racing_stats['unspent_step_budget']} "
+                      f"из {self.racing_stats['exhaustive_step_budget']}")
+            print(f"  Время: {PhaseTimer.format(stats)}")
         
         return stats
     
+    def migrants(self, count: int) -> List[np.ndarray]:
+        return [np.array(ai_player.neural_network.get_weights_flat()) for ai_player in self.population[:count]]
+    
+    def accept_migrants(self, weights: List[np.ndarray]) -> int:
+        count = min(len(weights), self.population_size - self.elite_count)
+        for i, genome in enumerate(weights[:count]):
+            network = NeuralNetwork.from_weights(self.layer_sizes, genome, self.dtype, self.activation)
+            self.population[self.population_size - count + i] = AIPlayer.from_network(network)
+        return count
+    
     def tournament_selection(self, fitness_scores: List[Tuple[float, int, AIPlayer]], tournament_size: int = 3) -> AIPlayer:
-        tournament = random.sample(fitness_scores, min(tournament_size, len(fitness_scores)))
+        picks = self.evolution_rng.choice(len(fitness_scores), min(tournament_size, len(fitness_scores)), replace=False)
+        tournament = [fitness_scores[i] for i in picks]
         winner = max(tournament, key=lambda x: x[0])
         return winner[2]
     
@@ -144,28 +405,155 @@ class GeneticAlgorithm:
         best_ai = self.population[0]
         best_fitness = -float('inf')
         
-        for ai_player in self.population:
-            fitness, _ = self.evaluate_fitness(ai_player)
+        for (fitness, _), ai_player in zip(self.rank_population(self.population), self.population):
             if fitness > best_fitness:
                 best_fitness = fitness
                 best_ai = ai_player
         
         return best_ai
     
-    def save_best(self, filename: str = "best_ai.npy", auto_save_history: bool = True):
+    def save_best(self, filename: str = "best_ai.snk", auto_save_history: bool = True):
         best_ai = self.get_best_ai()
-        weights = best_ai.neural_network.get_weights_flat()
-        np.save(filename, weights)
+        self.save_model(best_ai, filename)
         print(f"Лучший ИИ сохранён в {filename}")
         
         if auto_save_history:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            history_filename = f"models/history/gen_{self.generation}_score_{self.best_score:.0f}_{timestamp}.npy"
-            np.save(history_filename, weights)
+            history_filename = f"models/history/gen_{self.generation}_score_{self.best_score:.0f}_{timestamp}.snk"
+            self.save_snapshot(best_ai, history_filename)
             print(f"История: {history_filename}")
     
-    def load_best(self, filename: str = "best_ai.npy") -> AIPlayer:
-        weights = np.load(filename)
-        ai_player = AIPlayer()
-        ai_player.neural_network.set_weights_flat(weights)
+    def storage_weights(self, ai_player: AIPlayer) -> np.ndarray:
+        return ai_player.neural_network.get_weights_flat().astype(self.storage_dtype, copy=False)
+    
+    def save_model(self, ai_player: AIPlayer, filename: str, **metadata):
+        metadata.setdefault('generation', self.generation)
+        metadata.setdefault('score', self.best_score)
+        metadata.setdefault('fitness', self.best_fitness)
+        
+        with self.profiler.span('saving'):
+            self.writer.submit(
+                filename,
+                save_model,
+                filename,
+                ai_player.neural_network.layer_sizes,
+                np.array(self.storage_weights(ai_player)),
+                activation=ai_player.neural_network.activation,
+                field_size=[self.field_width, self.field_height],
+                saved_at=datetime.now().isoformat(timespec='seconds'),
+                **metadata
+            )
+    
+    def save_snapshot(self, ai_player: AIPlayer, filename: str, snapshots: SnapshotHistory | None = None, **metadata):
+        metadata.setdefault('generation', self.generation)
+        metadata.setdefault('score', self.best_score)
+        metadata.setdefault('fitness', self.best_fitness)
+        
+        with self.profiler.span('saving'):
+            self.writer.submit(
+                filename,
+                (snapshots or self.snapshots).save,
+                filename,
+                ai_player.neural_network.layer_sizes,
+                np.array(self.storage_weights(ai_player)),
+                activation=ai_player.neural_network.activation,
+                field_size=[self.field_width, self.field_height],
+                saved_at=datetime.now().isoformat(timespec='seconds'),
+                **metadata
+            )
+    
+    def checkpoint_state(self) -> dict:
+        version, internal_state, gauss = random.getstate()
+        return {
+            'algorithm': self.ALGORITHM,
+            'generation': self.generation,
+            'best_fitness': self.best_fitness,
+            'best_score': self.best_score,
+            'evaluation_seed': self.evaluation_seed,
+            'rng': self.rng.bit_generator.state,
+            'evolution_rng': self.evolution_rng.bit_generator.state,
+            'random': [version, list(internal_state), gauss],
+            'layer_sizes': self.layer_sizes,
+            'activation': self.activation,
+            'compact_genomes': self.decoder is not None,
+            'dtype': self.dtype.str,
+            'field_size': [self.field_width, self.field_height],
+            'mutation_rate': self.mutation_rate,
+            'mutation_strength': self.mutation_strength,
+            'elite_count': self.elite_count
+        }
+    
+    def save_checkpoint(self, store: CheckpointStore):
+        with self.profiler.span('saving'):
+            if self.decoder is not None:
+                if self.genome_checkpoints % store.keyframe_interval == 0:
+                    self.rebase_genomes()
+                self.genome_checkpoints += 1
+                records, indices, weights = encode_genomes([ai_player.genome for ai_player in self.population])
+                state = dict(self.checkpoint_state(), genomes={'records': records, 'population': indices, 'anchors': list(weights)})
+                networks = []
+                for i, params in weights.items():
+                    network = NeuralNetwork.from_weights(self.layer_sizes, params, self.dtype, self.activation)
+                    network.genome_id = ('genome', records[i][0])
+                    networks.append(network)
+                self.writer.submit(store.directory, store.save, state, networks)
+            else:
+                self.writer.submit(store.directory, store.save, self.checkpoint_state(), self.checkpoint_networks())
+    
+    def rebase_genomes(self):
+        anchors = {}
+        for ai_player in self.population:
+            genome = ai_player.genome
+            members = (genome,) if genome.seed in self.decoder.cache else genome.parents
+            anchors.update((member.seed, member) for member in members if member.parents)
+        
+        weights = {seed: self.decoder.params(genome) for seed, genome in anchors.items()}
+        for seed, genome in anchors.items():
+            genome.weights = weights[seed]
+            genome.parents = ()
+    
+    def checkpoint_networks(self) -> List[NeuralNetwork]:
+        return [ai_player.neural_network for ai_player in self.population]
+    
+    def restore_population(self, state: dict, networks: List[NeuralNetwork]):
+        if self.decoder is not None:
+            anchors = state['genomes'].get('anchors', [])
+            weights = {i: network.params for i, network in zip(anchors, networks)}
+            genomes = decode_genomes(state['genomes']['records'], state['genomes']['population'], weights)
+            self.genome_checkpoints = 0
+            self.population = [CompactPlayer(self.decoder, genome) for genome in genomes]
+        else:
+            self.population = [AIPlayer.from_network(network) for network in networks]
+        self.population_size = len(self.population)
+    
+    def load_checkpoint(self, store: CheckpointStore) -> bool:
+        layer_sizes = self.layer_sizes
+        loaded = store.load_latest(self.dtype)
+        if loaded is None:
+            return False
+        
+        state, networks = loaded
+        if state.get('algorithm', 'ga') != self.ALGORITHM:
+            raise ValueError(f"Чекпоинт создан алгоритмом {state.get('algorithm', 'ga')}, а не {self.ALGORITHM}")
+        if state['layer_sizes'] != layer_sizes:
+            raise ValueError(f"Архитектура чекпоинта {state['layer_sizes']} не совпадает с {layer_sizes}")
+        if state.get('activation', 'relu') != self.activation:
+            raise ValueError(f"Активация чекпоинта {state.get('activation', 'relu')} не совпадает с {self.activation}")
+        if state.get('compact_genomes', False) != (self.decoder is not None):
+            raise ValueError("Режим компактных геномов чекпоинта не совпадает с текущим")
+        
+        self.restore_population(state, networks)
+        self.generation = state['generation']
+        self.best_fitness = state['best_fitness']
+        self.best_score = state['best_score']
+        self.evaluation_seed = state['evaluation_seed']
+        self.rng.bit_generator.state = state['rng']
+        self.evolution_rng.bit_generator.state = state['evolution_rng']
+        version, internal_state, gauss = state['random']
+        random.setstate((version, tuple(internal_state), gauss))
+        self.fitness_cache.clear()
+        return True
+    
+    def load_best(self, filename: str = "best_ai.snk") -> AIPlayer:
+        ai_player, _ = load_model(filename, self.dtype)
         return ai_player
@@ -0,0 +1,172 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import NeuralNetwork
+
+
+class Genome:
+    __slots__ = ('seed', 'parents', 'weights')
+    
+    def __init__(self, seed: int, parents: Tuple['Genome', ...] = (), weights: np.ndarray | None = None):
+        self.seed = seed
+        self.parents = parents
+        self.weights = weights
+    
+    @property
+    def key(self) -> tuple:
+        return ('genome', self.seed)
+    
+    def ancestry(self) -> List[Tuple[int, int, int]]:
+        records, _, _ = encode_genomes([self])
+        return records
+    
+    @classmethod
+    def from_ancestry(cls, records: List[Tuple[int, int, int]]) -> 'Genome':
+        return decode_genomes(records, [len(records) - 1])[0]
+
+
+def encode_genomes(genomes: List[Genome]) -> Tuple[List[Tuple[int, int, int]], List[int], Dict[int, np.ndarray]]:
+    records = []
+    index = {}
+    weights = {}
+    
+    for root in genomes:
+        stack = [(root, False)]
+        while stack:
+            genome, expanded = stack.pop()
+            if genome.seed in index:
+                continue
+            if expanded:
+                parents = [index[parent.seed] for parent in genome.parents] + [-1, -1]
+                index[genome.seed] = len(records)
+                if genome.weights is not None:
+                    weights[len(records)] = genome.weights
+                records.append((genome.seed, parents[0], parents[1]))
+                continue
+            stack.append((genome, True))
+            stack.extend((parent, False) for parent in genome.parents if parent.seed not in index)
+    
+    return records, [index[genome.seed] for genome in genomes], weights
+
+
+def decode_genomes(
+    records: List[Tuple[int, int, int]],
+    indices: List[int],
+    weights: Dict[int, np.ndarray] | None = None
+) -> List[Genome]:
+    weights = weights or {}
+    genomes = []
+    for i, (seed, parent1, parent2) in enumerate(records):
+        parents = tuple(genomes[j] for j in (parent1, parent2) if j >= 0)
+        genomes.append(Genome(int(seed), parents, weights.get(i)))
+    return [genomes[i] for i in indices]
+
+
+class GenomeDecoder:
+    def __init__(
+        self,
+        layer_sizes: List[int],
+        dtype: np.dtype | str = np.float32,
+        activation: str = 'relu',
+        mutation_rate: float = 0.1,
+        mutation_strength: float = 0.25,
+        cache_size: int = 200
+    ):
+        self.layer_sizes = layer_sizes
+        self.dtype = np.dtype(dtype)
+        self.activation = activation
+        self.mutation_rate = mutation_rate
+        self.mutation_strength = mutation_strength
+        self.cache_size = cache_size
+        self.cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.decoded = 0
+    
+    def _cached(self, genome: Genome) -> np.ndarray | None:
+        params = self.cache.get(genome.seed)
+        if params is not None:
+            self.cache.move_to_end(genome.seed)
+        return params
+    
+    def _evict(self, pinned: Set[int], size: int):
+        for seed in list(self.cache):
+            if len(self.cache) <= size:
+                break
+            if seed not in pinned:
+                del self.cache[seed]
+    
+    def _build(self, genome: Genome, parents: List[np.ndarray]) -> np.ndarray:
+        if genome.weights is not None:
+            return genome.weights
+        
+        rng = np.random.default_rng(genome.seed)
+        
+        if not parents:
+            network = NeuralNetwork(self.layer_sizes, self.dtype, activation=self.activation, rng=rng)
+            return network.params
+        
+        parent_networks = [NeuralNetwork.from_weights(self.layer_sizes, params, self.dtype) for params in parents]
+        if len(parent_networks) == 2:
+            child = NeuralNetwork.crossover(parent_networks[0], parent_networks[1], rng=rng)
+        else:
+            child = parent_networks[0].clone()
+        child.mutate(self.mutation_rate, self.mutation_strength, rng=rng)
+        return child.params
+    
+    def params(self, genome: Genome) -> np.ndarray:
+        params = self._cached(genome)
+        if params is not None:
+            self.hits += 1
+            return params
+        
+        pending = [genome]
+        while pending:
+            current = pending[-1]
+            missing = [parent for parent in current.parents if parent.seed not in self.cache]
+            if missing:
+                pending.extend(missing)
+                continue
+            
+            pending.pop()
+            if current.seed in self.cache:
+                continue
+            
+            parents = [self._cached(parent) for parent in current.parents]
+            self._evict({parent.seed for waiting in pending for parent in waiting.parents}, self.cache_size - 1)
+            self.cache[current.seed] = self._build(current, parents)
+            self.decoded += 1
+        
+        return self.cache[genome.seed]
+    
+    def network(self, genome: Genome) -> NeuralNetwork:
+        network = NeuralNetwork.from_weights(self.layer_sizes, self.params(genome), self.dtype, self.activation)
+        network.genome_id = genome.key
+        return network
+    
+    def stats(self) -> dict:
+        return {
+            'genome_cache_size': len(self.cache),
+            'genome_cache_hits': self.hits,
+            'genomes_decoded': self.decoded
+        }
+
+
+class CompactPlayer(AIPlayer):
+    def __init__(self, decoder: GenomeDecoder, genome: Genome):
+        self.decoder = decoder
+        self.genome = genome
+        self.policy = None
+        self._network = None
+    
+    @property
+    def neural_network(self) -> NeuralNetwork:
+        if self._network is None:
+            self._network = self.decoder.network(self.genome)
+        return self._network
+    
+    def release(self):
+        self._network = None
+    
+    def clone(self) -> AIPlayer:
+        return AIPlayer.from_network(self.neural_network.clone())
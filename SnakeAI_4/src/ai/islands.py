@@ -0,0 +1,263 @@
+import queue
+import random
+import multiprocessing as mp
+import numpy as np
+from collections import defaultdict
+from typing import List
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import NeuralNetwork
+from src.ai.genetic_algorithm import GeneticAlgorithm
+from src.ai.profiler import PhaseTimer
+
+
+TOPOLOGIES = ('ring', 'random')
+REPORT_WINDOW = 4
+SUMMED_STATS = ('env_steps', 'forward_calls', 'evaluations', 'cached_evaluations', 'env_steps_per_second', 'migrants_received')
+
+
+def run_island(
+    index: int,
+    options: dict,
+    seed: int,
+    migration_interval: int,
+    migrants: int,
+    topology: str,
+    inboxes: List[mp.Queue],
+    reports: mp.Queue,
+    consumed: mp.Value,
+    stopped: mp.Event
+):
+    random.seed(seed)
+    ga = GeneticAlgorithm(seed=seed, **options)
+    rng = np.random.default_rng(seed)
+    best_sent = -float('inf')
+    error = None
+    
+    try:
+        while not stopped.is_set():
+            if ga.generation - consumed.value >= REPORT_WINDOW:
+                stopped.wait(0.05)
+                continue
+            
+            stats = ga.evolve_generation(verbose=False)
+            
+            received = 0
+            while True:
+                try:
+                    received += ga.accept_migrants(inboxes[index].get_nowait())
+                except queue.Empty:
+                    break
+            
+            if len(inboxes) > 1 and ga.generation % migration_interval == 0:
+                if topology == 'ring':
+                    target = (index + 1) % len(inboxes)
+                else:
+                    target = int(rng.choice([i for i in range(len(inboxes)) if i != index]))
+                inboxes[target].put(ga.migrants(migrants))
+            
+            report = {
+                'island': index,
+                'stats': dict(stats, migrants_received=received),
+                'records': ga.fitness_records
+            }
+            if stats['best_fitness'] > best_sent:
+                best_sent = stats['best_fitness']
+                report['best'] = ga.migrants(1)[0]
+                report['episode'] = ga.episodes.get(ga.population[0].neural_network.genome_id)
+            reports.put(report)
+    
+    except Exception as e:
+        print(f"✗ Ошибка на острове {index}: {e}")
+        error = str(e)
+    
+    finally:
+        for inbox in inboxes:
+            inbox.cancel_join_thread()
+        ga.close()
+        reports.put({'island': index, 'stopped': True, 'error': error})
+
+
+def merge_stats(island_stats: List[dict]) -> dict:
+    best = max(island_stats, key=lambda stats: stats['best_fitness'])
+    merged = {
+        'generation': best['generation'],
+        'best_fitness': best['best_fitness'],
+        'best_score': best['best_score'],
+        'avg_fitness': sum(stats['avg_fitness'] for stats in island_stats) / len(island_stats),
+        'avg_score': sum(stats['avg_score'] for stats in island_stats) / len(island_stats),
+        'islands': len(island_stats),
+        'island_best_scores': [stats['best_score'] for stats in island_stats]
+    }
+    
+    for key in set().union(*island_stats):
+        if key in SUMMED_STATS:
+            merged[key] = sum(stats.get(key, 0) for stats in island_stats)
+        elif key.startswith('time_') or key == 'generations_per_hour':
+            merged[key] = sum(stats.get(key, 0) for stats in island_stats) / len(island_stats)
+    return merged
+
+
+class IslandModel(GeneticAlgorithm):
+    ALGORITHM = 'islands'
+    
+    def __init__(
+        self,
+        islands: int = 4,
+        population_size: int = 200,
+        migration_interval: int = 10,
+        migrants: int = 5,
+        topology: str = 'ring',
+        seed: int | None = None,
+        **kwargs
+    ):
+        if kwargs.get('compact_genomes'):
+            raise ValueError("Компактные геномы не поддерживаются в режиме островов")
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Неизвестная топология {topology}, доступны: {', '.join(TOPOLOGIES)}")
+        
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.topology = topology
+        self.island_size = max(2, population_size // islands)
+        self.island_bests = {}
+        self.island_episodes = {}
+        self.reports = defaultdict(dict)
+        self.stopped_islands = set()
+        self.island_errors = {}
+        kwargs.pop('workers', None)
+        super().__init__(population_size=islands, seed=seed, **kwargs)
+        
+        options = {
+            'population_size': self.island_size,
+            'mutation_rate': self.mutation_rate,
+            'mutation_strength': self.mutation_strength,
+            'elite_count': max(1, min(self.elite_count // islands, self.island_size // 2)),
+            'field_width': self.field_width,
+            'field_height': self.field_height,
+            'reseed_interval': self.reseed_interval,
+            'evaluation_mode': self.evaluation_mode,
+            'racing_rounds': self.racing_rounds,
+            'racing_keep': self.racing_keep,
+            'racing_episodes': self.racing_episodes,
+            'cache_size': kwargs.get('cache_size'),
+            'dtype': self.dtype.str,
+            'storage_dtype': self.storage_dtype.str,
+            'hidden_layers': self.hidden_layers,
+            'activation': self.activation,
+            'record_episodes': self.record_episodes
+        }
+        self.migrant_count = min(migrants, options['elite_count'])
+        
+        context = mp.get_context('spawn')
+        self.inboxes = [context.Queue() for _ in range(islands)]
+        self.report_queue = context.Queue()
+        self.consumed = context.Value('i', 0)
+        self.stop_event = context.Event()
+        island_seeds = np.random.SeedSequence(seed).generate_state(islands)
+        self.processes = [
+            context.Process(
+                target=run_island,
+                args=(i, options, int(island_seeds[i]), migration_interval, self.migrant_count,
+                      topology, self.inboxes, self.report_queue, self.consumed, self.stop_event),
+                daemon=True
+            )
+            for i in range(islands)
+        ]
+        for process in self.processes:
+            process.start()
+    
+    def initialize_population(self):
+        self.population = [AIPlayer(self.hidden_layers, self.dtype, activation=self.activation)]
+    
+    def _receive(self, report: dict):
+        island = report['island']
+        if report.get('stopped'):
+            self.stopped_islands.add(island)
+            if report.get('error'):
+                self.island_errors[island] = report['error']
+            return
+        
+        stats = report['stats']
+        stats['records'] = report['records']
+        self.reports[stats['generation']][island] = stats
+        
+        if 'best' in report:
+            network = NeuralNetwork.from_weights(self.layer_sizes, report['best'], self.dtype, self.activation)
+            self.island_bests[island] = (stats['best_fitness'], stats['best_score'], AIPlayer.from_network(network))
+            self.island_episodes[island] = (network.genome_id, report.get('episode'))
+            self.episodes = {genome_id: episode for genome_id, episode in self.island_episodes.values() if episode is not None}
+            self.population = [ai_player for _, _, ai_player in self.island_ranking()]
+    
+    def broadcast(self, ai_player: AIPlayer):
+        weights = np.array(ai_player.neural_network.get_weights_flat())
+        for inbox in self.inboxes:
+            inbox.put([weights])
+    
+    def island_ranking(self) -> List[tuple]:
+        return sorted(self.island_bests.values(), key=lambda entry: entry[0], reverse=True)
+    
+    def evolve_generation(self, verbose: bool = True) -> dict:
+        generation = self.generation + 1
+        while len(self.reports[generation]) < self.islands - len(self.stopped_islands):
+            try:
+                self._receive(self.report_queue.get(timeout=1.0))
+            except queue.Empty:
+                if not any(process.is_alive() for process in self.processes):
+                    raise RuntimeError("Все острова остановились")
+        
+        reports = self.reports.pop(generation)
+        if not reports:
+            errors = '; '.join(f"остров {island}: {error}" for island, error in sorted(self.island_errors.items()))
+            raise RuntimeError(f"Все острова остановились ({errors or 'без ошибок'})")
+        island_stats = [reports[island] for island in sorted(reports)]
+        self.fitness_records = sorted(
+            (record for stats in island_stats for record in map(tuple, stats.pop('records'))),
+            key=lambda record: record[0],
+            reverse=True
+        )
+        stats = merge_stats(island_stats)
+        self.generation = generation
+        self.consumed.value = generation
+        
+        if stats['best_fitness'] > self.best_fitness:
+            self.best_fitness = stats['best_fitness']
+            self.best_score = stats['best_score']
+        
+        stats['best_overall_fitness'] = self.best_fitness
+        stats['best_overall_score'] = self.best_score
+        local_stats = self.profiler.collect()
+        stats.update({key: seconds for key, seconds in local_stats.items() if key in ('time_saving', 'time_recording')})
+        stats.update(self.writer.stats())
+        
+        if verbose:
+            print(f"Поколение {self.generation}: "
+                  f"Лучший счёт={stats['best_score']:.0f}, "
+                  f"Средний счёт={stats['avg_score']:.1f}, "
+                  f"Лучший fitness={stats['best_fitness']:.1f}, "
+                  f"острова: {' '.join(f'{score:.0f}' for score in stats['island_best_scores'])}, "
+                  f"мигрантов {stats.get('migrants_received', 0)}")
+            print(f"  Время (среднее по островам): {PhaseTimer.format(stats)}")
+        
+        return stats
+    
+    def get_best_ai(self) -> AIPlayer:
+        return self.population[0]
+    
+    def save_checkpoint(self, store):
+        raise ValueError("Чекпоинты не поддерживаются в режиме островов")
+    
+    def load_checkpoint(self, store) -> bool:
+        raise ValueError("Чекпоинты не поддерживаются в режиме островов")
+    
+    def close(self):
+        self.stop_event.set()
+        while len(self.stopped_islands) < self.islands and any(process.is_alive() for process in self.processes):
+            try:
+                self._receive(self.report_queue.get(timeout=1.0))
+            except queue.Empty:
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        super().close()
@@ -0,0 +1,149 @@
+import os
+import json
+import struct
+import zlib
+import numpy as np
+from typing import List, Tuple
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import NeuralNetwork
+
+
+MAGIC = b'SNAKEAI\x00'
+FORMAT_VERSION = 1
+MODEL_EXTENSION = '.snk'
+DATA_ALIGNMENT = 64
+
+
+def model_path(name: str) -> str:
+    return name + MODEL_EXTENSION
+
+
+def find_model(name: str) -> str | None:
+    for path in (model_path(name), name + '.npy'):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def save_model(
+    filename: str,
+    layer_sizes: List[int],
+    weights: np.ndarray,
+    base: str | None = None,
+    base_weights: np.ndarray | None = None,
+    activation: str = 'relu',
+    **metadata
+):
+    weights = np.ascontiguousarray(weights).reshape(-1)
+    if weights.size != NeuralNetwork.count_parameters(layer_sizes):
+        raise ValueError(f"Размер весов {weights.size} не соответствует архитектуре {layer_sizes}")
+    
+    header = {
+        'format_version': FORMAT_VERSION,
+        'layer_sizes': list(layer_sizes),
+        'activation': activation,
+        'dtype': weights.dtype.newbyteorder('<').str,
+        'parameter_count': int(weights.size),
+        **metadata
+    }
+    payload = weights.astype(header['dtype'], copy=False)
+    
+    if base is not None:
+        changed = np.flatnonzero(weights != base_weights)
+        gaps = np.diff(changed, prepend=0).astype('<u4')
+        header['delta_base'] = os.path.relpath(base, os.path.dirname(os.path.abspath(filename)))
+        header['delta_count'] = int(changed.size)
+        header['delta_encoding'] = 'zlib-gaps'
+        payload = np.frombuffer(zlib.compress(gaps.tobytes() + payload[changed].tobytes(), 1), dtype=np.uint8)
+        header['delta_size'] = int(payload.size)
+    
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    
+    prefix_size = len(MAGIC) + 8 + len(header_bytes)
+    data_offset = -(-prefix_size // DATA_ALIGNMENT) * DATA_ALIGNMENT
+    
+    temp_filename = filename + '.tmp'
+    with open(temp_filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<II', len(header_bytes), data_offset))
+        f.write(header_bytes)
+        f.write(b'\x00' * (data_offset - prefix_size))
+        f.write(memoryview(payload).cast('B'))
+    os.replace(temp_filename, filename)
+
+
+def read_header(filename: str) -> dict | None:
+    with open(filename, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return None
+        header_size, data_offset = struct.unpack('<II', f.read(8))
+        header = json.loads(f.read(header_size).decode('utf-8'))
+    
+    header['data_offset'] = data_offset
+    return header
+
+
+def load_weights(filename: str) -> Tuple[np.ndarray, dict]:
+    header = read_header(filename)
+    
+    if header is None:
+        weights = np.load(filename)
+        layer_sizes = [AIPlayer.INPUT_SIZE] + AIPlayer.DEFAULT_HIDDEN_LAYERS + [AIPlayer.OUTPUT_SIZE]
+        header = {
+            'format_version': 0,
+            'layer_sizes': layer_sizes,
+            'activation': 'relu',
+            'dtype': weights.dtype.str,
+            'parameter_count': int(weights.size)
+        }
+        return weights, header
+    
+    if 'delta_base' in header:
+        base = os.path.join(os.path.dirname(os.path.abspath(filename)), header['delta_base'])
+        base_weights, _ = load_weights(base)
+        
+        count = header['delta_count']
+        dtype = np.dtype(header['dtype'])
+        with open(filename, 'rb') as f:
+            f.seek(header['data_offset'])
+            if header.get('delta_encoding') == 'zlib-gaps':
+                data = zlib.decompress(f.read(header['delta_size']))
+                changed = np.cumsum(np.frombuffer(data, dtype='<u4', count=count), dtype=np.int64)
+                values = np.frombuffer(data, dtype=dtype, count=count, offset=count * 4)
+            else:
+                changed = np.fromfile(f, dtype='<u4', count=count)
+                values = np.fromfile(f, dtype=dtype, count=count)
+        
+        weights = np.array(base_weights, dtype=dtype)
+        weights[changed] = values
+        return weights, header
+    
+    weights = np.memmap(
+        filename,
+        dtype=np.dtype(header['dtype']),
+        mode='c',
+        offset=header['data_offset'],
+        shape=(header['parameter_count'],)
+    )
+    return weights, header
+
+
+def export_model(source: str, destination: str):
+    weights, header = load_weights(source)
+    metadata = {
+        key: value for key, value in header.items()
+        if key not in ('format_version', 'layer_sizes', 'activation', 'dtype', 'parameter_count',
+                       'data_offset', 'delta_base', 'delta_count', 'delta_encoding', 'delta_size')
+    }
+    save_model(destination, header['layer_sizes'], np.asarray(weights),
+               activation=header.get('activation', 'relu'), **metadata)
+
+
+def load_model(filename: str, dtype: np.dtype | str | None = None) -> Tuple[AIPlayer, dict]:
+    weights, header = load_weights(filename)
+    
+    if dtype is None:
+        dtype = weights.dtype if weights.dtype != np.float16 else np.float32
+    
+    network = NeuralNetwork.from_weights(header['layer_sizes'], weights, dtype, header.get('activation', 'relu'))
+    return AIPlayer.from_network(network), header
@@ -0,0 +1,61 @@
+import time
+import queue
+import threading
+from typing import Callable
+
+
+class ModelWriter:
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.written = 0
+        self.errors = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+    
+    def submit(self, description: str, write: Callable, *args, **kwargs):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+        self.queue.put((description, write, args, kwargs, time.perf_counter()))
+    
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                self.queue.task_done()
+                return
+            
+            description, write, args, kwargs, submitted = job
+            try:
+                write(*args, **kwargs)
+                self.written += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"✗ Ошибка фоновой записи {description}: {e}")
+            finally:
+                latency = time.perf_counter() - submitted
+                self.last_latency = latency
+                self.max_latency = max(self.max_latency, latency)
+                self.queue.task_done()
+    
+    def flush(self):
+        self.queue.join()
+    
+    def close(self):
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                self.queue.put(None)
+                self.thread.join()
+            self.thread = None
+    
+    def stats(self) -> dict:
+        return {
+            'writer_backlog': self.queue.qsize(),
+            'writer_written': self.written,
+            'writer_errors': self.errors,
+            'writer_latency': self.last_latency,
+            'writer_max_latency': self.max_latency
+        }
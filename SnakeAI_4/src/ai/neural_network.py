@@ -1,94 +1,201 @@
+import itertools
 import numpy as np
-import random
 from typing import List, Tuple
 
 
+default_rng = np.random.default_rng()
+genome_ids = itertools.count()
+
+
+def relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(0, x)
+
+
+def leaky_relu(x: np.ndarray) -> np.ndarray:
+    return np.where(x > 0, x, x * 0.01)
+
+
+ACTIVATIONS = {
+    'relu': relu,
+    'leaky_relu': leaky_relu,
+    'tanh': np.tanh
+}
+
+
 class NeuralNetwork:
-    def __init__(self, layer_sizes: List[int]):
+    def __init__(
+        self,
+        layer_sizes: List[int],
+        dtype: np.dtype | str = np.float32,
+        initialize: bool = True,
+        activation: str = 'relu',
+        rng: np.random.Generator | None = None
+    ):
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Неизвестная функция активации {activation}, доступны: {', '.join(ACTIVATIONS)}")
+        
         self.layer_sizes = layer_sizes
+        self.dtype = np.dtype(dtype)
+        self.activation = activation
+        self.genome_id = next(genome_ids)
+        self.lineage = None
+        self.mutated = None
+        self.params = np.empty(self.count_parameters(layer_sizes), dtype=self.dtype)
         self.weights = []
         self.biases = []
+        self._build_views()
         
+        if not initialize:
+            return
+        
+        randn = np.random.randn if rng is None else lambda *shape: rng.standard_normal(shape)
         for i in range(len(layer_sizes) - 1):
-            w = np.random.randn(layer_sizes[i], layer_sizes[i + 1]) * 0.5
-            b = np.random.randn(layer_sizes[i + 1]) * 0.5
-            self.weights.append(w)
-            self.biases.append(b)
+            self.weights[i][...] = randn(layer_sizes[i], layer_sizes[i + 1]) * 0.5
+            self.biases[i][...] = randn(layer_sizes[i + 1]) * 0.5
+    
+    @classmethod
+    def from_weights(
+        cls,
+        layer_sizes: List[int],
+        flat_weights: np.ndarray,
+        dtype: np.dtype | str | None = None,
+        activation: str = 'relu'
+    ):
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Неизвестная функция активации {activation}, доступны: {', '.join(ACTIVATIONS)}")
+        
+        network = cls.__new__(cls)
+        network.layer_sizes = list(layer_sizes)
+        network.dtype = np.dtype(dtype or flat_weights.dtype)
+        network.activation = activation
+        
+        if flat_weights.size != cls.count_parameters(network.layer_sizes):
+            raise ValueError(f"Ожидалось {cls.count_parameters(network.layer_sizes)} весов, получено {flat_weights.size}")
+        
+        network.params = np.ascontiguousarray(flat_weights, dtype=network.dtype).reshape(-1)
+        network.genome_id = next(genome_ids)
+        network.lineage = None
+        network.mutated = None
+        network._build_views()
+        return network
+    
+    @classmethod
+    def empty_like(cls, network: 'NeuralNetwork') -> 'NeuralNetwork':
+        return cls(network.layer_sizes, network.dtype, initialize=False, activation=network.activation)
+    
+    def _build_views(self):
+        self.weights = []
+        self.biases = []
+        idx = 0
+        
+        for i in range(len(self.layer_sizes) - 1):
+            w_size = self.layer_sizes[i] * self.layer_sizes[i + 1]
+            self.weights.append(self.params[idx:idx + w_size].reshape(self.layer_sizes[i], self.layer_sizes[i + 1]))
+            idx += w_size
+            
+            self.biases.append(self.params[idx:idx + self.layer_sizes[i + 1]])
+            idx += self.layer_sizes[i + 1]
+    
+    @staticmethod
+    def count_parameters(layer_sizes: List[int]) -> int:
+        return sum(
+            layer_sizes[i] * layer_sizes[i + 1] + layer_sizes[i + 1]
+            for i in range(len(layer_sizes) - 1)
+        )
     
     def forward(self, inputs: np.ndarray) -> np.ndarray:
-        activation = inputs
+        activation = np.asarray(inputs, dtype=self.dtype)
+        activate = ACTIVATIONS[self.activation]
         
         for i in range(len(self.weights) - 1):
             z = np.dot(activation, self.weights[i]) + self.biases[i]
-            activation = self.relu(z)
+            activation = activate(z)
         
         z = np.dot(activation, self.weights[-1]) + self.biases[-1]
         output = self.softmax(z)
         
         return output
     
-    @staticmethod
-    def relu(x: np.ndarray) -> np.ndarray:
-        return np.maximum(0, x)
-    
     @staticmethod
     def softmax(x: np.ndarray) -> np.ndarray:
         exp_x = np.exp(x - np.max(x))
         return exp_x / exp_x.sum()
     
     def get_weights_flat(self) -> np.ndarray:
-        flat = []
-        for w, b in zip(self.weights, self.biases):
-            flat.extend(w.flatten())
-            flat.extend(b.flatten())
-        return np.array(flat)
+        return self.params
     
     def set_weights_flat(self, flat_weights: np.ndarray):
-        idx = 0
-        for i in range(len(self.weights)):
-            w_shape = self.weights[i].shape
-            w_size = w_shape[0] * w_shape[1]
-            self.weights[i] = flat_weights[idx:idx + w_size].reshape(w_shape)
-            idx += w_size
-            
-            b_shape = self.biases[i].shape
-            b_size = b_shape[0]
-            self.biases[i] = flat_weights[idx:idx + b_size]
-            idx += b_size
+        if flat_weights.size != self.params.size:
+            raise ValueError(f"Ожидалось {self.params.size} весов, получено {flat_weights.size}")
+        
+        self.params = np.ascontiguousarray(flat_weights, dtype=self.dtype).reshape(-1)
+        self.genome_id = next(genome_ids)
+        self.lineage = None
+        self.mutated = None
+        self._build_views()
     
-    def copy(self):
-        new_nn = NeuralNetwork(self.layer_sizes)
-        new_nn.set_weights_flat(self.get_weights_flat().copy())
+    def rebind(self, buffer: np.ndarray):
+        buffer[...] = self.params
+        self.params = buffer
+        self._build_views()
+    
+    def detach(self):
+        self.params = self.params.copy()
+        self._build_views()
+    
+    def clone(self) -> 'NeuralNetwork':
+        new_nn = NeuralNetwork.from_weights(self.layer_sizes, self.params.copy(), self.dtype, self.activation)
+        new_nn.genome_id = self.genome_id
+        new_nn.lineage = [(self.genome_id, 0, self.params.size)]
         return new_nn
     
-    def mutate(self, mutation_rate: float = 0.1, mutation_strength: float = 0.5):
-        flat = self.get_weights_flat()
+    def copy(self):
+        return self.clone()
+    
+    def mutate(
+        self,
+        mutation_rate: float = 0.1,
+        mutation_strength: float = 0.5,
+        rng: np.random.Generator | None = None
+    ):
+        rng = rng or default_rng
         
-        for i in range(len(flat)):
-            if random.random() < mutation_rate:
-                flat[i] += np.random.randn() * mutation_strength
+        mutated = np.flatnonzero(rng.random(self.params.size) < mutation_rate)
+        self.params[mutated] += rng.standard_normal(mutated.size, dtype=self.dtype) * mutation_strength
+        self.genome_id = next(genome_ids)
         
-        self.set_weights_flat(flat)
+        if self.lineage is not None:
+            self.mutated = mutated if self.mutated is None else np.union1d(self.mutated, mutated)
     
     @staticmethod
-    def crossover(parent1, parent2, num_points: int = 3):
-        child = parent1.copy()
+    def crossover(
+        parent1,
+        parent2,
+        num_points: int = 3,
+        child=None,
+        rng: np.random.Generator | None = None
+    ):
+        rng = rng or default_rng
         
-        flat1 = parent1.get_weights_flat()
-        flat2 = parent2.get_weights_flat()
-        child_flat = flat1.copy()
+        length = len(parent1.params)
+        num_points = min(num_points, length - 1)
+        crossover_points = np.sort(rng.choice(length - 1, size=num_points, replace=False) + 1).tolist()
         
-        length = len(flat1)
-        crossover_points = sorted(random.sample(range(1, length), min(num_points, length - 1)))
+        if child is None:
+            child = NeuralNetwork.empty_like(parent1)
         
         take_from_parent2 = False
         prev_point = 0
+        lineage = []
         
         for point in crossover_points + [length]:
-            if take_from_parent2:
-                child_flat[prev_point:point] = flat2[prev_point:point]
+            parent = parent2 if take_from_parent2 else parent1
+            child.params[prev_point:point] = parent.params[prev_point:point]
+            lineage.append((parent.genome_id, prev_point, point))
             take_from_parent2 = not take_from_parent2
             prev_point = point
         
-        child.set_weights_flat(child_flat)
+        child.genome_id = next(genome_ids)
+        child.lineage = lineage
+        child.mutated = None
         return child
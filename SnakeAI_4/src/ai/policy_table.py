@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import zlib
+import argparse
+import numpy as np
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import ACTIVATIONS, NeuralNetwork
+from src.game_logic import Direction
+from src.vector_game import DIRECTIONS
+
+
+def weights_checksum(neural_network: NeuralNetwork) -> int:
+    return zlib.crc32(neural_network.get_weights_flat().tobytes())
+
+
+def policy_path(model_filename: str) -> str:
+    return os.path.splitext(model_filename)[0] + '.policy'
+
+
+class PolicyTable:
+    def __init__(self, field_size: tuple, edges: np.ndarray, table: np.ndarray, checksum: int | None = None):
+        self.field_size = tuple(field_size)
+        self.edges = np.asarray(edges, dtype=np.int64)
+        self.table = table
+        self.checksum = checksum
+    
+    @staticmethod
+    def length_edges(field_size: tuple, buckets: int, initial_length: int = 3) -> np.ndarray:
+        cells = field_size[0] * field_size[1]
+        return np.unique(np.linspace(initial_length, cells + 1, buckets + 1).astype(np.int64))
+    
+    @property
+    def representative_lengths(self) -> np.ndarray:
+        return (self.edges[:-1] + self.edges[1:] - 1) // 2
+    
+    @staticmethod
+    def logits(neural_network: NeuralNetwork, inputs: np.ndarray) -> np.ndarray:
+        activation = inputs.astype(neural_network.dtype)
+        activate = ACTIVATIONS[neural_network.activation]
+        for i in range(len(neural_network.weights) - 1):
+            activation = activate(activation @ neural_network.weights[i] + neural_network.biases[i])
+        return activation @ neural_network.weights[-1] + neural_network.biases[-1]
+    
+    @classmethod
+    def compile(
+        cls,
+        neural_network: NeuralNetwork,
+        field_size: tuple,
+        buckets: int = 8,
+        initial_length: int = 3,
+        batch_size: int = 8192,
+        verbose: bool = True
+    ) -> 'PolicyTable':
+        field_width, field_height = field_size
+        cells = field_width * field_height
+        edges = cls.length_edges(field_size, buckets, initial_length)
+        policy = cls(field_size, edges, np.zeros((len(edges) - 1, cells, cells), dtype=np.uint8),
+                     weights_checksum(neural_network))
+        
+        head, apple = np.divmod(np.arange(cells * cells, dtype=np.int64), cells)
+        for bucket, length in enumerate(policy.representative_lengths):
+            flat = policy.table[bucket].reshape(-1)
+            for start in range(0, len(flat), batch_size):
+                stop = min(start + batch_size, len(flat))
+                inputs = AIPlayer.states_to_inputs(
+                    head[start:stop] % field_width, head[start:stop] // field_width,
+                    apple[start:stop] % field_width, apple[start:stop] // field_width,
+                    np.full(stop - start, length), field_size
+                )
+                flat[start:stop] = np.argmax(cls.logits(neural_network, inputs), axis=1)
+            if verbose:
+                print(f"  Корзина {bucket + 1}/{len(edges) - 1}: длина {edges[bucket]}-{edges[bucket + 1] - 1}")
+        
+        return policy
+    
+    def lookup(self, head_x, head_y, apple_x, apple_y, length) -> np.ndarray:
+        field_width = self.field_size[0]
+        bucket = np.clip(np.searchsorted(self.edges, length, side='right') - 1, 0, len(self.table) - 1)
+        return self.table[bucket, np.asarray(head_y) * field_width + head_x, np.asarray(apple_y) * field_width + apple_x]
+    
+    def decide_direction(self, game_state: dict) -> Direction:
+        head_x, head_y = game_state['head_position']
+        apple_x, apple_y = game_state['apple_position']
+        return DIRECTIONS[self.lookup(head_x, head_y, apple_x, apple_y, game_state['current_length'])]
+    
+    def verify(self, neural_network: NeuralNetwork, samples: int = 2000, seed: int = 0) -> dict:
+        field_width, field_height = self.field_size
+        rng = np.random.default_rng(seed)
+        ai_player = AIPlayer.from_network(neural_network)
+        
+        head_x = rng.integers(0, field_width, samples)
+        head_y = rng.integers(0, field_height, samples)
+        apple_x = rng.integers(0, field_width, samples)
+        apple_y = rng.integers(0, field_height, samples)
+        exact = rng.random(samples) < 0.5
+        lengths = np.where(
+            exact,
+            rng.choice(self.representative_lengths, samples),
+            rng.integers(self.edges[0], self.edges[-1], samples)
+        )
+        
+        expected = np.array([
+            DIRECTIONS.index(ai_player.decide_direction({
+                'head_position': (int(head_x[i]), int(head_y[i])),
+                'apple_position': (int(apple_x[i]), int(apple_y[i])),
+                'field_size': self.field_size,
+                'current_length': int(lengths[i])
+            }))
+            for i in range(samples)
+        ])
+        matches = self.lookup(head_x, head_y, apple_x, apple_y, lengths) == expected
+        
+        return {
+            'checksum_ok': self.checksum == weights_checksum(neural_network),
+            'exact_samples': int(exact.sum()),
+            'exact_mismatches': int((~matches[exact]).sum()),
+            'bucketed_samples': int((~exact).sum()),
+            'bucketed_agreement': float(matches[~exact].mean()) if (~exact).any() else 1.0
+        }
+    
+    def save(self, filename: str):
+        header = {'field_size': list(self.field_size), 'checksum': self.checksum}
+        temp_path = filename + '.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                header=np.frombuffer(json.dumps(header).encode('utf-8'), dtype=np.uint8),
+                edges=self.edges,
+                table=self.table
+            )
+        os.replace(temp_path, filename)
+    
+    @classmethod
+    def load(cls, filename: str) -> 'PolicyTable':
+        with np.load(filename) as data:
+            header = json.loads(data['header'].tobytes())
+            return cls(header['field_size'], data['edges'], data['table'], header['checksum'])
+
+
+def main():
+    from src.ai.model_io import load_model
+    
+    parser = argparse.ArgumentParser(description='Компиляция нейросети в таблицу решений')
+    parser.add_argument('model', type=str, help='Файл модели (.snk или .npy)')
+    parser.add_argument('--width', type=int, default=30, help='Ширина поля (по умолчанию: 30)')
+    parser.add_argument('--height', type=int, default=30, help='Высота поля (по умолчанию: 30)')
+    parser.add_argument('--buckets', type=int, default=8,
+                       help='Количество корзин длины змеи (по умолчанию: 8)')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Файл таблицы (по умолчанию: рядом с моделью, расширение .policy)')
+    parser.add_argument('--verify', action='store_true',
+                       help='Сверить таблицу с нейросетью (существующая таблица не пересобирается)')
+    parser.add_argument('--samples', type=int, default=2000,
+                       help='Количество состояний для сверки (по умолчанию: 2000)')
+    
+    args = parser.parse_args()
+    output = args.output or policy_path(args.model)
+    ai_player, _ = load_model(args.model)
+    field_size = (args.width, args.height)
+    
+    if args.verify and os.path.exists(output):
+        policy = PolicyTable.load(output)
+    else:
+        print(f"Компиляция {args.model} для поля {args.width}x{args.height}...")
+        policy = PolicyTable.compile(ai_player.neural_network, field_size, args.buckets)
+        policy.save(output)
+        print(f"✓ Таблица сохранена: {output} ({policy.table.nbytes / 1024 / 1024:.1f} МБ без сжатия)")
+    
+    if args.verify:
+        report = policy.verify(ai_player.neural_network, args.samples)
+        print(f"Контрольная сумма весов: {'совпадает' if report['checksum_ok'] else 'НЕ совпадает'}")
+        print(f"Точные длины: {report['exact_mismatches']} расхождений из {report['exact_samples']}")
+        print(f"Произвольные длины: совпадение {report['bucketed_agreement']:.2%} из {report['bucketed_samples']}")
+        if not report['checksum_ok'] or report['exact_mismatches']:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import numpy as np
+from typing import List
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import ACTIVATIONS, NeuralNetwork
+
+
+class PopulationNetwork:
+    COMPACT_FRACTION = 0.5
+    
+    def __init__(
+        self,
+        layer_sizes: List[int],
+        size: int,
+        genomes: np.ndarray | None = None,
+        dtype: np.dtype | str = np.float32,
+        activation: str = 'relu'
+    ):
+        self.layer_sizes = layer_sizes
+        self.size = size
+        self.activate = ACTIVATIONS[activation]
+        self.parameter_count = NeuralNetwork.count_parameters(layer_sizes)
+        
+        if genomes is None:
+            genomes = np.empty((size, self.parameter_count), dtype=dtype)
+        self.genomes = genomes
+        self.dtype = genomes.dtype
+        
+        self.weights = []
+        self.biases = []
+        idx = 0
+        for i in range(len(layer_sizes) - 1):
+            w_size = layer_sizes[i] * layer_sizes[i + 1]
+            w = self.genomes[:, idx:idx + w_size].reshape(size, layer_sizes[i], layer_sizes[i + 1])
+            idx += w_size
+            
+            b = self.genomes[:, idx:idx + layer_sizes[i + 1]]
+            idx += layer_sizes[i + 1]
+            
+            self.weights.append(w)
+            self.biases.append(b)
+        
+        self.rows = np.arange(size)
+        self.row_weights = self.weights
+        self.row_biases = self.biases
+    
+    @classmethod
+    def from_players(cls, players: List[AIPlayer]) -> 'PopulationNetwork':
+        first = players[0].neural_network
+        population = cls(first.layer_sizes, len(players), dtype=first.dtype, activation=first.activation)
+        
+        for i, ai_player in enumerate(players):
+            ai_player.neural_network.rebind(population.genomes[i])
+        
+        return population
+    
+    def forward(self, inputs: np.ndarray, indices: np.ndarray | None = None) -> np.ndarray:
+        inputs = np.asarray(inputs, dtype=self.dtype)
+        if indices is None or len(indices) == self.size:
+            return self._forward_stacked(inputs, self.weights, self.biases)
+        
+        if not np.isin(indices, self.rows).all():
+            self._compact(np.arange(self.size), self.weights, self.biases)
+        
+        if len(indices) < len(self.rows) * self.COMPACT_FRACTION:
+            self._compact(
+                np.array(indices),
+                [w[indices] for w in self.weights],
+                [b[indices] for b in self.biases]
+            )
+        
+        if len(indices) == len(self.rows):
+            return self._forward_stacked(inputs, self.row_weights, self.row_biases)
+        
+        positions = np.searchsorted(self.rows, indices)
+        padded = np.zeros((len(self.rows), inputs.shape[1]), dtype=self.dtype)
+        padded[positions] = inputs
+        return self._forward_stacked(padded, self.row_weights, self.row_biases)[positions]
+    
+    def _compact(self, rows: np.ndarray, weights: List[np.ndarray], biases: List[np.ndarray]):
+        self.rows = rows
+        self.row_weights = weights
+        self.row_biases = biases
+    
+    def _forward_stacked(self, inputs: np.ndarray, weights: List[np.ndarray], biases: List[np.ndarray]) -> np.ndarray:
+        activation = inputs[:, None, :]
+        
+        for i in range(len(weights) - 1):
+            z = np.matmul(activation, weights[i]) + biases[i][:, None, :]
+            activation = self.activate(z)
+        
+        z = np.matmul(activation, weights[-1]) + biases[-1][:, None, :]
+        return self.softmax(z[:, 0, :])
+    
+    def decide(self, inputs: np.ndarray, indices: np.ndarray | None = None) -> np.ndarray:
+        return np.argmax(self.forward(inputs, indices), axis=1)
+    
+    @staticmethod
+    def softmax(x: np.ndarray) -> np.ndarray:
+        exp_x = np.exp(x - np.max(x, axis=-1, keepdims=True))
+        return exp_x / exp_x.sum(axis=-1, keepdims=True)
@@ -0,0 +1,66 @@
+import time
+from contextlib import contextmanager
+from collections import defaultdict
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.timings = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.started = time.perf_counter()
+    
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+    
+    def count(self, name: str, value: int = 1):
+        self.counters[name] += value
+    
+    def collect(self) -> dict:
+        now = time.perf_counter()
+        wall_time = now - self.started
+        
+        stats = {f'time_{name}': seconds for name, seconds in self.timings.items()}
+        stats.update(self.counters)
+        stats['time_total'] = wall_time
+        
+        evaluation_time = self.timings.get('evaluation', 0.0)
+        stats['env_steps_per_second'] = self.counters.get('env_steps', 0) / evaluation_time if evaluation_time > 0 else 0.0
+        stats['generations_per_hour'] = 3600 / wall_time if wall_time > 0 else 0.0
+        
+        self.timings.clear()
+        self.counters.clear()
+        self.started = now
+        return stats
+    
+    @staticmethod
+    def format(stats: dict) -> str:
+        phases = [
+            ('evaluation', 'оценка'),
+            ('selection', 'отбор'),
+            ('crossover', 'скрещивание'),
+            ('mutation', 'мутация'),
+            ('perturbation', 'возмущения'),
+            ('update', 'обновление'),
+            ('saving', 'сохранение'),
+            ('recording', 'запись эпизода')
+        ]
+        parts = [
+            f"{label} {stats[f'time_{name}'] * 1000:.0f} мс"
+            for name, label in phases
+            if f'time_{name}' in stats
+        ]
+        line = (f"{', '.join(parts)} | "
+                f"{stats['env_steps_per_second']:.0f} шагов/с, "
+                f"{stats['generations_per_hour']:.1f} поколений/ч")
+        if stats.get('remote_workers'):
+            line += (f" | воркеров {stats['remote_workers']}, переназначено задач {stats['remote_reassigned']}, "
+                     f"отправлено {stats['remote_sent_bytes'] / 2**20:.1f} МБ")
+        if stats.get('writer_written') or stats.get('writer_backlog'):
+            line += (f" | запись: очередь {stats['writer_backlog']}, "
+                     f"задержка {stats['writer_latency'] * 1000:.0f} мс")
+        return line
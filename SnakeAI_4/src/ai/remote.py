@@ -0,0 +1,371 @@
+import os
+import json
+import math
+import time
+import socket
+import struct
+import itertools
+import selectors
+from collections import OrderedDict, deque
+import numpy as np
+from typing import List, Tuple
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import NeuralNetwork
+
+
+FRAME = struct.Struct('<II')
+HEARTBEAT_INTERVAL = 1.0
+
+
+def parse_address(address: str) -> Tuple[int, str | Tuple[str, int]]:
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+def send_message(sock: socket.socket, header: dict, arrays: List[np.ndarray] = ()):
+    arrays = [np.ascontiguousarray(array) for array in arrays]
+    header = dict(header, arrays=[[array.dtype.str, list(array.shape)] for array in arrays])
+    encoded = json.dumps(header).encode('utf-8')
+    blob_size = sum(array.nbytes for array in arrays)
+    sock.sendall(FRAME.pack(len(encoded), blob_size) + encoded)
+    for array in arrays:
+        sock.sendall(memoryview(array).cast('B'))
+
+
+def genome_key(genome_id: int | list) -> int | tuple:
+    return tuple(genome_id) if isinstance(genome_id, list) else genome_id
+
+
+class MessageReader:
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = bytearray()
+        self.pending = []
+    
+    def feed(self) -> List[Tuple[dict, List[np.ndarray]]] | None:
+        data = self.sock.recv(1 << 20)
+        if not data:
+            return None
+        self.buffer += data
+        
+        messages = []
+        while len(self.buffer) >= FRAME.size:
+            header_size, blob_size = FRAME.unpack_from(self.buffer)
+            end = FRAME.size + header_size + blob_size
+            if len(self.buffer) < end:
+                break
+            
+            header = json.loads(bytes(self.buffer[FRAME.size:FRAME.size + header_size]))
+            offset = FRAME.size + header_size
+            arrays = []
+            for dtype, shape in header.pop('arrays'):
+                count = math.prod(shape)
+                array = np.frombuffer(self.buffer, dtype=dtype, count=count, offset=offset).reshape(shape).copy()
+                offset += array.nbytes
+                arrays.append(array)
+            
+            del self.buffer[:end]
+            messages.append((header, arrays))
+        return messages
+    
+    def receive(self) -> Tuple[dict, List[np.ndarray]] | None:
+        while not self.pending:
+            messages = self.feed()
+            if messages is None:
+                return None
+            self.pending = messages
+        return self.pending.pop(0)
+
+
+class GenomeCache:
+    def __init__(self, cache_bytes: int):
+        self.cache_bytes = cache_bytes
+        self.key = None
+        self.capacity = 1
+        self.entries = OrderedDict()
+    
+    def configure(self, layer_sizes: List[int], dtype: np.dtype, activation: str) -> bool:
+        key = (tuple(layer_sizes), np.dtype(dtype).str, activation)
+        if key == self.key:
+            return False
+        
+        self.key = key
+        genome_bytes = NeuralNetwork.count_parameters(layer_sizes) * np.dtype(dtype).itemsize
+        self.capacity = max(1, self.cache_bytes // genome_bytes)
+        self.entries.clear()
+        return True
+    
+    def __contains__(self, genome_id: int) -> bool:
+        return genome_id in self.entries
+    
+    def get(self, genome_id: int) -> np.ndarray | None:
+        self.entries.move_to_end(genome_id)
+        return self.entries[genome_id]
+    
+    def insert(self, genome_id: int, weights: np.ndarray | None = None):
+        self.entries[genome_id] = weights
+        self.entries.move_to_end(genome_id)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+
+class WorkerLink:
+    def __init__(self, sock: socket.socket, reader: MessageReader, name: str, cache_bytes: int):
+        self.sock = sock
+        self.reader = reader
+        self.name = name
+        self.cache = GenomeCache(cache_bytes)
+        self.assigned = {}
+        self.last_seen = time.monotonic()
+
+
+class RemoteEvaluator:
+    def __init__(
+        self,
+        field_width: int = 30,
+        field_height: int = 30,
+        address: str = '127.0.0.1:5757',
+        min_workers: int = 1,
+        heartbeat_timeout: float = 10.0,
+        max_batch: int = 256,
+        prefetch: int = 2
+    ):
+        self.field_width = field_width
+        self.field_height = field_height
+        self.address = address
+        self.min_workers = min_workers
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_batch = max_batch
+        self.prefetch = prefetch
+        self.env_steps = 0
+        self.forward_calls = 0
+        self.reassigned = 0
+        self.sent_bytes = 0
+        self.task_ids = itertools.count()
+        
+        family, bind_address = parse_address(address)
+        self.listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(bind_address)
+        self.listener.listen()
+        
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.pending_links = {}
+        self.workers = {}
+        self.started = False
+    
+    def _accept(self):
+        sock, _ = self.listener.accept()
+        sock.setblocking(True)
+        if sock.family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.pending_links[sock] = MessageReader(sock)
+        self.selector.register(sock, selectors.EVENT_READ)
+    
+    def _drop(self, link: WorkerLink, reason: str, queue: deque | None = None):
+        self.selector.unregister(link.sock)
+        link.sock.close()
+        del self.workers[link.sock]
+        print(f"✗ Воркер {link.name} отключён ({reason}), задач к переназначению: {len(link.assigned)}")
+        if queue is not None:
+            for indices in link.assigned.values():
+                queue.appendleft(indices)
+            self.reassigned += len(link.assigned)
+        link.assigned.clear()
+    
+    def _poll(self, timeout: float, queue: deque | None = None, results: list | None = None, recorded: list | None = None):
+        for key, _ in self.selector.select(timeout):
+            sock = key.fileobj
+            if sock is self.listener:
+                self._accept()
+                continue
+            
+            if sock in self.pending_links:
+                reader = self.pending_links[sock]
+                try:
+                    messages = reader.feed()
+                except OSError:
+                    messages = None
+                if not messages:
+                    if messages is None:
+                        del self.pending_links[sock]
+                        self.selector.unregister(sock)
+                        sock.close()
+                    continue
+                
+                header, _ = messages[0]
+                del self.pending_links[sock]
+                link = WorkerLink(sock, reader, header['name'], header['cache_bytes'])
+                self.workers[sock] = link
+                print(f"→ Подключён воркер {link.name} (всего: {len(self.workers)})")
+                self._handle(link, messages[1:], queue, results, recorded)
+                continue
+            
+            link = self.workers[sock]
+            try:
+                messages = link.reader.feed()
+            except OSError:
+                messages = None
+            if messages is None:
+                self._drop(link, 'соединение закрыто', queue)
+                continue
+            self._handle(link, messages, queue, results, recorded)
+        
+        now = time.monotonic()
+        for link in list(self.workers.values()):
+            if link.assigned and now - link.last_seen > self.heartbeat_timeout:
+                self._drop(link, f'нет heartbeat {now - link.last_seen:.0f} с', queue)
+    
+    def _handle(self, link: WorkerLink, messages: list, queue: deque | None, results: list | None, recorded: list | None):
+        link.last_seen = time.monotonic()
+        for header, arrays in messages:
+            if header['type'] != 'result':
+                continue
+            
+            indices = link.assigned.pop(header['task'], None)
+            if indices is None or results is None:
+                continue
+            
+            self.env_steps += header['env_steps']
+            self.forward_calls += header['forward_calls']
+            for i, (fitness, score) in zip(indices, arrays[0].tolist()):
+                results[i] = (fitness, int(score))
+            if recorded is not None:
+                lengths, codes = arrays[1], arrays[2]
+                for i, codes_i in zip(indices, np.split(codes, np.cumsum(lengths)[:-1])):
+                    recorded[i] = codes_i
+    
+    def _encode(self, link: WorkerLink, players: List[AIPlayer], indices: List[int]) -> Tuple[list, list]:
+        genomes = []
+        arrays = []
+        for i in indices:
+            network = players[i].neural_network
+            genome_id = network.genome_id
+            
+            if genome_id in link.cache:
+                link.cache.get(genome_id)
+                genomes.append(['ref', genome_id])
+                continue
+            
+            if network.lineage and all(parent in link.cache for parent, _, _ in network.lineage):
+                mutated = network.mutated if network.mutated is not None else np.empty(0, dtype=np.int64)
+                genomes.append(['delta', genome_id, [list(segment) for segment in network.lineage]])
+                arrays += [mutated.astype(np.int64, copy=False), network.params[mutated]]
+            else:
+                genomes.append(['full', genome_id])
+                arrays.append(network.params)
+            link.cache.insert(genome_id)
+        return genomes, arrays
+    
+    def _next_batch(self, link: WorkerLink, players: List[AIPlayer], queue: deque) -> List[int]:
+        window = min(len(queue), len(self.workers) * self.prefetch)
+        cached = [
+            sum(players[i].neural_network.genome_id in link.cache for i in queue[position])
+            for position in range(window)
+        ]
+        position = int(np.argmax(cached))
+        indices = queue[position]
+        del queue[position]
+        return indices
+    
+    def _dispatch(
+        self,
+        link: WorkerLink,
+        players: List[AIPlayer],
+        indices: List[int],
+        seeds: np.ndarray,
+        max_steps: int,
+        record: bool
+    ):
+        network = players[indices[0]].neural_network
+        if link.cache.configure(network.layer_sizes, network.dtype, network.activation):
+            header = {
+                'type': 'configure',
+                'layer_sizes': network.layer_sizes,
+                'dtype': network.dtype.str,
+                'activation': network.activation,
+                'field_width': self.field_width,
+                'field_height': self.field_height
+            }
+            send_message(link.sock, header)
+        
+        genomes, arrays = self._encode(link, players, indices)
+        task_id = next(self.task_ids)
+        header = {'type': 'task', 'task': task_id, 'max_steps': max_steps, 'record': record, 'genomes': genomes}
+        send_message(link.sock, header, [np.asarray(seeds[indices], dtype=np.int64)] + arrays)
+        self.sent_bytes += sum(array.nbytes for array in arrays)
+        link.assigned[task_id] = indices
+    
+    def wait_for_workers(self, count: int | None = None):
+        count = self.min_workers if count is None else count
+        if len(self.workers) < count:
+            print(f"→ Ожидание воркеров на {self.address}: {len(self.workers)}/{count} "
+                  f"(python -m src.ai.worker --connect {self.address})")
+        while len(self.workers) < count:
+            self._poll(1.0)
+    
+    def evaluate(
+        self,
+        players: List[AIPlayer],
+        seeds: np.ndarray,
+        max_steps: int = 5000,
+        actions: list | None = None
+    ) -> List[Tuple[float, int]]:
+        self._poll(0)
+        self.wait_for_workers(1 if self.started else self.min_workers)
+        self.started = True
+        
+        seeds = np.asarray(seeds, dtype=np.int64)
+        batch = max(1, min(self.max_batch, math.ceil(len(players) / (len(self.workers) * self.prefetch * 2))))
+        queue = deque(list(range(start, min(start + batch, len(players)))) for start in range(0, len(players), batch))
+        results = [None] * len(players)
+        recorded = [None] * len(players) if actions is not None else None
+        
+        while queue or any(link.assigned for link in self.workers.values()):
+            for link in list(self.workers.values()):
+                while queue and len(link.assigned) < self.prefetch:
+                    indices = self._next_batch(link, players, queue)
+                    try:
+                        self._dispatch(link, players, indices, seeds, max_steps, actions is not None)
+                    except OSError:
+                        queue.appendleft(indices)
+                        self._drop(link, 'ошибка отправки', queue)
+                        break
+            
+            if not self.workers:
+                self.wait_for_workers(1)
+                continue
+            self._poll(HEARTBEAT_INTERVAL, queue, results, recorded)
+        
+        if actions is not None:
+            actions.extend(recorded)
+        return results
+    
+    def stats(self) -> dict:
+        return {
+            'remote_workers': len(self.workers),
+            'remote_reassigned': self.reassigned,
+            'remote_sent_bytes': self.sent_bytes
+        }
+    
+    def close(self):
+        for link in list(self.workers.values()):
+            try:
+                send_message(link.sock, {'type': 'shutdown'})
+            except OSError:
+                pass
+            link.sock.close()
+        for sock in self.pending_links:
+            sock.close()
+        self.workers.clear()
+        self.pending_links.clear()
+        self.selector.close()
+        self.listener.close()
+        
+        family, bind_address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.remove(bind_address)
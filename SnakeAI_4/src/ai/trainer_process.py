@@ -0,0 +1,392 @@
+import heapq
+import queue
+import itertools
+import traceback
+from collections import Counter
+import multiprocessing as mp
+from datetime import datetime
+from multiprocessing import shared_memory
+import numpy as np
+from typing import List, Tuple
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import NeuralNetwork
+from src.ai.genetic_algorithm import GeneticAlgorithm
+from src.ai.evolution_strategies import EvolutionStrategies
+from src.ai.islands import IslandModel
+from src.ai.checkpoint import SnapshotHistory
+from src.ai.profiler import PhaseTimer
+from src.ai.model_io import export_model, find_model, read_header
+from src.episode import save_episodes
+
+
+TOP_SLOTS = 5
+HEADER_BYTES = 64
+STREAM_BATCH = 64
+
+
+def resolve_architecture() -> Tuple[List[int], str]:
+    best_path = find_model('best_ai')
+    header = read_header(best_path) if best_path else None
+    if header is not None:
+        return header['layer_sizes'][1:-1], header.get('activation', 'relu')
+    return list(AIPlayer.DEFAULT_HIDDEN_LAYERS), 'relu'
+
+
+def matches_architecture(filename: str, layer_sizes: List[int], activation: str) -> bool:
+    header = read_header(filename)
+    if header is None:
+        return layer_sizes == [AIPlayer.INPUT_SIZE] + AIPlayer.DEFAULT_HIDDEN_LAYERS + [AIPlayer.OUTPUT_SIZE] and activation == 'relu'
+    return header['layer_sizes'] == layer_sizes and header.get('activation', 'relu') == activation
+
+
+def display_rows(fitness_scores: List[Tuple[float, int, AIPlayer]], records: List[Tuple[float, int]]) -> List[Tuple[float, int]]:
+    top = [(fitness, score) for fitness, score, _ in fitness_scores]
+    rest = Counter(records)
+    rest.subtract(top)
+    return top + sorted(rest.elements(), key=lambda record: record[0], reverse=True)
+
+
+class WeightBoard:
+    def __init__(self, segment: shared_memory.SharedMemory, slots: int, parameter_count: int, dtype: np.dtype, owner: bool):
+        self.segment = segment
+        self.owner = owner
+        self.version = np.ndarray((1,), dtype=np.int64, buffer=segment.buf)
+        self.weights = np.ndarray((slots, parameter_count), dtype=dtype, buffer=segment.buf, offset=HEADER_BYTES)
+    
+    @classmethod
+    def create(cls, slots: int, parameter_count: int, dtype: np.dtype) -> 'WeightBoard':
+        size = HEADER_BYTES + slots * parameter_count * np.dtype(dtype).itemsize
+        segment = shared_memory.SharedMemory(create=True, size=size)
+        board = cls(segment, slots, parameter_count, np.dtype(dtype), owner=True)
+        board.version[0] = 0
+        return board
+    
+    @classmethod
+    def attach(cls, name: str, slots: int, parameter_count: int, dtype: np.dtype) -> 'WeightBoard':
+        return cls(shared_memory.SharedMemory(name=name), slots, parameter_count, np.dtype(dtype), owner=False)
+    
+    def publish(self, weights: List[np.ndarray]):
+        self.version[0] += 1
+        for slot, slot_weights in enumerate(weights[:len(self.weights)]):
+            self.weights[slot] = slot_weights
+        self.version[0] += 1
+    
+    def read(self, slot: int) -> np.ndarray | None:
+        for _ in range(3):
+            version = int(self.version[0])
+            if version % 2:
+                continue
+            weights = self.weights[slot].copy()
+            if int(self.version[0]) == version:
+                return weights
+        return None
+    
+    def close(self):
+        del self.version, self.weights
+        self.segment.close()
+        if self.owner:
+            self.segment.unlink()
+
+
+def run_trainer(config: dict, commands: mp.Queue, telemetry: mp.Queue, board_name: str):
+    evolution_strategies = config.get('algorithm', 'ga') == 'es'
+    islands = config.get('islands', 1)
+    if evolution_strategies:
+        algorithm_options = {}
+    else:
+        algorithm_options = {
+            'mutation_rate': 0.1,
+            'mutation_strength': 0.25,
+            'elite_count': max(20, config['models_per_cycle'] // 10)
+        }
+    
+    if evolution_strategies:
+        algorithm_class = EvolutionStrategies
+    elif islands > 1:
+        algorithm_class = IslandModel
+        algorithm_options['islands'] = islands
+    else:
+        algorithm_class = GeneticAlgorithm
+    
+    ga = algorithm_class(
+        population_size=config['models_per_cycle'],
+        field_width=config['field_width'],
+        field_height=config['field_height'],
+        workers=config['workers'],
+        hidden_layers=config['hidden_layers'],
+        activation=config['activation'],
+        record_episodes=True,
+        **algorithm_options
+    )
+    parameter_count = NeuralNetwork.count_parameters(config['layer_sizes'])
+    board = WeightBoard.attach(board_name, TOP_SLOTS, parameter_count, ga.dtype)
+    cycle_snapshots = SnapshotHistory(keyframe_interval=10, keep=5, companions=('.episode',))
+    session_folder = config['session_folder']
+    
+    state = {'active': True, 'paused': False}
+    current_best_ai = None
+    best_model_path = None
+    cycle = 0
+    
+    def handle(command: str):
+        if command == 'stop':
+            state['active'] = False
+        elif command == 'pause':
+            state['paused'] = True
+        elif command == 'resume':
+            state['paused'] = False
+        elif command == 'save':
+            try:
+                ga.save_best('best_ai.snk', auto_save_history=True)
+                ga.writer.flush()
+                print("✓ Модель сохранена в best_ai.snk")
+            except Exception as e:
+                print(f"✗ Ошибка при сохранении модели: {e}")
+    
+    def generate_children(parent: AIPlayer, count: int):
+        for _ in range(count):
+            with ga.profiler.span('mutation'):
+                child = parent.clone()
+                child.neural_network.mutate(ga.mutation_rate, ga.mutation_strength, rng=ga.evolution_rng)
+            yield child
+    
+    def evaluate_children(parent: AIPlayer) -> Tuple[List[Tuple[float, int]], List[Tuple[float, int, AIPlayer]]]:
+        children = generate_children(parent, config['models_per_cycle'])
+        order = itertools.count()
+        top = []
+        records = []
+        
+        while state['active']:
+            batch = list(itertools.islice(children, STREAM_BATCH))
+            if not batch:
+                break
+            
+            try:
+                results = ga.evaluate_population(batch)
+            except Exception as e:
+                print(f"Ошибка при оценке моделей: {e}")
+                break
+            
+            for (fitness, score), child in zip(results, batch):
+                records.append((fitness, score))
+                if len(top) == TOP_SLOTS and fitness <= top[0][0]:
+                    continue
+                child.neural_network.detach()
+                entry = (fitness, -next(order), score, child, ga.episodes.get(child.neural_network.genome_id))
+                if len(top) < TOP_SLOTS:
+                    heapq.heappush(top, entry)
+                else:
+                    heapq.heapreplace(top, entry)
+            
+            del batch, results
+            poll_commands()
+        
+        top.sort(reverse=True)
+        ga.episodes = {ai_player.neural_network.genome_id: episode for *_, ai_player, episode in top}
+        return records, [(fitness, score, ai_player) for fitness, _, score, ai_player, _ in top]
+    
+    def poll_commands(block: bool = False):
+        while True:
+            try:
+                handle(commands.get(timeout=0.1) if block else commands.get_nowait())
+            except queue.Empty:
+                return
+            block = False
+    
+    try:
+        print(f"→ Бесконечный цикл обучения начат (N={config['models_per_cycle']} моделей за цикл)")
+        
+        while state['active']:
+            poll_commands()
+            while state['paused'] and state['active']:
+                poll_commands(block=True)
+            
+            if not state['active']:
+                break
+            
+            cycle += 1
+            print(f"\n=== Цикл {cycle} ===")
+            
+            if current_best_ai is None:
+                best_path = find_model('best_ai')
+                if best_path and matches_architecture(best_path, config['layer_sizes'], config['activation']):
+                    print(f"→ Загружаем существующую модель {best_path}...")
+                    current_best_ai = ga.load_best(best_path)
+                else:
+                    if best_path:
+                        print(f"→ Архитектура {best_path} отличается от выбранной, начинаем с нулевой модели")
+                    else:
+                        print("→ Начинаем с нулевой модели")
+                    current_best_ai = AIPlayer(config['hidden_layers'], ga.dtype, activation=config['activation'])
+                if evolution_strategies:
+                    ga.set_center(current_best_ai)
+                elif islands > 1:
+                    ga.broadcast(current_best_ai)
+            
+            if islands > 1:
+                print(f"→ Ждём поколение {cycle} от {islands} островов (по {ga.island_size} особей)...")
+                generation_stats = ga.evolve_generation(verbose=False)
+                records = list(ga.fitness_records)
+                fitness_scores = ga.island_ranking()[:TOP_SLOTS]
+            elif evolution_strategies:
+                print(f"→ Оцениваем {ga.population_size} возмущений центра (±ε) и обновляем веса...")
+                generation_stats = ga.evolve_generation(verbose=False)
+                records = [(fitness, score) for fitness, score, _ in ga.ranking]
+                fitness_scores = [(generation_stats['center_fitness'], generation_stats['center_score'], ga.center)]
+                fitness_scores += ga.ranking[:TOP_SLOTS - 1]
+            else:
+                print(f"→ Обучаем и оцениваем {config['models_per_cycle']} моделей от текущей лучшей "
+                      f"(пакетами по {STREAM_BATCH}, в памяти только топ-{TOP_SLOTS})...")
+                generation_stats = None
+                records, fitness_scores = evaluate_children(current_best_ai)
+            
+            if not state['active'] or not records:
+                break
+            
+            rows = display_rows(fitness_scores, records)
+            
+            best_fitness, best_score, best_ai = fitness_scores[0]
+            ga.population = [best_ai] if evolution_strategies else [ai_player for _, _, ai_player in fitness_scores]
+            ga.generation = cycle
+            if best_fitness > ga.best_fitness:
+                ga.best_fitness = best_fitness
+                ga.best_score = best_score
+            avg_score = sum(score for _, score in records) / len(records)
+            avg_fitness = sum(fitness for fitness, _ in records) / len(records)
+            
+            print(f"Цикл {cycle}: Лучший={best_score}, Средний={avg_score:.1f}, Best fitness={best_fitness:.1f}")
+            
+            cycle_model_path = f"{session_folder}/cycle_{cycle:04d}_score_{best_score}.snk"
+            try:
+                ga.save_snapshot(
+                    best_ai,
+                    cycle_model_path,
+                    cycle_snapshots,
+                    generation=cycle,
+                    score=best_score,
+                    fitness=best_fitness
+                )
+                best_model_path = cycle_model_path
+                print(f"✓ Сохранена лучшая модель цикла: {cycle_model_path}")
+            except Exception as e:
+                print(f"✗ Ошибка сохранения: {e}")
+            
+            board.publish([
+                ai_player.neural_network.get_weights_flat()
+                for _, _, ai_player in fitness_scores
+            ])
+            
+            episode = ga.record_episode(best_ai)
+            episode_path = f"{session_folder}/cycle_{cycle:04d}_score_{best_score}.episode"
+            ga.writer.submit(episode_path, save_episodes, episode_path, [episode])
+            
+            timing_stats = ga.profiler.collect()
+            if generation_stats is not None:
+                timing_stats = dict(generation_stats, **{
+                    key: seconds for key, seconds in timing_stats.items()
+                    if key.startswith('time_') and key != 'time_total'
+                })
+            timing_stats.update(ga.writer.stats())
+            print(f"  Время: {PhaseTimer.format(timing_stats)}")
+            
+            telemetry.put({
+                'type': 'cycle',
+                'cycle': cycle,
+                'best_score': best_score,
+                'avg_score': avg_score,
+                'best_fitness': best_fitness,
+                'avg_fitness': avg_fitness,
+                'population_size': len(records),
+                'population': rows,
+                'timing': timing_stats,
+                'best_model_path': best_model_path,
+                'episode': episode
+            })
+            
+            current_best_ai = best_ai
+            if generation_stats is None and ga.reseed_interval and cycle % ga.reseed_interval == 0:
+                ga.reseed()
+            print(f"→ Загружена лучшая модель для следующего цикла")
+    
+    except Exception as e:
+        print(f"✗ Критическая ошибка в процессе обучения: {e}")
+        traceback.print_exc()
+    
+    finally:
+        ga.writer.flush()
+        final_name = None
+        
+        if best_model_path:
+            start_str = config['session_start']
+            end_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+            final_name = f"{session_folder}/{start_str}_{end_str}_final.snk"
+            
+            try:
+                export_model(best_model_path, final_name)
+                print(f"✓ Финальная модель сохранена: {final_name}")
+            except Exception as e:
+                print(f"✗ Ошибка сохранения финальной модели: {e}")
+                final_name = None
+        
+        ga.close()
+        board.close()
+        telemetry.put({'type': 'stopped', 'final_model_path': final_name})
+
+
+class TrainerProcess:
+    def __init__(self, config: dict):
+        layer_sizes = [AIPlayer.INPUT_SIZE] + list(config['hidden_layers']) + [AIPlayer.OUTPUT_SIZE]
+        self.config = dict(config, layer_sizes=layer_sizes)
+        self.parameter_count = NeuralNetwork.count_parameters(self.config['layer_sizes'])
+        self.board = WeightBoard.create(TOP_SLOTS, self.parameter_count, np.float32)
+        
+        context = mp.get_context('spawn')
+        self.commands = context.Queue()
+        self.telemetry = context.Queue()
+        self.process = context.Process(
+            target=run_trainer,
+            args=(self.config, self.commands, self.telemetry, self.board.segment.name),
+            daemon=False
+        )
+        self.process.start()
+    
+    def send(self, command: str):
+        if self.process.is_alive():
+            self.commands.put(command)
+    
+    def poll(self) -> List[dict]:
+        messages = []
+        while True:
+            try:
+                messages.append(self.telemetry.get_nowait())
+            except queue.Empty:
+                return messages
+    
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+    
+    def read_player(self, slot: int) -> AIPlayer | None:
+        if self.board is None:
+            return None
+        
+        weights = self.board.read(slot)
+        if weights is None:
+            return None
+        return AIPlayer.from_network(
+            NeuralNetwork.from_weights(self.config['layer_sizes'], weights, activation=self.config['activation'])
+        )
+    
+    def stop(self, timeout: float = 60.0) -> List[dict]:
+        self.send('stop')
+        messages = []
+        while self.process.is_alive():
+            messages.extend(self.poll())
+            self.process.join(timeout=0.1)
+            timeout -= 0.1
+            if timeout <= 0:
+                self.process.terminate()
+                self.process.join()
+        messages.extend(self.poll())
+        self.board.close()
+        self.board = None
+        return messages
@@ -0,0 +1,147 @@
+import os
+import time
+import queue
+import socket
+import threading
+import numpy as np
+from src.ai.evaluator import rollout_population
+from src.ai.neural_network import NeuralNetwork
+from src.ai.population_network import PopulationNetwork
+from src.ai.remote import HEARTBEAT_INTERVAL, GenomeCache, MessageReader, genome_key, parse_address, send_message
+
+
+def connect(address: str, retry_interval: float = 1.0) -> socket.socket:
+    family, target = parse_address(address)
+    announced = False
+    while True:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(target)
+            if family == socket.AF_INET:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return sock
+        except OSError:
+            sock.close()
+            if not announced:
+                print(f"→ Координатор {address} недоступен, повторяем каждые {retry_interval:.0f} с...")
+                announced = True
+            time.sleep(retry_interval)
+
+
+def receive_tasks(reader: MessageReader, cache: GenomeCache, tasks: queue.Queue):
+    config = None
+    try:
+        while True:
+            message = reader.receive()
+            if message is None:
+                tasks.put(('lost', None))
+                return
+            
+            header, arrays = message
+            if header['type'] == 'shutdown':
+                tasks.put(('shutdown', None))
+                return
+            
+            if header['type'] == 'configure':
+                cache.configure(header['layer_sizes'], np.dtype(header['dtype']), header['activation'])
+                config = header
+                continue
+            
+            seeds, payload = arrays[0], iter(arrays[1:])
+            parameter_count = NeuralNetwork.count_parameters(config['layer_sizes'])
+            genomes = np.empty((len(header['genomes']), parameter_count), dtype=config['dtype'])
+            
+            for row, (kind, genome_id, *lineage) in enumerate(header['genomes']):
+                genome_id = genome_key(genome_id)
+                if kind == 'ref':
+                    genomes[row] = cache.get(genome_id)
+                    continue
+                
+                if kind == 'delta':
+                    for parent, start, stop in lineage[0]:
+                        genomes[row, start:stop] = cache.entries[genome_key(parent)][start:stop]
+                    mutated = next(payload)
+                    genomes[row, mutated] = next(payload)
+                else:
+                    genomes[row] = next(payload)
+                cache.insert(genome_id, genomes[row].copy())
+            
+            tasks.put(('task', (header, config, seeds, genomes)))
+    except Exception as e:
+        print(f"✗ Ошибка приёма задач: {e}")
+        tasks.put(('lost', None))
+
+
+def send_heartbeats(sock: socket.socket, lock: threading.Lock, stopped: threading.Event):
+    while not stopped.wait(HEARTBEAT_INTERVAL):
+        try:
+            with lock:
+                send_message(sock, {'type': 'heartbeat'})
+        except OSError:
+            return
+
+
+def serve(sock: socket.socket, name: str, cache_bytes: int) -> bool:
+    lock = threading.Lock()
+    stopped = threading.Event()
+    tasks = queue.Queue()
+    cache = GenomeCache(cache_bytes)
+    
+    send_message(sock, {'type': 'hello', 'name': name, 'cache_bytes': cache_bytes})
+    threading.Thread(target=receive_tasks, args=(MessageReader(sock), cache, tasks), daemon=True).start()
+    threading.Thread(target=send_heartbeats, args=(sock, lock, stopped), daemon=True).start()
+    
+    evaluated = 0
+    try:
+        while True:
+            kind, task = tasks.get()
+            if kind != 'task':
+                return kind == 'shutdown'
+            
+            header, config, seeds, genomes = task
+            population = PopulationNetwork(config['layer_sizes'], len(genomes), genomes, activation=config['activation'])
+            actions = [] if header.get('record') else None
+            results, env_steps, forward_calls = rollout_population(
+                population, config['field_width'], config['field_height'], seeds, header['max_steps'], actions
+            )
+            evaluated += len(results)
+            
+            reply = {'type': 'result', 'task': header['task'], 'env_steps': env_steps, 'forward_calls': forward_calls}
+            arrays = [np.array(results, dtype=np.float64).reshape(-1, 2)]
+            if actions is not None:
+                arrays += [np.array([len(codes) for codes in actions], dtype=np.int64), np.concatenate(actions)]
+            try:
+                with lock:
+                    send_message(sock, reply, arrays)
+            except OSError:
+                return False
+    finally:
+        stopped.set()
+        sock.close()
+        print(f"→ Соединение закрыто, оценено особей: {evaluated}")
+
+
+def run_worker(address: str, name: str | None = None, cache_mb: int = 512):
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    while True:
+        sock = connect(address)
+        print(f"✓ Воркер {name} подключён к {address}")
+        if serve(sock, name, cache_mb * 1024 * 1024):
+            print("✓ Координатор завершил обучение")
+            return
+        print("✗ Связь с координатором потеряна, переподключаемся...")
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Воркер удалённой оценки популяции')
+    parser.add_argument('--connect', type=str, default='127.0.0.1:5757',
+                       help='Адрес координатора: host:port или unix:/путь (по умолчанию: 127.0.0.1:5757)')
+    parser.add_argument('--name', type=str, default=None,
+                       help='Имя воркера в логах координатора (по умолчанию: хост:pid)')
+    parser.add_argument('--cache-mb', type=int, default=512,
+                       help='Объём кэша весов особей в МБ (по умолчанию: 512)')
+    
+    args = parser.parse_args()
+    run_worker(args.connect, args.name, args.cache_mb)
@@ -0,0 +1,126 @@
+import os
+import json
+import numpy as np
+from typing import List
+from src.game_logic import SnakeGame, Direction
+from src.vector_game import DIRECTIONS
+
+
+ACTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+
+def pack_actions(codes) -> np.ndarray:
+    codes = np.asarray(codes, dtype=np.uint8)
+    padded = np.zeros((len(codes) + 3) // 4 * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape(-1, 4)
+    return quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+
+
+def unpack_actions(packed: np.ndarray, steps: int) -> np.ndarray:
+    packed = np.asarray(packed, dtype=np.uint8)
+    quads = np.stack([(packed >> shift) & 3 for shift in (0, 2, 4, 6)], axis=1)
+    return quads.reshape(-1)[:steps]
+
+
+class Episode:
+    def __init__(
+        self,
+        seed: int,
+        field_size: tuple,
+        actions: np.ndarray,
+        steps: int,
+        initial_length: int = 3,
+        score: int = 0,
+        fitness: float = 0.0
+    ):
+        self.seed = seed
+        self.field_size = tuple(field_size)
+        self.actions = actions
+        self.steps = steps
+        self.initial_length = initial_length
+        self.score = score
+        self.fitness = fitness
+    
+    @classmethod
+    def from_directions(cls, seed: int, field_size: tuple, directions: List[Direction], **kwargs) -> 'Episode':
+        codes = [ACTION_CODES[direction] for direction in directions]
+        return cls(seed, field_size, pack_actions(codes), len(codes), **kwargs)
+    
+    def directions(self) -> List[Direction]:
+        return [DIRECTIONS[code] for code in unpack_actions(self.actions, self.steps)]
+    
+    def new_game(self) -> SnakeGame:
+        width, height = self.field_size
+        return SnakeGame(width, height, self.initial_length, seed=self.seed)
+    
+    def header(self) -> dict:
+        return {
+            'seed': self.seed,
+            'field_size': list(self.field_size),
+            'steps': self.steps,
+            'initial_length': self.initial_length,
+            'score': self.score,
+            'fitness': self.fitness
+        }
+
+
+class EpisodeReplay:
+    def __init__(self, episode: Episode):
+        self.episode = episode
+        self.directions = episode.directions()
+        self.restart()
+    
+    def restart(self):
+        self.game = self.episode.new_game()
+        self.position = 0
+    
+    @property
+    def finished(self) -> bool:
+        return self.game.game_over or self.position >= len(self.directions)
+    
+    def step(self) -> bool:
+        if self.finished:
+            return False
+        
+        self.game.set_direction(self.directions[self.position])
+        self.position += 1
+        self.game.step()
+        return True
+    
+    def seek(self, position: int):
+        if position < self.position:
+            self.restart()
+        while self.position < position and self.step():
+            pass
+
+
+def save_episodes(filename: str, episodes: List[Episode]):
+    offsets = np.cumsum([0] + [len(episode.actions) for episode in episodes])
+    actions = np.concatenate([episode.actions for episode in episodes]) if episodes else np.empty(0, dtype=np.uint8)
+    header = json.dumps([episode.header() for episode in episodes]).encode('utf-8')
+    
+    temp_path = filename + '.tmp'
+    with open(temp_path, 'wb') as f:
+        np.savez(f, header=np.frombuffer(header, dtype=np.uint8), actions=actions, offsets=offsets)
+    os.replace(temp_path, filename)
+
+
+def load_episodes(filename: str) -> List[Episode]:
+    with np.load(filename) as data:
+        headers = json.loads(data['header'].tobytes())
+        actions = data['actions']
+        offsets = data['offsets']
+    
+    return [
+        Episode(
+            header['seed'],
+            header['field_size'],
+            actions[offsets[i]:offsets[i + 1]],
+            header['steps'],
+            header['initial_length'],
+            header['score'],
+            header['fitness']
+        )
+        for i, header in enumerate(headers)
+    ]
@@ -1,8 +1,19 @@
 import random
+from collections import deque
 from enum import Enum
 from typing import List, Tuple, Optional
 
 
+MASK64 = (1 << 64) - 1
+
+
+def mix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
 class Direction(Enum):
     UP = (0, -1)
     DOWN = (0, 1)
@@ -11,12 +22,19 @@ class Direction(Enum):
 
 
 class SnakeGame:
-    def __init__(self, width: int = 20, height: int = 20, initial_length: int = 3):
+    def __init__(self, width: int = 20, height: int = 20, initial_length: int = 3, seed: Optional[int] = None):
         self.width = width
         self.height = height
         self.initial_length = initial_length
         
-        self.snake: List[Tuple[int, int]] = []
+        self.seed = seed
+        self.stream = mix64(seed & MASK64) if seed is not None else None
+        self.spawn_counter = 0
+        
+        self.snake: deque[Tuple[int, int]] = deque()
+        self.occupied = bytearray(width * height)
+        self.free_cells: List[int] = []
+        self.free_index: List[int] = []
         self.direction = Direction.RIGHT
         self.apple: Tuple[int, int] = (0, 0)
         self.score = 0
@@ -28,18 +46,46 @@ class SnakeGame:
         center_x = self.width // 2
         center_y = self.height // 2
         
-        self.snake = [(center_x - i, center_y) for i in range(self.initial_length)]
+        self.snake = deque((center_x - i, center_y) for i in range(self.initial_length))
+        self.occupied = bytearray(self.width * self.height)
+        self.free_cells = list(range(self.width * self.height))
+        self.free_index = list(range(self.width * self.height))
+        
+        for x, y in self.snake:
+            cell = y * self.width + x
+            self.occupied[cell] = 1
+            self._free_remove(cell)
+        
         self.direction = Direction.RIGHT
         self.score = 0
         self.game_over = False
         self.spawn_apple()
     
+    def _free_add(self, cell: int):
+        self.free_index[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+    
+    def _free_remove(self, cell: int):
+        slot = self.free_index[cell]
+        last_cell = self.free_cells.pop()
+        if last_cell != cell:
+            self.free_cells[slot] = last_cell
+            self.free_index[last_cell] = slot
+    
     def spawn_apple(self):
-        while True:
-            apple = (random.randint(0, self.width - 1), random.randint(0, self.height - 1))
-            if apple not in self.snake:
-                self.apple = apple
-                break
+        if not self.free_cells:
+            self.apple = (-1, -1)
+            self.game_over = True
+            return
+        
+        if self.stream is not None:
+            slot = mix64((self.stream + self.spawn_counter) & MASK64) % len(self.free_cells)
+            self.spawn_counter += 1
+        else:
+            slot = random.randrange(len(self.free_cells))
+        
+        cell = self.free_cells[slot]
+        self.apple = (cell % self.width, cell // self.width)
     
     def set_direction(self, direction: Direction):
         opposite_directions = {
@@ -61,18 +107,31 @@ class SnakeGame:
         new_head = (head_x + dx, head_y + dy)
         
         if (new_head[0] < 0 or new_head[0] >= self.width or
-            new_head[1] < 0 or new_head[1] >= self.height or
-            new_head in self.snake[:-1]):
+            new_head[1] < 0 or new_head[1] >= self.height):
+            self.game_over = True
+            return False
+        
+        new_cell = new_head[1] * self.width + new_head[0]
+        tail_x, tail_y = self.snake[-1]
+        tail_cell = tail_y * self.width + tail_x
+        
+        if self.occupied[new_cell] and new_cell != tail_cell:
             self.game_over = True
             return False
         
-        self.snake.insert(0, new_head)
+        self.snake.appendleft(new_head)
         
         if new_head == self.apple:
+            self.occupied[new_cell] = 1
+            self._free_remove(new_cell)
             self.score += 1
             self.spawn_apple()
         else:
             self.snake.pop()
+            self.occupied[tail_cell] = 0
+            self._free_add(tail_cell)
+            self.occupied[new_cell] = 1
+            self._free_remove(new_cell)
         
         return True
     
@@ -89,4 +148,4 @@ class SnakeGame:
         }
     
     def get_snake_body(self) -> List[Tuple[int, int]]:
-        return self.snake.copy()
+        return list(self.snake)
@@ -0,0 +1,218 @@
+import numpy as np
+from typing import List, Tuple
+from src.game_logic import Direction
+
+
+DIRECTIONS = [Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT]
+DIRECTION_DX = np.array([d.value[0] for d in DIRECTIONS], dtype=np.int64)
+DIRECTION_DY = np.array([d.value[1] for d in DIRECTIONS], dtype=np.int64)
+OPPOSITE_DIRECTION = np.array([1, 0, 3, 2], dtype=np.int8)
+RIGHT = DIRECTIONS.index(Direction.RIGHT)
+
+
+def mix64(x: np.ndarray) -> np.ndarray:
+    x = x.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class VectorSnakeGame:
+    def __init__(
+        self,
+        num_games: int,
+        width: int = 20,
+        height: int = 20,
+        initial_length: int = 3,
+        seeds: np.ndarray | None = None,
+        auto_reset: bool = False
+    ):
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.initial_length = initial_length
+        self.auto_reset = auto_reset
+        self.cells = width * height
+        
+        if seeds is None:
+            seeds = np.random.randint(0, 2**63 - 1, size=num_games, dtype=np.int64)
+        self.seeds = np.asarray(seeds, dtype=np.int64).reshape(num_games)
+        self.streams = mix64(self.seeds.view(np.uint64))
+        self.spawn_counters = np.zeros(num_games, dtype=np.uint64)
+        
+        n, c = num_games, self.cells
+        self.head_x = np.zeros(n, dtype=np.int64)
+        self.head_y = np.zeros(n, dtype=np.int64)
+        self.apple_x = np.zeros(n, dtype=np.int64)
+        self.apple_y = np.zeros(n, dtype=np.int64)
+        self.direction = np.full(n, RIGHT, dtype=np.int8)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        
+        self.body = np.zeros((n, c), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.occupied = np.zeros((n, c), dtype=bool)
+        self.free_cells = np.zeros((n, c), dtype=np.int32)
+        self.free_index = np.zeros((n, c), dtype=np.int32)
+        self.free_count = np.zeros(n, dtype=np.int64)
+        
+        self.finished = np.zeros(n, dtype=bool)
+        self.final_score = np.zeros(n, dtype=np.int64)
+        self.final_length = np.zeros(n, dtype=np.int64)
+        self.episodes = np.zeros(n, dtype=np.int64)
+        
+        self.reset()
+    
+    def _indices(self, indices: np.ndarray | None) -> np.ndarray:
+        if indices is None:
+            return np.arange(self.num_games)
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            return np.flatnonzero(indices)
+        return indices.astype(np.int64, copy=False)
+    
+    def _free_add(self, games: np.ndarray, cells: np.ndarray):
+        slots = self.free_count[games]
+        self.free_cells[games, slots] = cells
+        self.free_index[games, cells] = slots
+        self.free_count[games] += 1
+    
+    def _free_remove(self, games: np.ndarray, cells: np.ndarray):
+        slots = self.free_index[games, cells]
+        last = self.free_count[games] - 1
+        last_cells = self.free_cells[games, last]
+        self.free_cells[games, slots] = last_cells
+        self.free_index[games, last_cells] = slots
+        self.free_count[games] -= 1
+    
+    def reset(self, indices: np.ndarray | None = None):
+        games = self._indices(indices)
+        if len(games) == 0:
+            return
+        
+        center_x = self.width // 2
+        center_y = self.height // 2
+        
+        self.occupied[games] = False
+        self.free_cells[games] = np.arange(self.cells, dtype=np.int32)
+        self.free_index[games] = np.arange(self.cells, dtype=np.int32)
+        self.free_count[games] = self.cells
+        
+        self.head_ptr[games] = 0
+        for i in range(self.initial_length):
+            cell = center_y * self.width + center_x - i
+            cells = np.full(len(games), cell, dtype=np.int64)
+            self.body[games, i] = cell
+            self.occupied[games, cell] = True
+            self._free_remove(games, cells)
+        
+        self.head_x[games] = center_x
+        self.head_y[games] = center_y
+        self.length[games] = self.initial_length
+        self.direction[games] = RIGHT
+        self.score[games] = 0
+        self.game_over[games] = False
+        self.spawn_apple(games)
+    
+    def spawn_apple(self, indices: np.ndarray | None = None):
+        games = self._indices(indices)
+        if len(games) == 0:
+            return
+        
+        full = self.free_count[games] == 0
+        if full.any():
+            self.game_over[games[full]] = True
+            self.apple_x[games[full]] = -1
+            self.apple_y[games[full]] = -1
+            games = games[~full]
+        
+        draws = mix64(self.streams[games] + self.spawn_counters[games])
+        self.spawn_counters[games] += np.uint64(1)
+        slots = (draws % self.free_count[games].astype(np.uint64)).astype(np.int64)
+        apples = self.free_cells[games, slots]
+        self.apple_x[games] = apples % self.width
+        self.apple_y[games] = apples // self.width
+    
+    def set_directions(self, directions: np.ndarray, indices: np.ndarray | None = None):
+        games = self._indices(indices)
+        directions = np.asarray(directions, dtype=np.int8)
+        allowed = directions != OPPOSITE_DIRECTION[self.direction[games]]
+        self.direction[games[allowed]] = directions[allowed]
+    
+    def step(self, directions: np.ndarray | None = None, indices: np.ndarray | None = None) -> np.ndarray:
+        games = self._indices(indices)
+        if directions is not None:
+            self.set_directions(directions, games)
+        
+        moved = np.zeros(self.num_games, dtype=bool)
+        self.finished[:] = False
+        games = games[~self.game_over[games]]
+        
+        direction = self.direction[games]
+        new_x = self.head_x[games] + DIRECTION_DX[direction]
+        new_y = self.head_y[games] + DIRECTION_DY[direction]
+        outside = (new_x < 0) | (new_x >= self.width) | (new_y < 0) | (new_y >= self.height)
+        new_cell = np.where(outside, 0, new_y * self.width + new_x)
+        
+        tail_slot = (self.head_ptr[games] + self.length[games] - 1) % self.cells
+        tail = self.body[games, tail_slot].astype(np.int64)
+        collided = outside | (self.occupied[games, new_cell] & (new_cell != tail))
+        
+        self.game_over[games[collided]] = True
+        self.finished[games[collided]] = True
+        
+        alive = ~collided
+        games = games[alive]
+        new_x, new_y, new_cell, tail = new_x[alive], new_y[alive], new_cell[alive], tail[alive]
+        
+        ate = (new_x == self.apple_x[games]) & (new_y == self.apple_y[games])
+        growing = games[~ate]
+        self.occupied[growing, tail[~ate]] = False
+        self._free_add(growing, tail[~ate])
+        
+        self.occupied[games, new_cell] = True
+        self._free_remove(games, new_cell)
+        
+        self.head_ptr[games] = (self.head_ptr[games] - 1) % self.cells
+        self.body[games, self.head_ptr[games]] = new_cell
+        self.head_x[games] = new_x
+        self.head_y[games] = new_y
+        
+        eaters = games[ate]
+        self.length[eaters] += 1
+        self.score[eaters] += 1
+        self.spawn_apple(eaters)
+        self.finished[eaters[self.game_over[eaters]]] = True
+        
+        moved[games] = True
+        
+        if self.auto_reset and self.finished.any():
+            done = np.flatnonzero(self.finished)
+            self.final_score[done] = self.score[done]
+            self.final_length[done] = self.length[done]
+            self.episodes[done] += 1
+            self.reset(done)
+        
+        return moved
+    
+    def head_cells(self, indices: np.ndarray | None = None) -> np.ndarray:
+        games = self._indices(indices)
+        return self.head_y[games] * self.width + self.head_x[games]
+    
+    def get_snake_body(self, index: int) -> List[Tuple[int, int]]:
+        slots = (self.head_ptr[index] + np.arange(self.length[index])) % self.cells
+        cells = self.body[index, slots]
+        return [(int(cell % self.width), int(cell // self.width)) for cell in cells]
+    
+    def get_state_for_ai(self, index: int) -> dict:
+        return {
+            'head_position': (int(self.head_x[index]), int(self.head_y[index])),
+            'field_size': (self.width, self.height),
+            'apple_position': (int(self.apple_x[index]), int(self.apple_y[index])),
+            'initial_length': self.initial_length,
+            'current_length': int(self.length[index]),
+            'score': int(self.score[index]),
+            'game_over': bool(self.game_over[index]),
+            'direction': DIRECTIONS[self.direction[index]]
+        }
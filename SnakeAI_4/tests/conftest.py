@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from src.ai.ai_player import AIPlayer
+
+
+HIDDEN_LAYERS = [16, 8]
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def players():
+    return [AIPlayer(HIDDEN_LAYERS, rng=np.random.default_rng(i)) for i in range(12)]
+
+
+def small_ga_options(**overrides) -> dict:
+    options = {
+        'population_size': 12,
+        'elite_count': 3,
+        'field_width': 8,
+        'field_height': 8,
+        'workers': 1,
+        'seed': 3,
+        'hidden_layers': HIDDEN_LAYERS
+    }
+    options.update(overrides)
+    return options
@@ -0,0 +1,55 @@
+import numpy as np
+from src.ai.evaluator import ProcessPoolEvaluator, SerialEvaluator
+from src.ai.genetic_algorithm import GeneticAlgorithm
+from src.ai.population_network import PopulationNetwork
+from src.episode import EpisodeReplay
+from tests.conftest import small_ga_options
+
+
+def test_pool_matches_serial(players):
+    seeds = np.arange(len(players))
+    serial_actions, pool_actions = [], []
+    
+    serial = SerialEvaluator(8, 8)
+    pool = ProcessPoolEvaluator(8, 8, workers=2)
+    try:
+        serial_results = serial.evaluate(players, seeds, 500, actions=serial_actions)
+        pool_results = pool.evaluate(players, seeds, 500, actions=pool_actions)
+    finally:
+        pool.close()
+    
+    assert serial_results == pool_results
+    assert serial.env_steps == pool.env_steps
+    for serial_codes, pool_codes in zip(serial_actions, pool_actions):
+        np.testing.assert_array_equal(serial_codes, pool_codes)
+
+
+def test_masked_forward_matches_single_networks(players):
+    population = PopulationNetwork.from_players(players)
+    rng = np.random.default_rng(0)
+    indices = np.arange(len(players))
+    
+    while len(indices):
+        inputs = rng.random((len(indices), 8))
+        outputs = population.forward(inputs, indices)
+        for row, i in enumerate(indices):
+            expected = players[i].neural_network.forward(inputs[row]).reshape(-1)
+            np.testing.assert_allclose(outputs[row], expected, rtol=1e-5, atol=1e-6)
+        indices = np.sort(rng.choice(indices, size=len(indices) * 3 // 4, replace=False))
+
+
+def test_recorded_episodes_replay_to_the_scored_result():
+    ga = GeneticAlgorithm(**small_ga_options(record_episodes=True, reseed_interval=0))
+    try:
+        for _ in range(3):
+            stats = ga.evolve_generation(verbose=False)
+            best = ga.episodes[ga.population[0].neural_network.genome_id]
+            assert best.fitness == stats['best_fitness']
+    finally:
+        ga.close()
+    
+    for episode in ga.episodes.values():
+        replay = EpisodeReplay(episode)
+        while replay.step():
+            pass
+        assert replay.game.score == episode.score
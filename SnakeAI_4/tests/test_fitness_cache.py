@@ -0,0 +1,53 @@
+from src.ai.fitness_cache import FitnessCache
+from src.ai.genetic_algorithm import GeneticAlgorithm
+from tests.conftest import small_ga_options
+
+
+def test_lru_eviction_drops_the_oldest_entry_and_its_episode():
+    cache = FitnessCache(max_size=2)
+    cache.put('a', (1.0, 0), episode='episode-a')
+    cache.put('b', (2.0, 0))
+    assert cache.get('a') == (1.0, 0)
+    
+    cache.put('c', (3.0, 1))
+    assert cache.get('b') is None
+    assert cache.get('a') == (1.0, 0)
+    assert cache.episode('a') == 'episode-a'
+    
+    cache.put('d', (4.0, 1))
+    assert cache.get('c') is None
+    cache.put('e', (5.0, 1))
+    assert cache.get('a') is None
+    assert cache.episode('a') is None
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_cache_key_includes_seed_and_step_limit(players):
+    ga = GeneticAlgorithm(**small_ga_options())
+    try:
+        first = ga.evaluate_population(players)
+        assert ga.fitness_cache.hits == 0
+        assert ga.evaluate_population(players) == first
+        assert ga.fitness_cache.hits == len(players)
+        
+        ga.evaluate_population(players, max_steps=100)
+        assert ga.fitness_cache.hits == len(players)
+        
+        ga.reseed()
+        ga.evaluate_population(players)
+        assert ga.fitness_cache.hits == len(players)
+    finally:
+        ga.close()
+
+
+def test_elites_hit_the_cache_without_reseeding():
+    ga = GeneticAlgorithm(**small_ga_options(reseed_interval=0))
+    try:
+        ga.evolve_generation(verbose=False)
+        stats = ga.evolve_generation(verbose=False)
+    finally:
+        ga.close()
+    
+    assert stats['cached_evaluations'] == ga.elite_count
+    assert stats['evaluations'] == ga.population_size - ga.elite_count
@@ -0,0 +1,53 @@
+import numpy as np
+from src.ai.genetic_algorithm import GeneticAlgorithm
+from src.ai.genome import CompactPlayer, Genome, GenomeDecoder, decode_genomes, encode_genomes
+from tests.conftest import small_ga_options
+
+
+def test_cold_decode_stays_within_the_cache():
+    ga = GeneticAlgorithm(**small_ga_options(compact_genomes=True))
+    try:
+        for _ in range(15):
+            ga.evolve_generation(verbose=False)
+    finally:
+        ga.close()
+    
+    records, indices, weights = encode_genomes([ai_player.genome for ai_player in ga.population])
+    assert not weights
+    
+    decoder = GenomeDecoder(ga.layer_sizes, cache_size=ga.decoder.cache_size)
+    build = decoder._build
+    peak = []
+    
+    def tracked_build(genome, parents):
+        peak.append(len(decoder.cache) + 1)
+        return build(genome, parents)
+    
+    decoder._build = tracked_build
+    for genome, ai_player in zip(decode_genomes(records, indices), ga.population):
+        np.testing.assert_array_equal(decoder.params(genome), ga.decoder.params(ai_player.genome))
+    assert max(peak) <= decoder.cache_size
+
+
+def test_ancestry_round_trip():
+    root1, root2 = Genome(1), Genome(2)
+    child = Genome(3, (root1, root2))
+    grandchild = Genome(4, (child, root1))
+    
+    restored = Genome.from_ancestry(grandchild.ancestry())
+    decoder = GenomeDecoder([8, 4, 4])
+    np.testing.assert_array_equal(decoder.params(restored), decoder.params(grandchild))
+
+
+def test_compact_player_decodes_its_network_once():
+    decoder = GenomeDecoder([8, 4, 4])
+    ai_player = CompactPlayer(decoder, Genome(5, (Genome(1), Genome(2))))
+    
+    network = ai_player.neural_network
+    decoded = decoder.decoded
+    assert ai_player.neural_network is network
+    assert decoder.decoded == decoded
+    
+    ai_player.release()
+    assert ai_player.neural_network is not network
+    assert ai_player.neural_network.genome_id == network.genome_id
@@ -0,0 +1,47 @@
+import pytest
+from src.ai.islands import REPORT_WINDOW, IslandModel, merge_stats
+from tests.conftest import small_ga_options
+
+
+def island_options(**overrides) -> dict:
+    options = small_ga_options(islands=2, population_size=16, **overrides)
+    options.pop('workers')
+    return options
+
+
+def test_islands_report_and_shut_down():
+    model = IslandModel(**island_options())
+    try:
+        stats = model.evolve_generation(verbose=False)
+        assert stats['generation'] == 1
+        assert stats['islands'] == 2
+        assert len(model.fitness_records) == 2 * model.island_size
+        assert model.get_best_ai().neural_network is not None
+    finally:
+        model.close()
+    
+    assert model.stopped_islands == {0, 1}
+    assert not any(process.is_alive() for process in model.processes)
+    assert all(generation <= 1 + REPORT_WINDOW for generation in model.reports)
+
+
+def test_failing_islands_raise_with_their_errors():
+    model = IslandModel(**island_options(evaluation_mode='racing', racing_rounds=0))
+    try:
+        with pytest.raises(RuntimeError, match='остров 0'):
+            model.evolve_generation(verbose=False)
+    finally:
+        model.close()
+    
+    assert not any(process.is_alive() for process in model.processes)
+
+
+def test_merge_stats_sums_counters_and_keeps_the_best_island():
+    merged = merge_stats([
+        {'generation': 3, 'best_fitness': 10.0, 'best_score': 1, 'avg_fitness': 4.0, 'avg_score': 0.5, 'env_steps': 100},
+        {'generation': 3, 'best_fitness': 20.0, 'best_score': 2, 'avg_fitness': 6.0, 'avg_score': 1.5, 'env_steps': 50}
+    ])
+    assert (merged['best_fitness'], merged['best_score']) == (20.0, 2)
+    assert merged['avg_fitness'] == 5.0
+    assert merged['env_steps'] == 150
+    assert merged['island_best_scores'] == [1, 2]
@@ -0,0 +1,106 @@
+import numpy as np
+from src.ai.checkpoint import CheckpointStore
+from src.ai.genetic_algorithm import GeneticAlgorithm
+from src.ai.model_io import load_model, load_weights, save_model
+from src.episode import load_episodes, save_episodes
+from tests.conftest import small_ga_options
+
+
+def population_weights(ga: GeneticAlgorithm) -> np.ndarray:
+    return np.stack([np.array(ai_player.neural_network.params) for ai_player in ga.population])
+
+
+def test_snk_round_trip_with_delta(players):
+    network = players[0].neural_network
+    save_model('base.snk', network.layer_sizes, network.params, activation='tanh', score=7)
+    
+    changed = network.params.copy()
+    changed[[0, 5, 40]] += 1.0
+    save_model('delta.snk', network.layer_sizes, changed, base='base.snk', base_weights=network.params)
+    
+    weights, header = load_weights('base.snk')
+    np.testing.assert_array_equal(weights, network.params)
+    assert (header['activation'], header['score']) == ('tanh', 7)
+    
+    weights, header = load_weights('delta.snk')
+    np.testing.assert_array_equal(weights, changed)
+    assert header['delta_count'] == 3
+    
+    ai_player, _ = load_model('base.snk')
+    assert ai_player.neural_network.activation == 'tanh'
+    np.testing.assert_array_equal(ai_player.neural_network.params, network.params)
+
+
+def test_float16_storage_loads_as_float32(players):
+    network = players[0].neural_network
+    save_model('half.snk', network.layer_sizes, network.params.astype(np.float16))
+    ai_player, header = load_model('half.snk')
+    assert header['dtype'] == '<f2'
+    assert ai_player.neural_network.dtype == np.float32
+    np.testing.assert_allclose(ai_player.neural_network.params, network.params, atol=1e-2)
+
+
+def test_episode_file_round_trip():
+    ga = GeneticAlgorithm(**small_ga_options(record_episodes=True))
+    try:
+        ga.evolve_generation(verbose=False)
+    finally:
+        ga.close()
+    
+    episodes = list(ga.episodes.values())
+    save_episodes('run.episode', episodes)
+    for saved, loaded in zip(episodes, load_episodes('run.episode')):
+        assert (loaded.seed, loaded.steps, loaded.score) == (saved.seed, saved.steps, saved.score)
+        np.testing.assert_array_equal(loaded.actions, saved.actions)
+
+
+def resume(options: dict, directory: str) -> GeneticAlgorithm:
+    ga = GeneticAlgorithm(**options)
+    assert ga.load_checkpoint(CheckpointStore(directory))
+    return ga
+
+
+def test_checkpoint_resume_continues_the_same_run():
+    options = small_ga_options()
+    ga = GeneticAlgorithm(**options)
+    store = CheckpointStore('checkpoints', keyframe_interval=2)
+    try:
+        for _ in range(3):
+            ga.evolve_generation(verbose=False)
+            ga.save_checkpoint(store)
+        ga.writer.flush()
+        
+        resumed = resume(options, 'checkpoints')
+        np.testing.assert_array_equal(population_weights(resumed), population_weights(ga))
+        assert resumed.generation == ga.generation
+        
+        expected = ga.evolve_generation(verbose=False)
+        actual = resumed.evolve_generation(verbose=False)
+        assert actual['best_fitness'] == expected['best_fitness']
+        np.testing.assert_array_equal(population_weights(resumed), population_weights(ga))
+        resumed.close()
+    finally:
+        ga.close()
+
+
+def test_compact_checkpoint_stores_anchors_and_stays_bounded():
+    options = small_ga_options(compact_genomes=True)
+    ga = GeneticAlgorithm(**options)
+    store = CheckpointStore('checkpoints', keyframe_interval=3)
+    try:
+        sizes = []
+        for _ in range(12):
+            ga.evolve_generation(verbose=False)
+            ga.save_checkpoint(store)
+            ga.writer.flush()
+            state, networks = CheckpointStore('checkpoints').load_latest(ga.dtype)
+            sizes.append(len(state['genomes']['records']))
+            assert len(networks) == len(state['genomes']['anchors'])
+        
+        assert max(sizes) <= ga.population_size * (store.keyframe_interval + 1)
+        
+        resumed = resume(options, 'checkpoints')
+        np.testing.assert_array_equal(population_weights(resumed), population_weights(ga))
+        resumed.close()
+    finally:
+        ga.close()
@@ -0,0 +1,74 @@
+import threading
+import numpy as np
+import pytest
+from src.ai.evaluator import SerialEvaluator
+from src.ai.genome import CompactPlayer, Genome, GenomeDecoder
+from src.ai.remote import GenomeCache, RemoteEvaluator, genome_key
+from src.ai.worker import run_worker
+from tests.conftest import HIDDEN_LAYERS
+
+
+@pytest.fixture
+def remote(workdir):
+    address = f"unix:{workdir / 'coordinator.sock'}"
+    evaluator = RemoteEvaluator(8, 8, address, max_batch=4)
+    worker = threading.Thread(target=run_worker, args=(address, 'test'), daemon=True)
+    worker.start()
+    yield evaluator
+    evaluator.close()
+    worker.join(timeout=10)
+    evaluator.listener.close()
+    assert not worker.is_alive()
+
+
+def evaluate(remote: RemoteEvaluator, players: list, seeds: np.ndarray, max_steps: int, timeout: float = 30.0, **kwargs) -> list:
+    results = []
+    thread = threading.Thread(target=lambda: results.append(remote.evaluate(players, seeds, max_steps, **kwargs)), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert results, "удалённая оценка не завершилась"
+    return results[0]
+
+
+def test_remote_matches_serial(remote, players):
+    seeds = np.arange(len(players))
+    serial_actions, remote_actions = [], []
+    expected = SerialEvaluator(8, 8).evaluate(players, seeds, 500, actions=serial_actions)
+    
+    assert evaluate(remote, players, seeds, 500, actions=remote_actions) == expected
+    assert evaluate(remote, players, seeds, 500) == expected
+    for serial_codes, remote_codes in zip(serial_actions, remote_actions):
+        np.testing.assert_array_equal(serial_codes, remote_codes)
+
+
+def test_remote_sends_children_as_deltas(remote, players):
+    seeds = np.arange(len(players))
+    evaluate(remote, players, seeds, 200)
+    full_bytes = remote.sent_bytes
+    
+    children = [ai_player.clone() for ai_player in players]
+    for child in children:
+        child.neural_network.mutate(0.05, 0.25, rng=np.random.default_rng(0))
+    expected = SerialEvaluator(8, 8).evaluate(children, seeds, 200)
+    
+    assert evaluate(remote, children, seeds, 200) == expected
+    assert remote.sent_bytes - full_bytes < full_bytes / 2
+
+
+def test_remote_evaluates_compact_genomes(remote):
+    decoder = GenomeDecoder([8] + HIDDEN_LAYERS + [4])
+    roots = [Genome(seed) for seed in range(4)]
+    players = [CompactPlayer(decoder, genome) for genome in roots + [Genome(10, (roots[0], roots[1]))]]
+    seeds = np.arange(len(players))
+    
+    expected = SerialEvaluator(8, 8).evaluate(players, seeds, 200)
+    assert evaluate(remote, players, seeds, 200, timeout=10) == expected
+    assert evaluate(remote, players, seeds, 200, timeout=10) == expected
+
+
+def test_genome_ids_survive_json():
+    cache = GenomeCache(1 << 20)
+    cache.configure([8, 4], np.float32, 'relu')
+    cache.insert(genome_key(['genome', 7]), np.zeros(36, dtype=np.float32))
+    assert ('genome', 7) in cache
+    assert genome_key(12) == 12
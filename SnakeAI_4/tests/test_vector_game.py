@@ -0,0 +1,47 @@
+import numpy as np
+from src.game_logic import SnakeGame
+from src.vector_game import DIRECTIONS, VectorSnakeGame
+
+
+def towards_apple(game: VectorSnakeGame) -> np.ndarray:
+    return np.where(
+        game.apple_x > game.head_x, 3,
+        np.where(game.apple_x < game.head_x, 2, np.where(game.apple_y > game.head_y, 1, 0))
+    )
+
+
+def test_vector_game_matches_scalar_game():
+    rng = np.random.default_rng(0)
+    size = 32
+    vector = VectorSnakeGame(size, 8, 8, seeds=np.arange(size))
+    games = [SnakeGame(8, 8, seed=i) for i in range(size)]
+    
+    for _ in range(300):
+        actions = np.where(rng.random(size) < 0.7, towards_apple(vector), rng.integers(0, 4, size))
+        vector.step(actions)
+        
+        for i, game in enumerate(games):
+            game.set_direction(DIRECTIONS[actions[i]])
+            game.step()
+            assert game.get_snake_body() == vector.get_snake_body(i)
+            assert game.score == vector.score[i]
+            assert game.game_over == vector.game_over[i]
+            if not game.game_over:
+                assert game.apple == (vector.apple_x[i], vector.apple_y[i])
+    
+    assert vector.score.max() > 0
+
+
+def test_free_cells_track_the_body():
+    rng = np.random.default_rng(1)
+    game = VectorSnakeGame(8, 10, 10, seeds=np.arange(8), auto_reset=True)
+    for _ in range(500):
+        game.step(rng.integers(0, 4, 8))
+    
+    assert (game.free_count + game.length == game.cells).all()
+    assert (game.occupied.sum(axis=1) == game.length).all()
+    for i in range(8):
+        free = set(game.free_cells[i, :game.free_count[i]].tolist())
+        body = {y * 10 + x for x, y in game.get_snake_body(i)}
+        assert free.isdisjoint(body)
+        assert len(free | body) == 100
@@ -1,6 +1,11 @@
 import sys
 import os
 from src.ai.genetic_algorithm import GeneticAlgorithm
+from src.ai.evolution_strategies import EvolutionStrategies
+from src.ai.islands import TOPOLOGIES, IslandModel
+from src.ai.checkpoint import CheckpointStore
+from src.ai.ai_player import AIPlayer
+from src.ai.neural_network import ACTIVATIONS, NeuralNetwork
 
 
 def train_ai(
@@ -8,32 +13,108 @@ def train_ai(
     population_size: int = 200,
     field_width: int = 30,
     field_height: int = 30,
-    save_interval: int = 10
+    save_interval: int = 10,
+    workers: int = 1,
+    seed: int | None = None,
+    reseed_interval: int = 1,
+    racing: bool = False,
+    dtype: str = 'float32',
+    storage_dtype: str | None = None,
+    resume: bool = False,
+    checkpoint_dir: str = 'checkpoints',
+    checkpoint_interval: int = 0,
+    hidden_layers: list | None = None,
+    activation: str = 'relu',
+    compact_genomes: bool = False,
+    algorithm: str = 'ga',
+    noise_std: float = 0.02,
+    learning_rate: float = 0.01,
+    coordinator: str | None = None,
+    islands: int = 1,
+    migration_interval: int = 10,
+    migrants: int = 5,
+    topology: str = 'ring'
 ):
+    if islands > 1 and (algorithm != 'ga' or coordinator):
+        raise ValueError("Острова работают только с генетическим алгоритмом и локальной оценкой")
+    if islands > 1 and resume:
+        raise ValueError("Чекпоинты не поддерживаются в режиме островов")
+    
+    hidden_layers = hidden_layers or AIPlayer.DEFAULT_HIDDEN_LAYERS
+    layer_sizes = [AIPlayer.INPUT_SIZE] + hidden_layers + [AIPlayer.OUTPUT_SIZE]
+    
     print("=" * 60)
     print("ОБУЧЕНИЕ ИИ ДЛЯ ИГРЫ ЗМЕЙКА")
     print("=" * 60)
     print(f"\nПараметры обучения:")
     print(f"  Поколений: {generations}")
+    if algorithm == 'es':
+        print(f"  Алгоритм: ES (шум σ={noise_std}, шаг {learning_rate}, пары ±ε)")
+    else:
+        print("  Алгоритм: генетический")
     print(f"  Размер популяции: {population_size}")
     print(f"  Размер поля: {field_width}x{field_height}")
     print(f"  Сохранение каждые {save_interval} поколений")
-    print(f"  Архитектура: [8, 1024, 1536, 1024, 512, 4]")
+    if islands > 1:
+        print(f"  Острова: {islands} процессов по {population_size // islands} особей, "
+              f"миграция {migrants} лучших каждые {migration_interval} поколений ({topology})")
+    elif coordinator:
+        print(f"  Оценка на удалённых воркерах: {coordinator} (ждём {max(1, workers)}, "
+              f"запуск: python -m src.ai.worker --connect {coordinator})")
+    else:
+        print(f"  Процессов для оценки: {workers or os.cpu_count()}")
+    print(f"  Оценка: {'гонка (successive halving)' if racing else 'один эпизод'}")
+    if reseed_interval:
+        print(f"  Новые яблоки каждые {reseed_interval} поколений")
+    else:
+        print("  Яблоки: одна последовательность на всё обучение")
+    print(f"  Точность: {dtype} (хранение: {storage_dtype or dtype})")
+    print(f"  Архитектура: {layer_sizes}, {activation} ({NeuralNetwork.count_parameters(layer_sizes):,} параметров)")
+    if compact_genomes:
+        print(f"  Геномы: компактные (seed + родители), кэш {population_size * 2} сетей")
     print("\nНачинаем обучение...\n")
     
-    ga = GeneticAlgorithm(
+    if algorithm == 'es':
+        algorithm_options = {'noise_std': noise_std, 'learning_rate': learning_rate}
+    else:
+        algorithm_options = {'mutation_rate': 0.1, 'mutation_strength': 0.25, 'elite_count': 20}
+    
+    if islands > 1:
+        algorithm_class = IslandModel
+        algorithm_options.update(islands=islands, migration_interval=migration_interval,
+                                 migrants=migrants, topology=topology)
+        checkpoint_interval = 0
+    else:
+        algorithm_class = EvolutionStrategies if algorithm == 'es' else GeneticAlgorithm
+    
+    ga = algorithm_class(
         population_size=population_size,
-        mutation_rate=0.1,
-        mutation_strength=0.25,
-        elite_count=20,
         field_width=field_width,
-        field_height=field_height
+        field_height=field_height,
+        workers=workers,
+        seed=seed,
+        reseed_interval=reseed_interval,
+        evaluation_mode='racing' if racing else 'single',
+        dtype=dtype,
+        storage_dtype=storage_dtype,
+        hidden_layers=hidden_layers,
+        activation=activation,
+        compact_genomes=compact_genomes,
+        coordinator=coordinator,
+        **algorithm_options
     )
     
-    best_overall_score = 0
+    checkpoints = CheckpointStore(checkpoint_dir) if resume or checkpoint_interval > 0 else None
+    if resume:
+        if ga.load_checkpoint(checkpoints):
+            print(f"Продолжаем с поколения {ga.generation} (чекпоинт из {checkpoint_dir})\n")
+        else:
+            print(f"Чекпоинт в {checkpoint_dir} не найден, начинаем с нуля\n")
+    
+    best_overall_score = ga.best_score
     
     try:
-        for gen in range(generations):
+        for gen in range(ga.generation, generations):
             stats = ga.evolve_generation(verbose=True)
             
             if stats['best_score'] > best_overall_score:
@@ -41,9 +122,12 @@ def train_ai(
                 print(f"  🎉 Новый рекорд! Счёт: {best_overall_score}")
             
             if (gen + 1) % save_interval == 0:
-                filename = f"best_ai_gen_{gen + 1}.npy"
+                filename = f"best_ai_gen_{gen + 1}.snk"
                 ga.save_best(filename)
             
+            if checkpoint_interval and (gen + 1) % checkpoint_interval == 0:
+                ga.save_checkpoint(checkpoints)
+            
             if (gen + 1) % 10 == 0:
                 print("-" * 60)
         
@@ -54,15 +138,20 @@ def train_ai(
         print(f"  Счёт: {ga.best_score}")
         print(f"  Fitness: {ga.best_fitness:.1f}")
         
-        ga.save_best("best_ai.npy")
-        print(f"\nЛучший ИИ сохранён в best_ai.npy")
+        ga.save_best("best_ai.snk")
+        print(f"\nЛучший ИИ сохранён в best_ai.snk")
         print("\nЗапустите main.py и выберите 'Смотреть ИИ' для просмотра результата")
-        
+    
     except KeyboardInterrupt:
         print("\n\nОбучение прервано пользователем")
+        if checkpoint_interval:
+            print(f"Продолжить можно с последнего чекпоинта: --resume --checkpoint-dir {checkpoint_dir}")
         print("Сохраняем текущего лучшего ИИ...")
-        ga.save_best("best_ai_interrupted.npy")
-        print("Сохранено в best_ai_interrupted.npy")
+        ga.save_best("best_ai_interrupted.snk")
+        print("Сохранено в best_ai_interrupted.snk")
+    
+    finally:
+        ga.close()
 
 
 if __name__ == '__main__':
@@ -79,6 +168,46 @@ if __name__ == '__main__':
                        help='Высота поля (по умолчанию: 30)')
     parser.add_argument('--save-interval', type=int, default=10,
                        help='Интервал сохранения (по умолчанию: каждые 10 поколений)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Количество процессов для оценки (0 = все ядра, по умолчанию: 1)')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Seed для воспроизводимого обучения (по умолчанию: случайный)')
+    parser.add_argument('--reseed-interval', type=int, default=1,
+                       help='Новая последовательность яблок каждые N поколений, 0 = одна на всё обучение (по умолчанию: 1)')
+    parser.add_argument('--racing', action='store_true',
+                       help='Оценка гонкой: короткие эпизоды для всех, полный бюджет только лидерам')
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float32',
+                       help='Точность весов при обучении (по умолчанию: float32)')
+    parser.add_argument('--storage-dtype', choices=['float16', 'float32', 'float64'], default=None,
+                       help='Точность весов в сохранённых файлах (по умолчанию: как --dtype)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Продолжить обучение с последнего чекпоинта')
+    parser.add_argument('--checkpoint-dir', type=str, default='checkpoints',
+                       help='Папка для чекпоинтов (по умолчанию: checkpoints)')
+    parser.add_argument('--checkpoint-interval', type=int, default=0,
+                       help='Чекпоинт каждые N поколений, 0 = отключить (по умолчанию: 0; дельты работают только при 1)')
+    parser.add_argument('--hidden-layers', type=int, nargs='+', default=None,
+                       help='Размеры скрытых слоёв (по умолчанию: 1024 1536 1024 512)')
+    parser.add_argument('--activation', choices=list(ACTIVATIONS), default='relu',
+                       help='Функция активации скрытых слоёв (по умолчанию: relu)')
+    parser.add_argument('--compact-genomes', action='store_true',
+                       help='Хранить особей как seed и ссылки на родителей, веса восстанавливать по требованию')
+    parser.add_argument('--algorithm', choices=['ga', 'es'], default='ga',
+                       help='Оптимизатор: генетический алгоритм или эволюционные стратегии (по умолчанию: ga)')
+    parser.add_argument('--noise-std', type=float, default=0.02,
+                       help='ES: стандартное отклонение гауссова шума (по умолчанию: 0.02)')
+    parser.add_argument('--learning-rate', type=float, default=0.01,
+                       help='ES: шаг Adam для обновления весов (по умолчанию: 0.01)')
+    parser.add_argument('--coordinator', type=str, default=None,
+                       help='Раздавать оценку воркерам по сети: host:port или unix:/путь; --workers задаёт, скольких ждать перед стартом')
+    parser.add_argument('--islands', type=int, default=1,
+                       help='Число островов: независимых популяций в отдельных процессах (по умолчанию: 1)')
+    parser.add_argument('--migration-interval', type=int, default=10,
+                       help='Острова обмениваются лучшими особями каждые N поколений (по умолчанию: 10)')
+    parser.add_argument('--migrants', type=int, default=5,
+                       help='Сколько лучших особей отправляет остров при миграции (по умолчанию: 5)')
+    parser.add_argument('--topology', choices=list(TOPOLOGIES), default='ring',
+                       help='Куда мигрируют особи: следующему острову по кольцу или случайному (по умолчанию: ring)')
     
     args = parser.parse_args()
     
@@ -87,5 +216,25 @@ if __name__ == '__main__':
         population_size=args.population,
         field_width=args.width,
         field_height=args.height,
-        save_interval=args.save_interval
+        save_interval=args.save_interval,
+        workers=args.workers,
+        seed=args.seed,
+        reseed_interval=args.reseed_interval,
+        racing=args.racing,
+        dtype=args.dtype,
+        storage_dtype=args.storage_dtype,
+        resume=args.resume,
+        checkpoint_dir=args.checkpoint_dir,
+        checkpoint_interval=args.checkpoint_interval,
+        hidden_layers=args.hidden_layers,
+        activation=args.activation,
+        compact_genomes=args.compact_genomes,
+        algorithm=args.algorithm,
+        noise_std=args.noise_std,
+        learning_rate=args.learning_rate,
+        coordinator=args.coordinator,
+        islands=args.islands,
+        migration_interval=args.migration_interval,
+        migrants=args.migrants,
+        topology=args.topology
     )